@@ -9,9 +9,18 @@ Features:
 - TROTTEN rail clip mounting system
 """
 
+import os
+import sys
+
 import trimesh
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from stl101 import cache, engines, kernel
+from stl101.csg import Difference, Symmetric, Union, evaluate
+from stl101.holes import drill
+from stl101.kernel import create_box, linear_pattern
+
 # ============================================
 # Parameters - adjust as needed
 # ============================================
@@ -81,37 +90,17 @@ FRAME_BEAM_POSITIONS = [0.0, 0.5, 1.0]  # Front, middle, back
 # Helper functions
 # ============================================
 
-def create_box(width, height, depth, x=0, y=0, z=0):
-    """Create a box mesh at the specified position."""
-    box = trimesh.creation.box(extents=[width, height, depth])
-    box.apply_translation([x + width/2, y + height/2, z + depth/2])
-    return box
-
 def create_rounded_box(width, height, depth, radius, x=0, y=0, z=0, segments=8):
     """Create a box with rounded vertical edges."""
     # For simplicity, create a regular box (rounded corners add complexity)
     # Can enhance with cylinder corners later if needed
     return create_box(width, height, depth, x, y, z)
 
-def create_cylinder(radius, height, x=0, y=0, z=0, segments=32):
-    """Create a cylinder mesh at the specified position."""
-    cyl = trimesh.creation.cylinder(radius=radius, height=height, sections=segments)
-    cyl.apply_translation([x, y, z + height/2])
-    return cyl
-
-def create_cylinder_x(radius, length, x=0, y=0, z=0, segments=32):
-    """Create a cylinder aligned along X axis."""
-    cyl = trimesh.creation.cylinder(radius=radius, height=length, sections=segments)
-    # Rotate to align with X axis
-    rotation = trimesh.transformations.rotation_matrix(np.pi/2, [0, 1, 0])
-    cyl.apply_transform(rotation)
-    cyl.apply_translation([x + length/2, y, z])
-    return cyl
-
 def create_t_profile_upright(neck_width, neck_height, head_width, chamfer_height, head_flat, length, x=0, y=0, z=0):
     """
     Create an upright T-profile with chamfered head, pointing UP.
     Built from boxes with wedges subtracted for 45° chamfer.
+    Returns a CSG node (evaluated by the caller).
     """
     parts = []
 
@@ -127,12 +116,7 @@ def create_t_profile_upright(neck_width, neck_height, head_width, chamfer_height
     parts.append(head)
 
     # Combine neck and head first
-    result = parts[0]
-    for part in parts[1:]:
-        try:
-            result = trimesh.boolean.union([result, part], engine='manifold')
-        except:
-            result = trimesh.util.concatenate([result, part])
+    result = Union(*parts)
 
     # Now subtract wedges to create 45° chamfer
     # Wedge on left side: triangle that removes material from left corner
@@ -179,13 +163,7 @@ def create_t_profile_upright(neck_width, neck_height, head_width, chamfer_height
     right_wedge.apply_translation([x, y, z + neck_height])
 
     # Subtract wedges to create chamfer
-    try:
-        result = trimesh.boolean.difference([result, left_wedge], engine='manifold')
-        result = trimesh.boolean.difference([result, right_wedge], engine='manifold')
-    except Exception as e:
-        print(f"  Warning: Chamfer subtraction failed: {e}")
-
-    return result
+    return Difference(result, left_wedge, right_wedge)
 
 def create_t_slot_downward(slot_width, slot_height, cavity_width, cavity_height, chamfer_height, length, x=0, y=0, z=0):
     """
@@ -211,7 +189,7 @@ def create_t_slot_downward(slot_width, slot_height, cavity_width, cavity_height,
 # ============================================
 
 def generate_tray_shell():
-    """Generate the tray body with end walls and cable slot notches."""
+    """Generate the tray body with end walls and cable slot notches (CSG node)."""
 
     outer_width = TRAY_WIDTH
     outer_length = TRAY_LENGTH
@@ -240,12 +218,7 @@ def generate_tray_shell():
     )
 
     # Boolean difference to create enclosed trough
-    print("Creating enclosed trough with end walls...")
-    try:
-        shell = trimesh.boolean.difference([outer, inner], engine='manifold')
-    except Exception as e:
-        print(f"Boolean failed: {e}")
-        shell = outer
+    shell = Difference(outer, inner)
 
     # Create cable slot notches (open at top) on both ends
     slot_x = (TRAY_WIDTH - CABLE_SLOT_WIDTH) / 2  # Centered
@@ -271,16 +244,10 @@ def generate_tray_shell():
     )
 
     # Subtract slots
-    try:
-        slots = trimesh.boolean.union([front_slot, back_slot], engine='manifold')
-        shell = trimesh.boolean.difference([shell, slots], engine='manifold')
-    except Exception as e:
-        print(f"Slot subtraction failed: {e}")
-
-    return shell
+    return Difference(shell, front_slot, back_slot)
 
 def generate_ribs():
-    """Generate horizontal ribbed texture for exterior surfaces."""
+    """Generate horizontal ribbed texture for exterior surfaces (one mesh per rib row)."""
 
     ribs = []
     outer_depth = TRAY_DEPTH + BOTTOM_THICKNESS  # No top wall now
@@ -290,69 +257,53 @@ def generate_ribs():
 
     print(f"Generating {num_ribs} horizontal ribs (spacing: {RIB_SPACING}mm, depth: {RIB_DEPTH}mm)")
 
-    for i in range(num_ribs):
-        z_pos = i * RIB_SPACING + RIB_SPACING / 2
+    # Ribs that fit below the top edge (a prefix of the rows)
+    z_positions = np.arange(num_ribs) * RIB_SPACING + RIB_SPACING / 2
+    num_side_ribs = int(np.count_nonzero(z_positions + RIB_WIDTH/2 <= outer_depth))
 
-        if z_pos + RIB_WIDTH/2 > outer_depth:
-            continue
+    if num_side_ribs:
+        z_first = RIB_SPACING / 2 - RIB_WIDTH/2
+        pitch = (0, 0, RIB_SPACING)
 
-        # Left side rib (on outer surface)
-        left_rib = create_box(
-            RIB_DEPTH,
-            TRAY_LENGTH,
-            RIB_WIDTH,
-            -RIB_DEPTH,  # Protrude outward from left wall
-            0,
-            z_pos - RIB_WIDTH/2
-        )
-        ribs.append(left_rib)
+        # Left side ribs (on outer surface, protruding outward from left wall)
+        left_rib = create_box(RIB_DEPTH, TRAY_LENGTH, RIB_WIDTH, -RIB_DEPTH, 0, z_first)
+        ribs.append(linear_pattern(left_rib, num_side_ribs, pitch))
 
-        # Right side rib
-        right_rib = create_box(
-            RIB_DEPTH,
-            TRAY_LENGTH,
-            RIB_WIDTH,
-            TRAY_WIDTH,  # Protrude outward from right wall
-            0,
-            z_pos - RIB_WIDTH/2
-        )
-        ribs.append(right_rib)
+        # Right side ribs (protruding outward from right wall)
+        right_rib = create_box(RIB_DEPTH, TRAY_LENGTH, RIB_WIDTH, TRAY_WIDTH, 0, z_first)
+        ribs.append(linear_pattern(right_rib, num_side_ribs, pitch))
 
-        # Bottom rib (only if above bottom thickness)
-        if z_pos < BOTTOM_THICKNESS + RIB_WIDTH:
-            bottom_rib = create_box(
+        # Bottom rib (only if the first row is above bottom thickness)
+        if z_positions[0] < BOTTOM_THICKNESS + RIB_WIDTH:
+            ribs.append(create_box(
                 TRAY_WIDTH,
                 TRAY_LENGTH,
                 RIB_DEPTH,
                 0,
                 0,
                 -RIB_DEPTH  # Protrude downward
-            )
-            ribs.append(bottom_rib)
+            ))
 
     # Add ribs on bottom surface (running along length)
     num_bottom_ribs = int(TRAY_WIDTH / RIB_SPACING)
-    for i in range(num_bottom_ribs):
-        x_pos = i * RIB_SPACING + RIB_SPACING / 2
-
-        if x_pos + RIB_WIDTH/2 > TRAY_WIDTH:
-            continue
-
+    x_positions = np.arange(num_bottom_ribs) * RIB_SPACING + RIB_SPACING / 2
+    num_bottom_ribs = int(np.count_nonzero(x_positions + RIB_WIDTH/2 <= TRAY_WIDTH))
+    if num_bottom_ribs:
         bottom_rib = create_box(
             RIB_WIDTH,
             TRAY_LENGTH,
             RIB_DEPTH,
-            x_pos - RIB_WIDTH/2,
+            RIB_SPACING / 2 - RIB_WIDTH/2,
             0,
             -RIB_DEPTH
         )
-        ribs.append(bottom_rib)
+        ribs.append(linear_pattern(bottom_rib, num_bottom_ribs, (RIB_SPACING, 0, 0)))
 
     return ribs
 
 
 def generate_tray_rails():
-    """Generate full-length upright T-profiles on top of side walls."""
+    """Generate full-length upright T-profiles on top of side walls (CSG nodes)."""
 
     rails = []
     rail_length = TRAY_LENGTH  # Full length of tray
@@ -380,22 +331,10 @@ def generate_tray_rails():
         y=0,
         z=wall_top  # Sits on top of wall
     )
-    rails.append(left_rail)
 
-    # Right side rail - centered on right wall
-    right_x = TRAY_WIDTH - WALL_THICKNESS / 2  # Center of right wall
-    right_rail = create_t_profile_upright(
-        neck_width=RAIL_NECK_WIDTH,
-        neck_height=RAIL_NECK_HEIGHT,
-        head_width=RAIL_HEAD_WIDTH,
-        chamfer_height=RAIL_CHAMFER_HEIGHT,
-        head_flat=RAIL_HEAD_FLAT,
-        length=rail_length,
-        x=right_x,
-        y=0,
-        z=wall_top  # Sits on top of wall
-    )
-    rails.append(right_rail)
+    # Right side rail - the left one mirrored onto the right wall, so the
+    # T-profile (union + wedge cuts) is only built once
+    rails.append(Symmetric(left_rail, "x", TRAY_WIDTH / 2))
 
     return rails
 
@@ -450,39 +389,21 @@ def generate_rail_frame():
     )
     parts.append(left_rail_lip)
 
-    # Right rail - main body
-    right_rail_base = create_box(
-        FRAME_RAIL_WIDTH,
-        FRAME_LENGTH,
-        FRAME_RAIL_HEIGHT,
-        ACTUAL_FRAME_WIDTH - FRAME_RAIL_WIDTH, 0, 0
-    )
-    parts.append(right_rail_base)
-
-    # Right rail - lip extending inward
-    right_rail_lip = create_box(
-        RAIL_LIP_DEPTH,
-        FRAME_LENGTH,
-        RAIL_LIP_HEIGHT,
-        ACTUAL_FRAME_WIDTH - FRAME_RAIL_WIDTH - RAIL_LIP_DEPTH,
-        0,
-        FRAME_RAIL_HEIGHT - RAIL_LIP_HEIGHT
-    )
-    parts.append(right_rail_lip)
+    # The right rail and lip are the left ones mirrored (see the end)
 
     # Cross beams connecting the rails at the top (span the gap between lips)
     beam_thickness = 3.0  # mm - thin but sturdy
     beam_z = FRAME_RAIL_HEIGHT - beam_thickness  # At top of rail
 
-    # Beams span from end of left lip to start of right lip
+    # Beams span from end of left lip to start of right lip; the left half
+    # is built here and mirrored with the rest of the frame
     left_lip_end = FRAME_RAIL_WIDTH + RAIL_LIP_DEPTH
-    right_lip_start = ACTUAL_FRAME_WIDTH - FRAME_RAIL_WIDTH - RAIL_LIP_DEPTH
-    beam_span = right_lip_start - left_lip_end
+    center_x = ACTUAL_FRAME_WIDTH / 2
 
     for pos_ratio in FRAME_BEAM_POSITIONS:
         y_pos = pos_ratio * (FRAME_LENGTH - FRAME_BEAM_WIDTH)
         beam = create_box(
-            beam_span + 10,  # Overlap into lips by 5mm each side
+            center_x - left_lip_end + 5,  # Overlap into left lip by 5mm
             FRAME_BEAM_WIDTH,
             beam_thickness,
             left_lip_end - 5,  # Start 5mm into left lip
@@ -492,13 +413,7 @@ def generate_rail_frame():
         parts.append(beam)
 
     # Combine all frame parts
-    print("Combining frame parts...")
-    frame = parts[0]
-    for part in parts[1:]:
-        try:
-            frame = trimesh.boolean.union([frame, part], engine='manifold')
-        except:
-            frame = trimesh.util.concatenate([frame, part])
+    frame = Union(*parts)
 
     # Subtract downward-opening T-slots from the LIPS
     # T-slots cut through the bottom of the lips (which are at the top of the frame)
@@ -527,54 +442,30 @@ def generate_rail_frame():
         FRAME_RAIL_HEIGHT - RAIL_LIP_HEIGHT - 0.5  # Cut from bottom of lip
     )
 
-    # Right T-slot - mirror position
-    right_x = ACTUAL_FRAME_WIDTH - FRAME_RAIL_WIDTH - WALL_THICKNESS / 2
-    right_t_slot = create_box(
-        cavity_width,
-        slot_length,
-        channel_depth,
-        right_x - cavity_width / 2,
-        FRAME_STOP_THICKNESS,
-        FRAME_RAIL_HEIGHT - RAIL_LIP_HEIGHT - 0.5
-    )
-
     # Subtract slots from frame
-    try:
-        all_slots = trimesh.boolean.union([left_t_slot, right_t_slot], engine='manifold')
-        frame = trimesh.boolean.difference([frame, all_slots], engine='manifold')
-    except Exception as e:
-        print(f"  Warning: T-slot subtraction failed: {e}")
+    frame = Difference(frame, left_t_slot)
 
     # Add screw holes on the CROSS BEAMS
-    # Put TWO screw holes per beam (in the gap area) = 6 total
+    # Put TWO screw holes per beam (in the gap area) = 6 total, the right
+    # one of each pair mirrored from the left
     screw_inset = 15.0  # mm from lip end to screw center
     hole_x_left = left_lip_end + screw_inset
-    hole_x_right = right_lip_start - screw_inset
 
     # Y positions match the cross beam positions
     hole_y_positions = [pos * (FRAME_LENGTH - FRAME_BEAM_WIDTH) + FRAME_BEAM_WIDTH/2
                         for pos in FRAME_BEAM_POSITIONS]
 
-    # Subtract screw holes (2 per beam = 6 total)
-    for y_pos in hole_y_positions:
-        for x_pos in [hole_x_left, hole_x_right]:
-            shaft = create_cylinder(
-                FRAME_SCREW_HOLE / 2,
-                FRAME_RAIL_HEIGHT + 2,
-                x_pos, y_pos, -1
-            )
-            countersink = create_cylinder(
-                FRAME_COUNTERSINK / 2,
-                4.0,  # 4mm deep countersink
-                x_pos, y_pos, -0.1
-            )
-            try:
-                hole = trimesh.boolean.union([shaft, countersink], engine='manifold')
-                frame = trimesh.boolean.difference([frame, hole], engine='manifold')
-            except:
-                pass
-
-    return frame
+    # Subtract the left screw holes: shaft plus a 4mm deep counterbore from
+    # the underside, all of them one cutter
+    positions = [(hole_x_left, y_pos) for y_pos in hole_y_positions]
+    frame = drill(frame, positions, FRAME_SCREW_HOLE, FRAME_RAIL_HEIGHT + 2, -1,
+                  kind="counterbore", head_diameter=FRAME_COUNTERSINK, head_depth=4.9,
+                  head="start")
+
+    # Merge everything and cut slots + holes on the left half, then mirror
+    # it onto the right (the frame is symmetric about its centre line)
+    print("Combining frame parts and cutting slots/holes...")
+    return evaluate(Symmetric(frame, "x", center_x), "rail frame")
 
 def generate_cable_tray():
     """Generate the cable tray with T-profiles that slide into the rail frame."""
@@ -594,13 +485,7 @@ def generate_cable_tray():
     print("\nCombining all parts...")
     all_parts = [shell] + rails  # No ribs
 
-    result = all_parts[0]
-    for i, part in enumerate(all_parts[1:], 1):
-        try:
-            result = trimesh.boolean.union([result, part], engine='manifold')
-        except Exception as e:
-            print(f"Warning: Union {i} failed, using concatenate")
-            result = trimesh.util.concatenate([result, part])
+    result = evaluate(Union(*all_parts), "cable tray")
 
     # Validate mesh
     print(f"\nMesh is watertight: {result.is_watertight}")
@@ -612,12 +497,18 @@ def generate_cable_tray():
 
     return result
 
+# Parts built by this script (used by python -m stl101.build)
+PARTS = {
+    "cable_tray.stl": generate_cable_tray,
+    "rail_frame.stl": generate_rail_frame,
+}
+
 def main():
     import os
     script_dir = os.path.dirname(os.path.abspath(__file__))
 
     # Generate the tray
-    tray = generate_cable_tray()
+    tray = cache.cached_part(generate_cable_tray)
 
     # Get bounds for info
     bounds = tray.bounds
@@ -631,7 +522,7 @@ def main():
 
     # Generate rail frame
     print("\n")
-    frame = generate_rail_frame()
+    frame = cache.cached_part(generate_rail_frame)
 
     bounds = frame.bounds
     size = bounds[1] - bounds[0]
@@ -652,5 +543,9 @@ def main():
     print("5. Tray stops at the frame's stop walls")
     print("="*50)
 
+    cache.print_stats()
+    engines.print_report()
+    kernel.print_report()
+
 if __name__ == "__main__":
     main()
@@ -9,9 +9,17 @@ Features:
 - Modular design - print multiple segments for longer runs
 """
 
+import os
+import sys
+
 import trimesh
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from stl101 import cache, engines, kernel
+from stl101.csg import Difference, Union, evaluate
+from stl101.kernel import create_box, create_cylinder, linear_pattern
+
 # ============================================
 # Parameters - adjust as needed
 # ============================================
@@ -40,20 +48,8 @@ CORNER_RADIUS = 2.0         # mm
 # Helper functions
 # ============================================
 
-def create_box(width, height, depth, x=0, y=0, z=0):
-    """Create a box mesh at the specified position."""
-    box = trimesh.creation.box(extents=[width, height, depth])
-    box.apply_translation([x + width/2, y + height/2, z + depth/2])
-    return box
-
-def create_cylinder(radius, height, x=0, y=0, z=0, segments=32):
-    """Create a cylinder mesh at the specified position."""
-    cyl = trimesh.creation.cylinder(radius=radius, height=height, sections=segments)
-    cyl.apply_translation([x, y, z + height/2])
-    return cyl
-
 def create_rounded_box(width, length, height, radius, x=0, y=0, z=0):
-    """Create a box with rounded edges using cylinders at corners."""
+    """Create a box with rounded edges using cylinders at corners (CSG node)."""
     # Main body (reduced by corner radius on all sides)
     center_width = width - 2 * radius
     center_length = length - 2 * radius
@@ -96,21 +92,14 @@ def create_rounded_box(width, length, height, radius, x=0, y=0, z=0):
         parts.append(corner)
 
     # Union all parts
-    result = parts[0]
-    for part in parts[1:]:
-        try:
-            result = trimesh.boolean.union([result, part], engine='manifold')
-        except:
-            result = trimesh.util.concatenate([result, part])
-
-    return result
+    return Union(*parts)
 
 # ============================================
 # Main generation functions
 # ============================================
 
 def generate_duct_body():
-    """Generate the main wire duct tube."""
+    """Generate the main wire duct tube (CSG node)."""
 
     print(f"=== Wire Duct Tube ===")
     print(f"Outer: {DUCT_WIDTH}mm W x {DUCT_HEIGHT}mm H x {DUCT_LENGTH}mm L")
@@ -141,12 +130,7 @@ def generate_duct_body():
     )
 
     # Subtract inner cavity
-    print("Creating U-shaped tube...")
-    try:
-        shell = trimesh.boolean.difference([outer, inner], engine='manifold')
-    except Exception as e:
-        print(f"Boolean failed: {e}")
-        shell = outer
+    shell = Difference(outer, inner)
 
     # Create cable entry slot at bottom (narrow opening)
     slot = create_box(
@@ -159,15 +143,10 @@ def generate_duct_body():
     )
 
     # Subtract slot
-    try:
-        shell = trimesh.boolean.difference([shell, slot], engine='manifold')
-    except Exception as e:
-        print(f"Slot subtraction failed: {e}")
-
-    return shell
+    return Difference(shell, slot)
 
 def generate_mounting_clip(x_pos, y_pos):
-    """Generate a single desk-edge mounting clip at the specified position."""
+    """Generate a single desk-edge mounting clip at the specified position (CSG node)."""
 
     # C-shaped clip that grabs desk edge
     # Structure: vertical arm up from duct, horizontal lip over desk top, vertical arm down back side
@@ -230,14 +209,7 @@ def generate_mounting_clip(x_pos, y_pos):
     parts.append(back_lip)
 
     # Combine all clip parts
-    clip = parts[0]
-    for part in parts[1:]:
-        try:
-            clip = trimesh.boolean.union([clip, part], engine='manifold')
-        except:
-            clip = trimesh.util.concatenate([clip, part])
-
-    return clip
+    return Union(*parts)
 
 def generate_wire_duct():
     """Generate complete wire duct with mounting clips."""
@@ -253,22 +225,15 @@ def generate_wire_duct():
 
     print(f"\nAdding {num_clips} mounting clips...")
 
-    clips = []
-    for y_pos in clip_positions:
-        # Center clip on duct width
-        x_pos = DUCT_WIDTH / 2
-        clip = generate_mounting_clip(x_pos, y_pos)
-        clips.append(clip)
+    # Every clip is the same five boxes: pattern each box along the duct so
+    # the clips enter the union as five meshes, however many there are
+    pitch = (0, clip_positions[1] - clip_positions[0], 0)
+    seed = generate_mounting_clip(DUCT_WIDTH / 2, clip_positions[0])
+    clips = [linear_pattern(part.mesh, num_clips, pitch) for part in seed.children]
 
     # Combine duct with all clips
     print("Combining duct and clips...")
-    result = duct
-    for i, clip in enumerate(clips):
-        try:
-            result = trimesh.boolean.union([result, clip], engine='manifold')
-        except Exception as e:
-            print(f"Warning: Clip {i} union failed, using concatenate")
-            result = trimesh.util.concatenate([result, clip])
+    result = evaluate(Union(duct, *clips), "wire duct")
 
     # Validate mesh
     print(f"\nMesh is watertight: {result.is_watertight}")
@@ -280,12 +245,24 @@ def generate_wire_duct():
 
     return result
 
+# Parts built by this script (used by python -m stl101.build)
+PARTS = {
+    "wire_duct.stl": generate_wire_duct,
+}
+
+# Reference each part is compared against on every build (see stl101.deviation)
+# and the Hausdorff distance (mm) past which the build fails: 13.75 measured
+# + 0.5 margin
+REFERENCES = {
+    "wire_duct.stl": ("cable_channel_v2_ref.obj", 14.3),
+}
+
 def main():
     import os
     script_dir = os.path.dirname(os.path.abspath(__file__))
 
     # Generate the wire duct
-    duct = generate_wire_duct()
+    duct = cache.cached_part(generate_wire_duct)
 
     # Get bounds for info
     bounds = duct.bounds
@@ -309,5 +286,9 @@ def main():
     print(f"\nNOTE: Desk thickness set to {CLIP_GAP}mm")
     print("      Adjust CLIP_GAP parameter if your desk is different")
 
+    cache.print_stats()
+    engines.print_report()
+    kernel.print_report()
+
 if __name__ == "__main__":
     main()
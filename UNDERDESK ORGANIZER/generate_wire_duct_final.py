@@ -10,9 +10,18 @@ Features:
 - Optional ribbed texture pattern
 """
 
+import os
+import sys
+
 import trimesh
 import numpy as np
-from shapely.geometry import Polygon
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from stl101 import cache, engines, kernel
+from stl101.csg import Symmetric, Union, evaluate
+from stl101.holes import drill
+from stl101.kernel import create_box, create_boxes
+from shapely.geometry import Polygon, box
 
 # ============================================
 # Parameters
@@ -49,22 +58,11 @@ RIB_DEPTH = 0.8             # mm (how far ribs protrude)
 # Helper functions
 # ============================================
 
-def create_box(width, height, depth, x=0, y=0, z=0):
-    """Create a box mesh."""
-    box = trimesh.creation.box(extents=[width, height, depth])
-    box.apply_translation([x + width/2, y + height/2, z + depth/2])
-    return box
-
-def create_cylinder(radius, height, x=0, y=0, z=0, segments=32):
-    """Create a cylinder mesh."""
-    cyl = trimesh.creation.cylinder(radius=radius, height=height, sections=segments)
-    cyl.apply_translation([x, y, z + height/2])
-    return cyl
-
-def create_channel_profile():
+def create_channel_profile(half=False):
     """
     Create the 2D cross-section profile of the channel.
     Shape: Wide opening at top, tapers to narrow retention slot at bottom.
+    half=True returns only the right half (x >= 0), for mirrored builds.
     """
 
     # Calculate dimensions
@@ -113,6 +111,11 @@ def create_channel_profile():
     # Back to base
     profile_points.append((-base_half, 0))
 
+    if half:
+        right = Polygon(profile_points).intersection(
+            box(0, -BASE_THICKNESS - 1, base_half + 1, total_height + 1))
+        return list(right.exterior.coords)[:-1]
+
     return profile_points
 
 def extrude_profile(profile_points, length):
@@ -126,46 +129,27 @@ def extrude_profile(profile_points, length):
 
     return mesh
 
-def add_ribs(body):
-    """Add ribbed texture pattern to exterior."""
+def add_ribs(body, half=False):
+    """Add ribbed texture pattern to exterior (right side only if half)."""
     if not ADD_RIBS:
         return body
 
     print(f"Adding ribs (spacing: {RIB_SPACING}mm)...")
 
     num_ribs = int(DUCT_LENGTH / RIB_SPACING)
+    if num_ribs < 2:
+        return body
+
+    # Left and right rib at every position (skip first and last)
+    y_positions = np.arange(1, num_ribs) * RIB_SPACING
+    x_positions = [OPENING_WIDTH/2] if half else [-OPENING_WIDTH/2 - RIB_DEPTH, OPENING_WIDTH/2]
+    origins = [(x, y - RIB_WIDTH/2, 0) for y in y_positions for x in x_positions]
 
-    for i in range(1, num_ribs):  # Skip first and last
-        y_pos = i * RIB_SPACING
-
-        # Left side rib
-        left_rib = create_box(
-            RIB_DEPTH,
-            RIB_WIDTH,
-            OPENING_HEIGHT,
-            -OPENING_WIDTH/2 - RIB_DEPTH,
-            y_pos - RIB_WIDTH/2,
-            0
-        )
-
-        # Right side rib
-        right_rib = create_box(
-            RIB_DEPTH,
-            RIB_WIDTH,
-            OPENING_HEIGHT,
-            OPENING_WIDTH/2,
-            y_pos - RIB_WIDTH/2,
-            0
-        )
-
-        # Add ribs to body
-        try:
-            body = trimesh.boolean.union([body, left_rib], engine='manifold')
-            body = trimesh.boolean.union([body, right_rib], engine='manifold')
-        except:
-            pass
-
-    return body
+    # Ribs never touch each other, so all of them are built as one mesh and
+    # joined to the body in a single union - cost grows linearly with count
+    ribs = create_boxes([RIB_DEPTH, RIB_WIDTH, OPENING_HEIGHT], origins)
+
+    return Union(body, ribs)
 
 def add_screw_holes(body):
     """Add 2 screw holes (one on each end, 20mm from ends)."""
@@ -180,30 +164,14 @@ def add_screw_holes(body):
     hole_x = 0  # Center of base
     hole_z_bottom = -BASE_THICKNESS - 1
 
+    positions = [(hole_x, y_pos) for y_pos in hole_y_positions]
     for i, y_pos in enumerate(hole_y_positions):
-        # Shaft
-        shaft = create_cylinder(
-            SCREW_HOLE_DIA / 2,
-            BASE_THICKNESS + 2,
-            hole_x, y_pos, hole_z_bottom
-        )
-
-        # Countersink
-        countersink = create_cylinder(
-            SCREW_COUNTERSINK_DIA / 2,
-            SCREW_COUNTERSINK_DEPTH + 0.5,
-            hole_x, y_pos, hole_z_bottom
-        )
-
-        # Subtract from body
-        try:
-            hole = trimesh.boolean.union([shaft, countersink], engine='manifold')
-            body = trimesh.boolean.difference([body, hole], engine='manifold')
-            print(f"  Hole {i+1} at Y={y_pos:.1f}mm")
-        except Exception as e:
-            print(f"  Warning: Hole {i+1} failed: {e}")
-
-    return body
+        print(f"  Hole {i+1} at Y={y_pos:.1f}mm")
+
+    # Shaft with a counterbore from the underside, all holes in one cutter
+    return drill(body, positions, SCREW_HOLE_DIA, BASE_THICKNESS + 2, hole_z_bottom,
+                 kind="counterbore", head_diameter=SCREW_COUNTERSINK_DIA,
+                 head_depth=SCREW_COUNTERSINK_DEPTH + 0.5, head="start")
 
 def generate_wire_duct():
     """Generate complete wire duct."""
@@ -214,9 +182,10 @@ def generate_wire_duct():
     print(f"Retention slot: {RETENTION_SLOT_WIDTH}mm wide at height {RETENTION_HEIGHT}mm")
     print(f"Mounting base: {BASE_WIDTH}mm x {BASE_THICKNESS}mm\n")
 
-    # Create profile
-    print("Creating channel profile...")
-    profile = create_channel_profile()
+    # The duct is mirror-symmetric about X = 0: build the right half (the
+    # holes on the centre line cut it too), then mirror and weld it
+    print("Creating channel profile (right half, mirrored)...")
+    profile = create_channel_profile(half=True)
 
     # Extrude
     print(f"Extruding profile {DUCT_LENGTH}mm...")
@@ -224,11 +193,14 @@ def generate_wire_duct():
 
     # Add ribs
     if ADD_RIBS:
-        duct = add_ribs(duct)
+        duct = add_ribs(duct, half=True)
 
     # Add screw holes
     duct = add_screw_holes(duct)
 
+    # Build the whole part in one optimized CSG pass
+    duct = evaluate(Symmetric(duct, "x", 0), "wire duct")
+
     # Validate
     print(f"\nMesh validation:")
     print(f"  Watertight: {duct.is_watertight}")
@@ -240,12 +212,24 @@ def generate_wire_duct():
 
     return duct
 
+# Parts built by this script (used by python -m stl101.build)
+PARTS = {
+    "wire_duct_final.stl": generate_wire_duct,
+}
+
+# Reference each part is compared against on every build (see stl101.deviation)
+# and the Hausdorff distance (mm) past which the build fails: 10.12 measured
+# + 0.5 margin
+REFERENCES = {
+    "wire_duct_final.stl": ("cable_channel_v2_ref.obj", 10.7),
+}
+
 def main():
     import os
     script_dir = os.path.dirname(os.path.abspath(__file__))
 
     # Generate
-    duct = generate_wire_duct()
+    duct = cache.cached_part(generate_wire_duct)
 
     # Info
     bounds = duct.bounds
@@ -273,5 +257,9 @@ def main():
     print("4. Internal lip retains cables")
     print("="*60)
 
+    cache.print_stats()
+    engines.print_report()
+    kernel.print_report()
+
 if __name__ == "__main__":
     main()
@@ -10,9 +10,18 @@ Features:
 - Optional ribbed texture on exterior
 """
 
+import os
+import sys
+
 import trimesh
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from stl101 import cache, engines, kernel
+from stl101.csg import Difference, Union, evaluate
+from stl101.holes import drill
+from stl101.kernel import create_box, create_boxes
+
 # ============================================
 # Parameters
 # ============================================
@@ -45,20 +54,8 @@ RIB_DEPTH = 0.8             # mm (how far ribs protrude)
 # Helper functions
 # ============================================
 
-def create_box(width, height, depth, x=0, y=0, z=0):
-    """Create a box mesh."""
-    box = trimesh.creation.box(extents=[width, height, depth])
-    box.apply_translation([x + width/2, y + height/2, z + depth/2])
-    return box
-
-def create_cylinder(radius, height, x=0, y=0, z=0, segments=32):
-    """Create a cylinder mesh."""
-    cyl = trimesh.creation.cylinder(radius=radius, height=height, sections=segments)
-    cyl.apply_translation([x, y, z + height/2])
-    return cyl
-
 def generate_channel_body():
-    """Generate simple U-shaped channel with flat mounting base."""
+    """Generate simple U-shaped channel with flat mounting base (CSG node)."""
 
     # Calculate dimensions
     outer_width = CHANNEL_WIDTH + 2 * WALL_THICKNESS
@@ -94,13 +91,7 @@ def generate_channel_body():
     parts.append(outer)
 
     # Combine base and channel
-    print("Creating channel body...")
-    body = parts[0]
-    for part in parts[1:]:
-        try:
-            body = trimesh.boolean.union([body, part], engine='manifold')
-        except:
-            body = trimesh.util.concatenate([body, part])
+    body = Union(*parts)
 
     # Create inner cavity (hollow out the channel)
     inner_cavity = create_box(
@@ -113,13 +104,7 @@ def generate_channel_body():
     )
 
     # Subtract cavity
-    print("Hollowing channel...")
-    try:
-        body = trimesh.boolean.difference([body, inner_cavity], engine='manifold')
-    except Exception as e:
-        print(f"Warning: Cavity subtraction failed: {e}")
-
-    return body
+    return Difference(body, inner_cavity)
 
 def add_ribs(body):
     """Add ribbed texture pattern to exterior sides."""
@@ -130,38 +115,20 @@ def add_ribs(body):
 
     num_ribs = int(CHANNEL_LENGTH / RIB_SPACING)
     outer_width = CHANNEL_WIDTH + 2 * WALL_THICKNESS
+    if num_ribs < 2:
+        return body
+
+    # Left and right rib at every position (skip first and last),
+    # protruding outward from each wall
+    y_positions = np.arange(1, num_ribs) * RIB_SPACING
+    x_positions = [-RIB_DEPTH, outer_width]
+    origins = [(x, y - RIB_WIDTH/2, WALL_THICKNESS) for y in y_positions for x in x_positions]
 
-    for i in range(1, num_ribs):  # Skip first and last positions
-        y_pos = i * RIB_SPACING
-
-        # Left side rib
-        left_rib = create_box(
-            RIB_DEPTH,
-            RIB_WIDTH,
-            CHANNEL_HEIGHT,
-            -RIB_DEPTH,  # Protrude outward from left wall
-            y_pos - RIB_WIDTH/2,
-            WALL_THICKNESS
-        )
-
-        # Right side rib
-        right_rib = create_box(
-            RIB_DEPTH,
-            RIB_WIDTH,
-            CHANNEL_HEIGHT,
-            outer_width,  # Protrude outward from right wall
-            y_pos - RIB_WIDTH/2,
-            WALL_THICKNESS
-        )
-
-        # Add ribs
-        try:
-            body = trimesh.boolean.union([body, left_rib], engine='manifold')
-            body = trimesh.boolean.union([body, right_rib], engine='manifold')
-        except:
-            pass
-
-    return body
+    # Ribs never touch each other, so all of them are built as one mesh and
+    # joined to the body in a single union - cost grows linearly with count
+    ribs = create_boxes([RIB_DEPTH, RIB_WIDTH, CHANNEL_HEIGHT], origins)
+
+    return Union(body, ribs)
 
 def add_screw_holes(body):
     """Add 2 screw holes (one on each end, 20mm from ends)."""
@@ -181,30 +148,14 @@ def add_screw_holes(body):
     # Z position (through base from bottom)
     hole_z_bottom = -0.5
 
+    # Flat-bottomed counterbore from the underside; both holes are one cutter
+    positions = [(hole_x, y_pos) for y_pos in hole_y_positions]
     for i, y_pos in enumerate(hole_y_positions):
-        # Screw shaft
-        shaft = create_cylinder(
-            SCREW_HOLE_DIA / 2,
-            WALL_THICKNESS + 1,
-            hole_x, y_pos, hole_z_bottom
-        )
-
-        # Countersink
-        countersink = create_cylinder(
-            SCREW_COUNTERSINK_DIA / 2,
-            SCREW_COUNTERSINK_DEPTH + 0.5,
-            hole_x, y_pos, hole_z_bottom
-        )
-
-        # Combine and subtract
-        try:
-            hole = trimesh.boolean.union([shaft, countersink], engine='manifold')
-            body = trimesh.boolean.difference([body, hole], engine='manifold')
-            print(f"  Hole {i+1} at Y={y_pos:.1f}mm")
-        except Exception as e:
-            print(f"  Warning: Hole {i+1} failed: {e}")
-
-    return body
+        print(f"  Hole {i+1} at Y={y_pos:.1f}mm")
+
+    return drill(body, positions, SCREW_HOLE_DIA, WALL_THICKNESS + 1, hole_z_bottom,
+                 kind="counterbore", head_diameter=SCREW_COUNTERSINK_DIA,
+                 head_depth=SCREW_COUNTERSINK_DEPTH + 0.5, head="start")
 
 def generate_wire_duct():
     """Generate complete wire duct."""
@@ -221,6 +172,9 @@ def generate_wire_duct():
     # Add screw holes
     duct = add_screw_holes(duct)
 
+    # Build the whole part in one optimized CSG pass
+    duct = evaluate(duct, "wire duct")
+
     # Validate
     print(f"\nMesh validation:")
     print(f"  Watertight: {duct.is_watertight}")
@@ -232,12 +186,24 @@ def generate_wire_duct():
 
     return duct
 
+# Parts built by this script (used by python -m stl101.build)
+PARTS = {
+    "wire_duct_simple.stl": generate_wire_duct,
+}
+
+# Reference each part is compared against on every build (see stl101.deviation)
+# and the Hausdorff distance (mm) past which the build fails: 12.50 measured
+# + 0.5 margin
+REFERENCES = {
+    "wire_duct_simple.stl": ("cable_channel_v2_ref.obj", 13.0),
+}
+
 def main():
     import os
     script_dir = os.path.dirname(os.path.abspath(__file__))
 
     # Generate
-    duct = generate_wire_duct()
+    duct = cache.cached_part(generate_wire_duct)
 
     # Info
     bounds = duct.bounds
@@ -265,5 +231,9 @@ def main():
     print("4. Print multiple segments for longer runs")
     print("="*60)
 
+    cache.print_stats()
+    engines.print_report()
+    kernel.print_report()
+
 if __name__ == "__main__":
     main()
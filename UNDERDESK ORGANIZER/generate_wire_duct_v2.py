@@ -10,9 +10,18 @@ Features:
 - 2 screw holes (one on each end, 20mm from ends)
 """
 
+import os
+import sys
+
 import trimesh
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from stl101 import cache, engines, kernel
+from stl101.csg import Difference, Union, evaluate
+from stl101.holes import drill
+from stl101.kernel import create_box
+
 # ============================================
 # Parameters - adjust as needed
 # ============================================
@@ -47,18 +56,6 @@ CORNER_RADIUS = 2.0         # mm
 # Helper functions
 # ============================================
 
-def create_box(width, height, depth, x=0, y=0, z=0):
-    """Create a box mesh at the specified position."""
-    box = trimesh.creation.box(extents=[width, height, depth])
-    box.apply_translation([x + width/2, y + height/2, z + depth/2])
-    return box
-
-def create_cylinder(radius, height, x=0, y=0, z=0, segments=32):
-    """Create a cylinder mesh at the specified position."""
-    cyl = trimesh.creation.cylinder(radius=radius, height=height, sections=segments)
-    cyl.apply_translation([x, y, z + height/2])
-    return cyl
-
 def create_rounded_box(width, length, height, radius, x=0, y=0, z=0):
     """Create a box with rounded vertical edges."""
     # Simplified - create regular box
@@ -70,7 +67,7 @@ def create_rounded_box(width, length, height, radius, x=0, y=0, z=0):
 # ============================================
 
 def generate_duct_body():
-    """Generate the main wire duct channel with mounting base."""
+    """Generate the main wire duct channel with mounting base (CSG node)."""
 
     print(f"=== Wire Duct with Screw Mount ===")
     print(f"Duct opening: {DUCT_WIDTH}mm W x {DUCT_HEIGHT}mm H")
@@ -100,13 +97,7 @@ def generate_duct_body():
     parts.append(outer)
 
     # Combine base and outer shell
-    print("Combining base and channel...")
-    body = parts[0]
-    for part in parts[1:]:
-        try:
-            body = trimesh.boolean.union([body, part], engine='manifold')
-        except:
-            body = trimesh.util.concatenate([body, part])
+    body = Union(*parts)
 
     # Create inner cavity (U-shaped - open at top)
     inner_width = DUCT_WIDTH - 2 * WALL_THICKNESS
@@ -123,11 +114,7 @@ def generate_duct_body():
     )
 
     # Subtract inner cavity
-    print("Creating U-channel cavity...")
-    try:
-        body = trimesh.boolean.difference([body, inner], engine='manifold')
-    except Exception as e:
-        print(f"Cavity subtraction failed: {e}")
+    body = Difference(body, inner)
 
     # Add internal cable retention lip
     # Lip extends inward from top of side walls
@@ -154,14 +141,7 @@ def generate_duct_body():
     )
 
     # Add lips to body
-    print("Adding cable retention lips...")
-    try:
-        body = trimesh.boolean.union([body, left_lip], engine='manifold')
-        body = trimesh.boolean.union([body, right_lip], engine='manifold')
-    except Exception as e:
-        print(f"Lip addition failed: {e}")
-
-    return body
+    return Union(body, left_lip, right_lip)
 
 def add_screw_holes(body):
     """Add screw holes to the mounting base (2 holes, one on each end)."""
@@ -183,35 +163,15 @@ def add_screw_holes(body):
     # Z position (through mounting base from bottom)
     hole_z_bottom = -BASE_THICKNESS - 1
 
-    # Create and subtract each screw hole
+    # Shaft through the entire base, counterbored from the bottom surface -
+    # every hole in one cutter, subtracted once
+    positions = [(hole_x, y_pos) for y_pos in hole_y_positions]
     for i, y_pos in enumerate(hole_y_positions):
-        # Screw shaft hole (through entire base)
-        shaft = create_cylinder(
-            SCREW_HOLE_DIA / 2,
-            BASE_THICKNESS + 2,
-            hole_x,
-            y_pos,
-            hole_z_bottom
-        )
-
-        # Countersink (from bottom surface)
-        countersink = create_cylinder(
-            SCREW_COUNTERSINK_DIA / 2,
-            SCREW_COUNTERSINK_DEPTH + 0.5,
-            hole_x,
-            y_pos,
-            hole_z_bottom
-        )
-
-        # Combine shaft and countersink
-        try:
-            hole = trimesh.boolean.union([shaft, countersink], engine='manifold')
-            body = trimesh.boolean.difference([body, hole], engine='manifold')
-            print(f"  Hole {i+1} at Y={y_pos:.1f}mm")
-        except Exception as e:
-            print(f"  Warning: Hole {i+1} subtraction failed: {e}")
-
-    return body
+        print(f"  Hole {i+1} at Y={y_pos:.1f}mm")
+
+    return drill(body, positions, SCREW_HOLE_DIA, BASE_THICKNESS + 2, hole_z_bottom,
+                 kind="counterbore", head_diameter=SCREW_COUNTERSINK_DIA,
+                 head_depth=SCREW_COUNTERSINK_DEPTH + 0.5, head="start")
 
 def generate_wire_duct():
     """Generate complete wire duct with mounting base and screw holes."""
@@ -224,6 +184,9 @@ def generate_wire_duct():
     # Add screw holes
     duct = add_screw_holes(duct)
 
+    # Build the whole part in one optimized CSG pass
+    duct = evaluate(duct, "wire duct")
+
     # Validate mesh
     print(f"\nMesh validation:")
     print(f"  Watertight: {duct.is_watertight}")
@@ -235,12 +198,24 @@ def generate_wire_duct():
 
     return duct
 
+# Parts built by this script (used by python -m stl101.build)
+PARTS = {
+    "wire_duct_screw_mount.stl": generate_wire_duct,
+}
+
+# Reference each part is compared against on every build (see stl101.deviation)
+# and the Hausdorff distance (mm) past which the build fails: 7.98 measured
+# + 0.5 margin
+REFERENCES = {
+    "wire_duct_screw_mount.stl": ("cable_channel_v2_ref.obj", 8.5),
+}
+
 def main():
     import os
     script_dir = os.path.dirname(os.path.abspath(__file__))
 
     # Generate the wire duct
-    duct = generate_wire_duct()
+    duct = cache.cached_part(generate_wire_duct)
 
     # Get bounds for info
     bounds = duct.bounds
@@ -264,5 +239,9 @@ def main():
     print("7. Print multiple segments for longer cable runs")
     print("="*60)
 
+    cache.print_stats()
+    engines.print_report()
+    kernel.print_report()
+
 if __name__ == "__main__":
     main()
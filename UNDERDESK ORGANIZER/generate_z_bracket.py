@@ -3,9 +3,18 @@
 Simple Z-Bracket - T-head overhang rests on the bottom lip
 """
 
+import os
+import sys
+
 import trimesh
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from stl101 import cache, engines, kernel
+from stl101.csg import Union, evaluate
+from stl101.holes import drill
+from stl101.kernel import create_box
+
 # Bracket dimensions
 THICKNESS = 3.0      # mm - material thickness
 LENGTH = 40.0        # mm - bracket length (along tray)
@@ -22,16 +31,6 @@ LIP_WIDTH = 8.0      # mm
 # Screw holes
 SCREW_DIA = 4.5      # mm
 
-def create_box(w, l, h, x=0, y=0, z=0):
-    box = trimesh.creation.box(extents=[w, l, h])
-    box.apply_translation([x + w/2, y + l/2, z + h/2])
-    return box
-
-def create_cylinder(r, h, x=0, y=0, z=0):
-    cyl = trimesh.creation.cylinder(radius=r, height=h, sections=32)
-    cyl.apply_translation([x, y, z + h/2])
-    return cyl
-
 def generate_bracket():
     """
     Side view (X-Z plane, looking along Y):
@@ -66,16 +65,16 @@ def generate_bracket():
     parts.append(lip)
 
     # Combine
-    result = parts[0]
-    for p in parts[1:]:
-        result = trimesh.boolean.union([result, p], engine='manifold')
+    result = Union(*parts)
 
-    # Screw holes in top plate
-    for y in [LENGTH * 0.25, LENGTH * 0.75]:
-        hole = create_cylinder(SCREW_DIA / 2, THICKNESS + 2, TOP_WIDTH / 2, y, -THICKNESS - 1)
-        result = trimesh.boolean.difference([result, hole], engine='manifold')
+    # Screw holes in top plate (one cutter for both)
+    positions = [(TOP_WIDTH / 2, y) for y in [LENGTH * 0.25, LENGTH * 0.75]]
+    return evaluate(drill(result, positions, SCREW_DIA, THICKNESS + 2, -THICKNESS - 1), "z-bracket")
 
-    return result
+# Parts built by this script (used by python -m stl101.build)
+PARTS = {
+    "z_bracket.stl": generate_bracket,
+}
 
 if __name__ == "__main__":
     import os
@@ -83,7 +82,7 @@ if __name__ == "__main__":
     print(f"Z-Bracket: {TOP_WIDTH}mm top, {DROP}mm drop, {LIP_WIDTH}mm lip")
     print(f"Thickness: {THICKNESS}mm, Length: {LENGTH}mm")
 
-    bracket = generate_bracket()
+    bracket = cache.cached_part(generate_bracket)
 
     bounds = bracket.bounds
     size = bounds[1] - bounds[0]
@@ -93,3 +92,6 @@ if __name__ == "__main__":
     bracket.export(path)
     print(f"Saved: {path}")
     print("\nPrint 2-4 brackets. Screw to desk, slide tray so T-heads rest on lips.")
+    cache.print_stats()
+    engines.print_report()
+    kernel.print_report()
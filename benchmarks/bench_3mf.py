@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+3MF benchmark - instanced 3MF plate vs duplicated STL geometry
+
+Puts N copies of one part on a plate and writes it two ways:
+
+- stl:  every copy's triangles concatenated into one binary STL (what a
+        multi-copy plate costs as STL)
+- 3mf:  threemf.write_3mf(), the mesh stored once and placed N times as
+        build items
+
+and reports file size, write time and the time trimesh takes to load each
+file back.
+
+Usage:
+    python benchmarks/bench_3mf.py
+    python benchmarks/bench_3mf.py --part wire_duct_final.stl --copies 1 4 16 --repeat 5
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+import trimesh
+
+from stl101 import cache
+from stl101.build import discover_parts, load_generator
+from stl101.nesting import nest
+from stl101.threemf import write_3mf
+
+
+def best_time(run, repeat):
+    """Best seconds over repeat runs (run's result is discarded)."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--part", default="z_bracket.stl", help="part name from a generator's PARTS")
+    parser.add_argument("--copies", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    scripts = {name: path for path, name in discover_parts()}
+    with contextlib.redirect_stdout(io.StringIO()):
+        mesh = cache.cached_part(load_generator(scripts[args.part]).PARTS[args.part])
+
+    print(f"3MF benchmark: {args.part} ({len(mesh.faces)} faces), best of {args.repeat}")
+    print(f"{'copies':>6} {'stl size':>10} {'3mf size':>10} {'stl write':>10} {'3mf write':>10} "
+          f"{'stl load':>9} {'3mf load':>9} {'smaller':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        stl_path, tmf_path = os.path.join(tmp, "plate.stl"), os.path.join(tmp, "plate.3mf")
+        for n in args.copies:
+            transforms = [matrix for _, matrix in nest([(mesh, n)], bed=(1e4, 1e4))[0]]
+            plate = trimesh.util.concatenate([mesh.copy().apply_transform(m) for m in transforms])
+            stl_write = best_time(lambda: plate.export(stl_path), args.repeat)
+            tmf_write = best_time(lambda: write_3mf(tmf_path, [(args.part, mesh, transforms)]),
+                                  args.repeat)
+            stl_load = best_time(lambda: trimesh.load(stl_path), args.repeat)
+            tmf_load = best_time(lambda: trimesh.load(tmf_path), args.repeat)
+            loaded = trimesh.load(tmf_path).to_geometry()
+            assert abs(loaded.volume - plate.volume) < 1e-6 * plate.volume
+            stl_size, tmf_size = os.path.getsize(stl_path), os.path.getsize(tmf_path)
+            print(f"{n:6d} {stl_size / 1024:7.1f}KiB {tmf_size / 1024:7.1f}KiB "
+                  f"{stl_write * 1000:8.1f}ms {tmf_write * 1000:8.1f}ms "
+                  f"{stl_load * 1000:7.1f}ms {tmf_load * 1000:7.1f}ms {stl_size / tmf_size:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
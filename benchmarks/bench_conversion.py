@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Conversion overhead benchmark - generate_cable_tray.py
+
+Builds the cable tray and rail frame three ways and counts the
+trimesh <-> Manifold conversions each one makes:
+
+- pairwise: the pre-CSG generators - one trimesh.boolean call per pair,
+            each converting both inputs and the result
+- trimesh:  every boolean node converts its inputs to Manifold and its
+            result back to a trimesh
+- manifold: leaves are converted once, the part is converted back once
+
+Usage:
+    python benchmarks/bench_conversion.py
+    python benchmarks/bench_conversion.py --repeat 20 --no-box-fast-path
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import trimesh
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+from stl101 import boolean, boxcsg, cache, csg
+from stl101.build import load_generator
+
+TRAY_SCRIPT = os.path.join(REPO_DIR, "UNDERDESK ORGANIZER", "generate_cable_tray.py")
+
+
+class PairwiseBackend:
+    """The old generator style: fold every node's inputs one trimesh.boolean call at a time."""
+
+    name = "pairwise"
+
+    @staticmethod
+    def evaluate(node):
+        if isinstance(node, csg.Solid):
+            return node.mesh
+        if isinstance(node, csg.Transform):
+            return PairwiseBackend.evaluate(node.child).copy().apply_transform(node.matrix)
+        if isinstance(node, csg.Symmetric):
+            # Half built once, unioned with its mirror image (csg welds or unions it the same way)
+            result = PairwiseBackend.evaluate(node.child)
+            others = [csg.Solid(result.copy().apply_transform(node.matrix))]
+            op = trimesh.boolean.union
+        elif isinstance(node, csg.Difference):
+            result, others, op = PairwiseBackend.evaluate(node.base), node.cutters, trimesh.boolean.difference
+        else:
+            result, others = PairwiseBackend.evaluate(node.children[0]), node.children[1:]
+            op = trimesh.boolean.union if isinstance(node, csg.Union) else trimesh.boolean.intersection
+        for other in others:
+            result = op([result, PairwiseBackend.evaluate(other)], engine="manifold")
+            boolean.STATS["to_manifold"] += 2
+            boolean.STATS["to_trimesh"] += 1
+        return result
+
+
+def time_backend(build, backend, repeat):
+    """Build repeat times on backend; return (best seconds, conversions, convert seconds, mesh)."""
+    csg.BACKEND = backend
+    module = sys.modules[build.__module__]
+    if backend is PairwiseBackend:
+        module.evaluate = lambda tree, label="part": PairwiseBackend.evaluate(tree)
+    else:
+        module.evaluate = csg.evaluate
+    best = float("inf")
+    for _ in range(repeat):
+        for name in ("to_manifold", "to_trimesh", "convert_time"):
+            boolean.STATS[name] = 0
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            mesh = build()
+        best = min(best, time.perf_counter() - start)
+    conversions = boolean.STATS["to_manifold"] + boolean.STATS["to_trimesh"]
+    # trimesh.boolean's conversions are inside the boolean call, so no separate time
+    convert = None if backend is PairwiseBackend else boolean.STATS["convert_time"]
+    return best, conversions, convert, mesh
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=10, help="builds per backend (best time kept)")
+    parser.add_argument("--no-box-fast-path", action="store_true",
+                        help="send box-only subtrees through the boolean engine too")
+    args = parser.parse_args()
+
+    cache.ENABLED = False  # measure real builds
+    boxcsg.ENABLED = not args.no_box_fast_path
+    with contextlib.redirect_stdout(io.StringIO()):
+        tray = load_generator(TRAY_SCRIPT)
+
+    print(f"Conversion benchmark (best of {args.repeat}, box fast path "
+          f"{'on' if boxcsg.ENABLED else 'off'})")
+    print(f"{'part':<12} {'backend':<9} {'conversions':>11} {'convert ms':>11} {'build ms':>9} {'volume':>12}")
+    for part, build in [("cable tray", tray.generate_cable_tray),
+                        ("rail frame", tray.generate_rail_frame)]:
+        results = {}
+        for backend in (PairwiseBackend, csg.TrimeshBackend, csg.ManifoldBackend):
+            results[backend.name] = time_backend(build, backend, args.repeat)
+            best, conversions, convert, mesh = results[backend.name]
+            convert = "-" if convert is None else f"{convert * 1000:.2f}"
+            print(f"{part:<12} {backend.name:<9} {conversions:11d} {convert:>11} "
+                  f"{best * 1000:9.2f} {mesh.volume:12.2f}")
+        pairwise, manifold = results["pairwise"], results["manifold"]
+        print(f"{'':<12} manifold vs pairwise: {pairwise[1] - manifold[1]} fewer conversions, "
+              f"{pairwise[0] / manifold[0]:.1f}x faster build\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Deduplication benchmark - repeated features inside one evaluate()
+
+Puts N copies of the cable tray's chamfered T-rail (a union of two boxes
+minus two wedges) side by side on a base plate and builds it with
+csg.DEDUP on and off:
+
+- off: every rail runs its own wedge difference
+- on:  the first rail is built, the other N - 1 are that result moved
+       into place (csg.shape_key matches them up to translation)
+
+Usage:
+    python benchmarks/bench_dedup.py
+    python benchmarks/bench_dedup.py --counts 2 8 32 --repeat 5
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+from stl101 import cache, csg
+from stl101.build import load_generator
+from stl101.csg import Union, evaluate
+from stl101.kernel import create_box
+
+TRAY_SCRIPT = os.path.join(REPO_DIR, "UNDERDESK ORGANIZER", "generate_cable_tray.py")
+PITCH = 15.0     # mm between rail centres
+LENGTH = 100.0   # mm rail length
+
+
+def rails_on_plate(tray, n):
+    plate = create_box((n + 1) * PITCH, LENGTH, 2.0, 0, 0, -2.0)
+    rails = [tray.create_t_profile_upright(
+        tray.RAIL_NECK_WIDTH, tray.RAIL_NECK_HEIGHT, tray.RAIL_HEAD_WIDTH,
+        tray.RAIL_CHAMFER_HEIGHT, tray.RAIL_HEAD_FLAT, LENGTH, x=(i + 1) * PITCH)
+        for i in range(n)]
+    return Union(plate, *rails)
+
+
+def time_build(tray, n, dedup, repeat):
+    """Best (seconds, mesh, subtrees reused) over repeat runs."""
+    csg.DEDUP = dedup
+    best = None
+    for _ in range(repeat):
+        tree = rails_on_plate(tray, n)
+        reused = csg.STATS["reused"]
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            mesh = evaluate(tree, "rails")
+        run = (time.perf_counter() - start, mesh, csg.STATS["reused"] - reused)
+        if best is None or run[0] < best[0]:
+            best = run
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--counts", type=int, nargs="+", default=[2, 8, 32])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cache.ENABLED = False  # measure real builds
+    with contextlib.redirect_stdout(io.StringIO()):
+        tray = load_generator(TRAY_SCRIPT)
+    print(f"Dedup benchmark: chamfered T-rails, {PITCH}mm pitch, best of {args.repeat}")
+    print(f"{'rails':>6} {'no dedup':>10} {'dedup':>9} {'reused':>7} {'speedup':>8}")
+    for n in args.counts:
+        plain_time, plain_mesh, _ = time_build(tray, n, False, args.repeat)
+        dedup_time, dedup_mesh, reused = time_build(tray, n, True, args.repeat)
+        assert abs(plain_mesh.volume - dedup_mesh.volume) < 1e-6 * plain_mesh.volume
+        assert dedup_mesh.is_watertight
+        print(f"{n:6d} {plain_time * 1000:8.1f}ms {dedup_time * 1000:7.1f}ms {reused:7d} "
+              f"{plain_time / dedup_time:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Deviation benchmark - cost and accuracy of the per-build reference check
+
+Compares a duct against cable_channel_v2_ref.obj with deviation.compare()
+at several sample counts and reports:
+
+- reference: loading and sampling the reference (once per build worker)
+- compare:   sampling the part, both one-sided distance passes, heat map
+- the symmetric mean and Hausdorff distance it finds
+- error:     its part -> reference distances minus brute force (every
+             reference triangle) on --check of the part's points
+
+Usage:
+    python benchmarks/bench_deviation.py
+    python benchmarks/bench_deviation.py --part "UNDERDESK ORGANIZER/wire_duct_final.stl" --samples 5000 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+import numpy as np
+import trimesh
+
+from stl101 import deviation, readers
+
+
+def best_time(run, repeat):
+    """Best (seconds, result) over repeat runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best[0]:
+            best = (elapsed, result)
+    return best
+
+
+def brute_force(points, triangles):
+    """Exact distance from each point to the nearest of all triangles."""
+    return np.array([np.linalg.norm(trimesh.triangles.closest_point(
+        triangles, np.repeat(p[None], len(triangles), axis=0)) - p, axis=1).min() for p in points])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--part", default=os.path.join(REPO_DIR, "UNDERDESK ORGANIZER", "wire_duct_simple.stl"))
+    parser.add_argument("--reference",
+                        default=os.path.join(REPO_DIR, "UNDERDESK ORGANIZER", "cable_channel_v2_ref.obj"))
+    parser.add_argument("--samples", type=int, nargs="+", default=[2000, 5000, 10000, 20000])
+    parser.add_argument("--check", type=int, default=500, help="points checked against brute force")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    part, reference_mesh = readers.load(args.part), readers.load(args.reference)
+    offset = part.bounds.mean(axis=0) - reference_mesh.bounds.mean(axis=0)
+    print(f"Deviation benchmark: {os.path.basename(args.part)} ({len(part.faces)} faces) vs "
+          f"{os.path.basename(args.reference)} ({len(reference_mesh.faces)} faces), "
+          f"tree {deviation.TREE_SAMPLES} points, best of {args.repeat}")
+    print(f"{'samples':>7} {'reference':>10} {'compare':>9} {'mean':>7} {'Hausdorff':>9} "
+          f"{'mean err':>9} {'max err':>8}")
+    for n in args.samples:
+        ref_time, reference = best_time(lambda: deviation.surface(reference_mesh, n), args.repeat)
+        compare_time, result = best_time(lambda: deviation.compare(part, reference, n), args.repeat)
+        # Brute force on an even subset of the compared part points
+        low, high = result["extent"]
+        length = result["axes"][0]
+        points = deviation.surface(part, n)["points"]
+        points = points[(points[:, length] >= low) & (points[:, length] <= high)]
+        points = points[:: max(1, len(points) // args.check)] - offset
+        error = deviation.distances(points, reference) - brute_force(points, reference["triangles"])
+        s = result["symmetric"]
+        print(f"{n:7d} {ref_time * 1000:8.1f}ms {compare_time * 1000:7.1f}ms {s['mean']:7.3f} "
+              f"{s['max']:9.3f} {error.mean():9.4f} {error.max():8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Nesting benchmark - footprints and bed packing for batch plates
+
+Builds every part in the repo once, then nests a batch of N copies,
+spread evenly over the parts, onto 256 x 256 mm beds and times the two
+stages separately:
+
+- footprint: convex hull of each part's projected vertices and its
+             minimum-area rectangle (once per distinct part)
+- pack:      skyline packing of every copy, opening beds as needed
+
+Fill is the copies' hull area over the beds' total area.
+
+Usage:
+    python benchmarks/bench_nesting.py
+    python benchmarks/bench_nesting.py --counts 100 500 --no-rotate --repeat 5
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+from shapely.geometry import MultiPoint
+
+from stl101 import cache, nesting
+from stl101.build import discover_parts, load_generator
+
+
+def best_time(run, repeat):
+    """Best (seconds, result) over repeat runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best[0]:
+            best = (elapsed, result)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--counts", type=int, nargs="+", default=[20, 100, 500])
+    parser.add_argument("--bed", type=float, nargs=2, default=nesting.BED_SIZE)
+    parser.add_argument("--no-rotate", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    rotate = not args.no_rotate
+
+    meshes = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for path, name in discover_parts():
+            meshes.append(cache.cached_part(load_generator(path).PARTS[name]))
+    hull_areas = [MultiPoint(mesh.vertices[:, :2]).convex_hull.area for mesh in meshes]
+
+    print(f"Nesting benchmark: {len(meshes)} parts, {args.bed[0]:g} x {args.bed[1]:g} mm beds, "
+          f"rotation {'on' if rotate else 'off'}, best of {args.repeat}")
+    print(f"{'copies':>6} {'footprint':>10} {'pack':>9} {'total':>9} {'beds':>5} {'fill':>6}")
+    footprint_time, _ = best_time(lambda: [nesting.footprint(m, rotate) for m in meshes],
+                                  args.repeat)
+    for n in args.counts:
+        counts = [n // len(meshes) + (i < n % len(meshes)) for i in range(len(meshes))]
+        parts = list(zip(meshes, counts))
+        total_time, plates = best_time(lambda: nesting.nest(parts, args.bed, rotate=rotate),
+                                       args.repeat)
+        assert sum(len(plate) for plate in plates) == n
+        fill = sum(a * c for a, c in zip(hull_areas, counts)) / (len(plates) * args.bed[0] * args.bed[1])
+        print(f"{n:6d} {footprint_time * 1000:8.1f}ms {(total_time - footprint_time) * 1000:7.1f}ms "
+              f"{total_time * 1000:7.1f}ms {len(plates):5d} {fill:6.0%}")
+
+
+if __name__ == "__main__":
+    main()
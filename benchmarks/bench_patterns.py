@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Pattern benchmark - per-instance primitives vs one patterned mesh
+
+Cuts an N x N grid of 3 mm holes into a plate two ways:
+
+- loop:    one create_cylinder() per hole, each a separate cutter
+- pattern: kernel.grid_pattern(), all holes as one mesh / one cutter
+
+and times building the cutters and the boolean separately, so the
+per-instance overhead (Python calls, one Manifold conversion per leaf) is
+visible apart from the geometry work every hole needs anyway.
+
+Usage:
+    python benchmarks/bench_patterns.py
+    python benchmarks/bench_patterns.py --sizes 3 10 32 --repeat 5
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+from stl101 import cache
+from stl101.csg import Difference, evaluate
+from stl101.kernel import create_box, create_cylinder, grid_pattern
+
+PITCH = 5.0        # mm between hole centres
+HOLE_RADIUS = 1.5  # mm
+THICKNESS = 2.0    # mm
+
+
+def loop_holes(n):
+    return [create_cylinder(HOLE_RADIUS, THICKNESS + 2, (i + 1) * PITCH, (j + 1) * PITCH, -1)
+            for i in range(n) for j in range(n)]
+
+
+def pattern_holes(n):
+    seed = create_cylinder(HOLE_RADIUS, THICKNESS + 2, PITCH, PITCH, -1)
+    return [grid_pattern(seed, (n, n), (PITCH, PITCH))]
+
+
+def time_build(make_holes, n, repeat):
+    """Best (cutter build seconds, boolean seconds, mesh) over repeat runs."""
+    best = None
+    for _ in range(repeat):
+        plate = create_box((n + 1) * PITCH, (n + 1) * PITCH, THICKNESS)
+        start = time.perf_counter()
+        holes = make_holes(n)
+        built = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            mesh = evaluate(Difference(plate, *holes), "plate")
+        run = (built - start, time.perf_counter() - built, mesh)
+        if best is None or run[0] + run[1] < best[0] + best[1]:
+            best = run
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3, 10, 32])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cache.ENABLED = False  # measure real builds
+    print(f"Pattern benchmark: {HOLE_RADIUS * 2}mm holes, {PITCH}mm pitch, best of {args.repeat}")
+    print(f"{'holes':>6} {'loop build':>11} {'boolean':>9} {'pattern build':>14} {'boolean':>9} "
+          f"{'speedup':>8} {'faces':>8}")
+    for n in args.sizes:
+        loop_build, loop_bool, loop_mesh = time_build(loop_holes, n, args.repeat)
+        pat_build, pat_bool, pat_mesh = time_build(pattern_holes, n, args.repeat)
+        assert abs(loop_mesh.volume - pat_mesh.volume) < 1e-6 * loop_mesh.volume
+        speedup = (loop_build + loop_bool) / (pat_build + pat_bool)
+        print(f"{n * n:6d} {loop_build * 1000:9.2f}ms {loop_bool * 1000:7.1f}ms "
+              f"{pat_build * 1000:12.2f}ms {pat_bool * 1000:7.1f}ms {speedup:7.1f}x "
+              f"{len(pat_mesh.faces):8d}")
+
+
+if __name__ == "__main__":
+    main()
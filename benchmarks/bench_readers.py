@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Reader benchmark - stl101.readers vs trimesh.load on the reference models
+
+Loads each reference mesh in the repo both ways and reports the best time
+and the peak memory allocated while loading (tracemalloc, which numpy
+reports its arrays to), and checks both give the same triangles and
+volume.
+
+Usage:
+    python benchmarks/bench_readers.py
+    python benchmarks/bench_readers.py "cable channel v2.3mf" --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+import trimesh
+
+from stl101 import readers
+
+REFERENCE_FILES = [
+    "UNDERDESK ORGANIZER/cable channel 150x50x30mm(2).3mf",
+    "cable channel v2.3mf",
+    "UNDERDESK ORGANIZER/underdesk_cables_holder_ikea.3mf",
+    "rain101/rain101_wall_mount.3mf",
+    "UNDERDESK ORGANIZER/cable_channel_v2_ref.obj",
+    "UNDERDESK ORGANIZER/new resized.stl",
+    "UNDERDESK ORGANIZER/new resized - 2 holes.stl",
+]
+
+
+def measure(load, path, repeat):
+    """(best seconds, peak bytes, mesh)."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        mesh = load(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    load(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, mesh
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("files", nargs="*", default=REFERENCE_FILES)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Reader benchmark: best of {args.repeat}, peak memory while loading")
+    print(f"{'file':<44} {'triangles':>9} {'trimesh':>9} {'readers':>9} {'speedup':>8} "
+          f"{'trimesh mem':>12} {'readers mem':>12}")
+    for name in args.files:
+        path = os.path.join(REPO_DIR, name)
+        ref_time, ref_peak, ref = measure(lambda p: trimesh.load(p, force="mesh"), path, args.repeat)
+        our_time, our_peak, ours = measure(readers.load, path, args.repeat)
+        assert len(ours.faces) == len(ref.faces)
+        assert abs(ours.volume - ref.volume) < 1e-6 * abs(ref.volume)
+        label = name if len(name) <= 44 else "..." + name[-41:]
+        print(f"{label:<44} {len(ours.faces):9d} {ref_time * 1000:7.1f}ms {our_time * 1000:7.1f}ms "
+              f"{ref_time / our_time:7.1f}x {ref_peak / 2**20:9.1f}MiB {our_peak / 2**20:9.1f}MiB")
+
+
+if __name__ == "__main__":
+    main()
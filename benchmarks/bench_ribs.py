@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Rib texturing benchmark - generate_wire_duct_final.py
+
+Builds the ribbed duct at increasing DUCT_LENGTH with 4mm RIB_SPACING and
+checks that build time grows linearly with rib count. For comparison the
+old approach (union each rib into the growing body one boolean at a time)
+is timed up to --legacy-max mm.
+
+Usage:
+    python benchmarks/bench_ribs.py
+    python benchmarks/bench_ribs.py --lengths 250 500 1000 2000 --legacy-max 1000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+import trimesh
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+from stl101 import cache
+from stl101.build import load_generator
+
+DUCT_SCRIPT = os.path.join(REPO_DIR, "UNDERDESK ORGANIZER", "generate_wire_duct_final.py")
+
+
+def legacy_ribs(duct, body):
+    """The pre-batching add_ribs: one union per rib into the growing body."""
+    for i in range(1, int(duct.DUCT_LENGTH / duct.RIB_SPACING)):
+        y_pos = i * duct.RIB_SPACING
+        for x in [-duct.OPENING_WIDTH/2 - duct.RIB_DEPTH, duct.OPENING_WIDTH/2]:
+            rib = duct.create_box(duct.RIB_DEPTH, duct.RIB_WIDTH, duct.OPENING_HEIGHT,
+                                  x, y_pos - duct.RIB_WIDTH/2, 0)
+            body = trimesh.boolean.union([body, rib], engine='manifold')
+    return body
+
+
+def time_build(build):
+    """Run build() quietly; return (seconds, peak traced MB, mesh)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        mesh = build()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return elapsed, peak, mesh
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--lengths", type=float, nargs="+", default=[250, 500, 1000, 2000])
+    parser.add_argument("--spacing", type=float, default=4.0)
+    parser.add_argument("--legacy-max", type=float, default=500,
+                        help="only time the per-rib union loop up to this length")
+    args = parser.parse_args()
+
+    cache.ENABLED = False  # measure real builds
+    with contextlib.redirect_stdout(io.StringIO()):
+        duct = load_generator(DUCT_SCRIPT)
+    duct.RIB_SPACING = args.spacing
+
+    print(f"Rib benchmark: RIB_SPACING={args.spacing}mm")
+    print(f"{'length':>8} {'ribs':>6} {'faces':>8} {'batched':>10} {'ms/rib':>8} {'peak MB':>8} {'per-rib loop':>13}")
+    per_rib = []
+    for length in args.lengths:
+        duct.DUCT_LENGTH = length
+        ribs = 2 * (int(length / args.spacing) - 1)
+        elapsed, peak, mesh = time_build(duct.generate_wire_duct)
+        per_rib.append(elapsed / ribs)
+
+        legacy = ""
+        if length <= args.legacy_max:
+            body = duct.extrude_profile(duct.create_channel_profile(), length)
+            legacy_time = time_build(lambda: legacy_ribs(duct, body))[0]
+            legacy = f"{legacy_time:12.2f}s"
+        print(f"{length:8.0f} {ribs:6d} {len(mesh.faces):8d} {elapsed:9.3f}s "
+              f"{per_rib[-1] * 1000:8.3f} {peak:8.1f} {legacy:>13}")
+
+    # Linear scaling means time per rib stays flat as the duct grows
+    growth = per_rib[-1] / per_rib[0]
+    print(f"\nTime per rib, longest vs shortest duct: {growth:.2f}x "
+          f"({'linear' if growth < 2 else 'SUPERLINEAR'})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Sections benchmark - many-plane slicing vs trimesh, per part
+
+Cuts each part at N evenly spread planes along an axis three ways:
+
+- section:    trimesh mesh.section(), one call per plane (how
+              reference_cross_section.svg was made)
+- multiplane: trimesh.intersections.mesh_multiplane(), all planes in one
+              call but unchained segments
+- sections:   sections.slice_mesh(), all planes in one pass, chained into
+              loops
+
+and checks the loops' total perimeter against the multiplane segments.
+
+Usage:
+    python benchmarks/bench_sections.py
+    python benchmarks/bench_sections.py --planes 10 100 1000 --axis y --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+import numpy as np
+import trimesh
+
+from stl101 import readers, sections
+
+PART_FILES = [
+    "rain101/rain101_wall_mount.stl",
+    "UNDERDESK ORGANIZER/wire_duct_final.stl",
+    "UNDERDESK ORGANIZER/cable_channel_v2_ref.obj",
+]
+
+
+def best_time(run, repeat):
+    """Best (seconds, result) over repeat runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best[0]:
+            best = (elapsed, result)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("files", nargs="*", default=PART_FILES)
+    parser.add_argument("--planes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--axis", choices=sorted(sections.FRAMES), default="z")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    normal = sections.frame(args.axis)[0]
+    axis = "xyz".index(args.axis)
+
+    print(f"Sections benchmark: planes along {args.axis}, best of {args.repeat}")
+    print(f"{'part':<28} {'faces':>6} {'planes':>6} {'section':>10} {'multiplane':>11} "
+          f"{'sections':>9} {'loops':>6} {'perimeter err':>14}")
+    for path in args.files:
+        mesh = readers.load(os.path.join(REPO_DIR, path))
+        low, high = mesh.bounds[:, axis]
+        for n in args.planes:
+            offsets = low + (np.arange(n) + 0.5) * (high - low) / n
+            if n <= 100:
+                section_time, _ = best_time(lambda: [mesh.section(plane_origin=normal * o,
+                                                                  plane_normal=normal)
+                                                     for o in offsets], 1)
+                section_cell = f"{section_time * 1000:8.1f}ms"
+            else:
+                section_cell = f"{'-':>10}"
+            multi_time, (lines, _, _) = best_time(
+                lambda: trimesh.intersections.mesh_multiplane(mesh, np.zeros(3), normal, offsets),
+                args.repeat)
+            ours_time, section = best_time(lambda: sections.slice_mesh(mesh, offsets, args.axis),
+                                           args.repeat)
+            segments = sum(np.linalg.norm(l[:, 1] - l[:, 0], axis=1).sum() for l in lines if len(l))
+            error = abs(segments - sections.plane_measures(section)["perimeter"].sum())
+            print(f"{os.path.basename(path):<28} {len(mesh.faces):6d} {n:6d} {section_cell} "
+                  f"{multi_time * 1000:9.1f}ms {ours_time * 1000:7.1f}ms "
+                  f"{len(section['starts']) - 1:6d} {error:14.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,19 @@ Rain the101 Router Wall Mount - Sandwich Design
 Generates STL file for 3D printing
 """
 
+import os
+import sys
+
 import trimesh
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from stl101 import cache, engines, kernel
+from stl101.csg import Difference, Union, evaluate
+from stl101.features import FeatureGraph
+from stl101.holes import hole_pattern
+from stl101.kernel import create_box, create_cylinder, linear_pattern, pattern
+
 # ============================================
 # Parameters - adjust as needed
 # ============================================
@@ -44,50 +54,43 @@ COUNTERSINK_DIAMETER = 10.0  # mm (for #8 screw HEAD to sit flush)
 SCREW_PILLAR_DIAMETER = 14.0 # mm (solid pillar around screw hole - larger for 10mm countersink)
 
 # ============================================
-# Generate the bracket
+# Features
 # ============================================
+# Each feature reads only the parameters it needs, so a rebuild after
+# changing e.g. SCREW_HOLE_DIAMETER reuses the merged bracket and only
+# recuts the holes (see stl101/features.py).
 
-def create_box(width, height, depth, x=0, y=0, z=0):
-    """Create a box mesh at the specified position."""
-    box = trimesh.creation.box(extents=[width, height, depth])
-    box.apply_translation([x + width/2, y + height/2, z + depth/2])
-    return box
+graph = FeatureGraph(globals())
 
-def create_cylinder(radius, height, x=0, y=0, z=0, segments=32):
-    """Create a cylinder mesh at the specified position."""
-    cyl = trimesh.creation.cylinder(radius=radius, height=height, sections=segments)
-    cyl.apply_translation([x, y, z + height/2])
-    return cyl
 
-def generate_wall_mount():
-    """Generate the complete wall mount bracket."""
+def total_thickness():
+    return BACK_PLATE_THICKNESS + SPACER_GAP + FRONT_PLATE_THICKNESS
 
-    total_thickness = BACK_PLATE_THICKNESS + SPACER_GAP + FRONT_PLATE_THICKNESS
 
-    back_plate_w = BRACKET_WIDTH - INSET_LEFT - INSET_RIGHT
-    back_plate_h = BRACKET_HEIGHT - INSET_TOP - INSET_BOTTOM
+def back_plate_size():
+    """(width, height) of the back plate - matches the spacer footprint."""
+    return (BRACKET_WIDTH - INSET_LEFT - INSET_RIGHT,
+            BRACKET_HEIGHT - INSET_TOP - INSET_BOTTOM)
 
-    print("=== Rain the101 Wall Mount - Sandwich Design ===")
-    print(f"Front plate (router side): {BRACKET_WIDTH}mm x {BRACKET_HEIGHT}mm x {FRONT_PLATE_THICKNESS}mm")
-    print(f"Back plate (wall side): {back_plate_w}mm x {back_plate_h}mm x {BACK_PLATE_THICKNESS}mm")
-    print(f"Spacer gap: {SPACER_GAP}mm")
-    print(f"Total thickness: {total_thickness}mm")
-    print(f"Edge insets: L={INSET_LEFT}mm, R={INSET_RIGHT}mm, T={INSET_TOP}mm, B={INSET_BOTTOM}mm")
-    print(f"Screw hole: {SCREW_HOLE_DIAMETER}mm diameter")
-    print(f"Countersink: {COUNTERSINK_DIAMETER}mm diameter, {total_thickness/2}mm deep (straight cylinder, half thickness)")
-    print(f"Screw pattern: {SCREW_SPACING_H}mm x {SCREW_SPACING_V}mm (4 holes)")
-    print(f"Screw pillars: {SCREW_PILLAR_DIAMETER}mm diameter")
-    print(f"Screws: Insert from front (router side), through bracket, into wall")
-    print(f"Recommended screw length: {total_thickness + 25}mm+ (to reach into wall)")
-    print()
 
-    # Create the solid parts
-    parts = []
+def screw_positions():
+    """Screw centers (4 corners in rectangle pattern), centered on the back plate."""
+    back_plate_width, back_plate_height = back_plate_size()
+    cx = INSET_LEFT + back_plate_width / 2
+    cy = INSET_BOTTOM + back_plate_height / 2
+    return [
+        (cx - SCREW_SPACING_H/2, cy - SCREW_SPACING_V/2),  # Bottom left
+        (cx + SCREW_SPACING_H/2, cy - SCREW_SPACING_V/2),  # Bottom right
+        (cx - SCREW_SPACING_H/2, cy + SCREW_SPACING_V/2),  # Top left
+        (cx + SCREW_SPACING_H/2, cy + SCREW_SPACING_V/2),  # Top right
+    ]
+
 
-    # 1. Back plate (against wall) - smaller, matches spacer footprint
-    back_plate_width = BRACKET_WIDTH - INSET_LEFT - INSET_RIGHT
-    back_plate_height = BRACKET_HEIGHT - INSET_TOP - INSET_BOTTOM
-    back_plate = create_box(
+@graph.feature
+def back_plate():
+    """1. Back plate (against wall) - smaller, matches spacer footprint."""
+    back_plate_width, back_plate_height = back_plate_size()
+    return create_box(
         back_plate_width,
         back_plate_height,
         BACK_PLATE_THICKNESS,
@@ -95,12 +98,13 @@ def generate_wall_mount():
         INSET_BOTTOM,    # y position (inset from bottom)
         0
     )
-    parts.append(back_plate)
 
-    # 2. Spacer - frame walls + rib grid
+
+@graph.feature
+def spacer_frame():
+    """2. Spacer frame walls around perimeter (holds sandwich together)."""
     spacer_z = BACK_PLATE_THICKNESS
 
-    # Frame walls around perimeter (holds sandwich together)
     # Bottom wall
     bottom_spacer = create_box(
         BRACKET_WIDTH - INSET_LEFT - INSET_RIGHT,
@@ -110,7 +114,6 @@ def generate_wall_mount():
         INSET_BOTTOM,
         spacer_z
     )
-    parts.append(bottom_spacer)
 
     # Top wall
     top_spacer = create_box(
@@ -121,7 +124,6 @@ def generate_wall_mount():
         BRACKET_HEIGHT - SPACER_WALL - INSET_TOP,
         spacer_z
     )
-    parts.append(top_spacer)
 
     # Left wall
     left_spacer = create_box(
@@ -132,7 +134,6 @@ def generate_wall_mount():
         INSET_BOTTOM + SPACER_WALL,
         spacer_z
     )
-    parts.append(left_spacer)
 
     # Right wall
     right_spacer = create_box(
@@ -143,7 +144,14 @@ def generate_wall_mount():
         INSET_BOTTOM + SPACER_WALL,
         spacer_z
     )
-    parts.append(right_spacer)
+
+    return [bottom_spacer, top_spacer, left_spacer, right_spacer]
+
+
+@graph.feature
+def ribs():
+    """2b. Rib grid inside the spacer frame (prevents front plate sagging)."""
+    spacer_z = BACK_PLATE_THICKNESS
 
     # Calculate rib grid based on RIB_DIVISIONS
     interior_width = BRACKET_WIDTH - INSET_LEFT - INSET_RIGHT - 2*SPACER_WALL
@@ -161,130 +169,101 @@ def generate_wall_mount():
     print(f"Rib grid: {num_vertical_ribs} vertical x {num_horizontal_ribs} horizontal ribs ({RIB_DIVISIONS}x{RIB_DIVISIONS} = {RIB_DIVISIONS**2} cells)")
     print(f"Cell size: ~{actual_h_span:.1f}mm x ~{actual_v_span:.1f}mm, rib thickness: {THIN_RIB}mm")
 
-    # Create vertical ribs (evenly spaced, slightly inset to avoid overlap)
+    if num_vertical_ribs < 1:
+        return []
+
+    # Each direction is one patterned mesh: its ribs never touch each other
     rib_margin = 0.1  # small margin to keep ribs cleanly inside frame
-    for i in range(num_vertical_ribs):
-        rib_x = interior_x_start + (i + 1) * actual_h_span - THIN_RIB / 2
-        rib = create_box(
-            THIN_RIB,
-            interior_height - 2 * rib_margin,
-            SPACER_GAP,
-            rib_x,
-            interior_y_start + rib_margin,
-            spacer_z
-        )
-        parts.append(rib)
-
-    # Create horizontal ribs (evenly spaced, slightly inset to avoid overlap)
-    for i in range(num_horizontal_ribs):
-        rib_y = interior_y_start + (i + 1) * actual_v_span - THIN_RIB / 2
-        rib = create_box(
-            interior_width - 2 * rib_margin,
-            THIN_RIB,
-            SPACER_GAP,
-            interior_x_start + rib_margin,
-            rib_y,
-            spacer_z
-        )
-        parts.append(rib)
-
-    # 3. Front plate (slides under clips)
+    vertical_rib = create_box(
+        THIN_RIB,
+        interior_height - 2 * rib_margin,
+        SPACER_GAP,
+        interior_x_start + actual_h_span - THIN_RIB / 2,
+        interior_y_start + rib_margin,
+        spacer_z
+    )
+    horizontal_rib = create_box(
+        interior_width - 2 * rib_margin,
+        THIN_RIB,
+        SPACER_GAP,
+        interior_x_start + rib_margin,
+        interior_y_start + actual_v_span - THIN_RIB / 2,
+        spacer_z
+    )
+    return [
+        linear_pattern(vertical_rib, num_vertical_ribs, (actual_h_span, 0, 0)),
+        linear_pattern(horizontal_rib, num_horizontal_ribs, (0, actual_v_span, 0)),
+    ]
+
+
+@graph.feature
+def front_plate():
+    """3. Front plate (slides under clips)."""
     front_z = BACK_PLATE_THICKNESS + SPACER_GAP
-    front_plate = create_box(BRACKET_WIDTH, BRACKET_HEIGHT, FRONT_PLATE_THICKNESS, 0, 0, front_z)
-    parts.append(front_plate)
+    return create_box(BRACKET_WIDTH, BRACKET_HEIGHT, FRONT_PLATE_THICKNESS, 0, 0, front_z)
 
-    # 4. Screw pillars (solid cylinders connecting front and back plates)
-    # These provide solid material for screws to pass through
-    cx = INSET_LEFT + back_plate_width / 2
-    cy = INSET_BOTTOM + back_plate_height / 2
-    pillar_positions = [
-        (cx - SCREW_SPACING_H/2, cy - SCREW_SPACING_V/2),
-        (cx + SCREW_SPACING_H/2, cy - SCREW_SPACING_V/2),
-        (cx - SCREW_SPACING_H/2, cy + SCREW_SPACING_V/2),
-        (cx + SCREW_SPACING_H/2, cy + SCREW_SPACING_V/2),
-    ]
 
-    for px, py in pillar_positions:
-        pillar = create_cylinder(
-            SCREW_PILLAR_DIAMETER / 2,
-            SPACER_GAP,
-            px, py,
-            BACK_PLATE_THICKNESS
-        )
-        parts.append(pillar)
-
-    # Combine all solid parts using boolean union for manifold mesh
-    print("Merging parts (boolean union)...")
-    bracket = parts[0]
-    for part in parts[1:]:
-        try:
-            bracket = trimesh.boolean.union([bracket, part], engine='manifold')
-        except Exception as e:
-            print(f"Warning: Union failed, using concatenate: {e}")
-            bracket = trimesh.util.concatenate([bracket, part])
-
-    # Create screw holes with countersinks
-    # Screws go from FRONT (router side) through entire bracket to wall
-    holes = []
-
-    # Hole positions (4 corners in rectangle pattern) - centered on back plate
-    hole_cx = INSET_LEFT + back_plate_width / 2
-    hole_cy = INSET_BOTTOM + back_plate_height / 2
-    hole_positions = [
-        (hole_cx - SCREW_SPACING_H/2, hole_cy - SCREW_SPACING_V/2),  # Bottom left
-        (hole_cx + SCREW_SPACING_H/2, hole_cy - SCREW_SPACING_V/2),  # Bottom right
-        (hole_cx - SCREW_SPACING_H/2, hole_cy + SCREW_SPACING_V/2),  # Top left
-        (hole_cx + SCREW_SPACING_H/2, hole_cy + SCREW_SPACING_V/2),  # Top right
-    ]
+@graph.feature
+def pillars():
+    """4. Screw pillars (solid material for screws to pass through)."""
+    pillar = create_cylinder(SCREW_PILLAR_DIAMETER / 2, SPACER_GAP, 0, 0, BACK_PLATE_THICKNESS)
+    return pattern(pillar, [(px, py, 0) for px, py in screw_positions()])
+
+
+@graph.feature(store=True)
+def bracket(back_plate, spacer_frame, ribs, front_plate, pillars):
+    """All solid parts merged (one union)."""
+    return evaluate(Union(back_plate, *spacer_frame, *ribs, front_plate, pillars), "bracket")
+
+
+@graph.feature
+def holes():
+    """Screw holes with countersinks, from the FRONT (router side) through to the wall."""
+    thickness = total_thickness()
+
+    # Countersink: straight (a counterbore), depth = half of total thickness
+    countersink_depth = thickness / 2
+
+    # Shaft through the entire bracket, head at the top (screw head sits
+    # there) - every hole in one patterned mesh
+    return hole_pattern(screw_positions(), SCREW_HOLE_DIAMETER, thickness + 0.4, -0.2,
+                        kind="counterbore", head_diameter=COUNTERSINK_DIAMETER,
+                        head_depth=countersink_depth + 0.2)
+
+
+@graph.feature(store=True)
+def wall_mount(bracket, holes):
+    """Bracket with every screw hole cut (one difference)."""
+    print("Creating screw holes (boolean operations)...")
+    return evaluate(Difference(bracket, holes), "wall mount")
+
+
+# ============================================
+# Generate the bracket
+# ============================================
 
-    # Countersink: straight cylinder, depth = half of total thickness
-    countersink_depth = total_thickness / 2
-
-    for hx, hy in hole_positions:
-        # Screw shaft hole through entire bracket
-        shaft_hole = create_cylinder(
-            SCREW_HOLE_DIAMETER/2,
-            total_thickness + 0.4,
-            hx, hy,
-            -0.2
-        )
-
-        # Straight countersink cylinder at top (screw head sits here)
-        countersink = create_cylinder(
-            COUNTERSINK_DIAMETER/2,
-            countersink_depth + 0.1,
-            hx, hy,
-            total_thickness - countersink_depth
-        )
-
-        # Union shaft hole and countersink
-        try:
-            combined_hole = trimesh.boolean.union([shaft_hole, countersink], engine='manifold')
-            holes.append(combined_hole)
-        except Exception:
-            holes.append(shaft_hole)
-            holes.append(countersink)
-
-    # Combine all holes into one shape
-    print("Combining hole shapes...")
-    all_holes = holes[0]
-    for h in holes[1:]:
-        try:
-            all_holes = trimesh.boolean.union([all_holes, h], engine='manifold')
-        except Exception:
-            all_holes = trimesh.util.concatenate([all_holes, h])
-
-    # Boolean difference to create holes
-    print("Creating screw holes (boolean operation)...")
-    try:
-        result = trimesh.boolean.difference([bracket, all_holes], engine='blender')
-    except Exception:
-        try:
-            result = trimesh.boolean.difference([bracket, all_holes], engine='manifold')
-        except Exception:
-            print("Warning: Boolean operations not available, creating bracket without screw holes.")
-            print("You can add screw holes in Bambu Studio or drill them manually.")
-            result = bracket
+def generate_wall_mount():
+    """Generate the complete wall mount bracket."""
+
+    thickness = total_thickness()
+    back_plate_w, back_plate_h = back_plate_size()
+
+    print("=== Rain the101 Wall Mount - Sandwich Design ===")
+    print(f"Front plate (router side): {BRACKET_WIDTH}mm x {BRACKET_HEIGHT}mm x {FRONT_PLATE_THICKNESS}mm")
+    print(f"Back plate (wall side): {back_plate_w}mm x {back_plate_h}mm x {BACK_PLATE_THICKNESS}mm")
+    print(f"Spacer gap: {SPACER_GAP}mm")
+    print(f"Total thickness: {thickness}mm")
+    print(f"Edge insets: L={INSET_LEFT}mm, R={INSET_RIGHT}mm, T={INSET_TOP}mm, B={INSET_BOTTOM}mm")
+    print(f"Screw hole: {SCREW_HOLE_DIAMETER}mm diameter")
+    print(f"Countersink: {COUNTERSINK_DIAMETER}mm diameter, {thickness/2}mm deep (straight cylinder, half thickness)")
+    print(f"Screw pattern: {SCREW_SPACING_H}mm x {SCREW_SPACING_V}mm (4 holes)")
+    print(f"Screw pillars: {SCREW_PILLAR_DIAMETER}mm diameter")
+    print(f"Screws: Insert from front (router side), through bracket, into wall")
+    print(f"Recommended screw length: {thickness + 25}mm+ (to reach into wall)")
+    print()
+
+    result = graph.build("wall_mount")
+    graph.print_graph("wall_mount")
 
     # Check if mesh is valid and try to repair if needed
     if not result.is_watertight:
@@ -293,9 +272,14 @@ def generate_wall_mount():
 
     return result
 
+# Parts built by this script (used by python -m stl101.build)
+PARTS = {
+    "rain101_wall_mount.stl": generate_wall_mount,
+}
+
 def main():
     # Generate the mount
-    mount = generate_wall_mount()
+    mount = cache.cached_part(generate_wall_mount)
 
     # Final validation
     print(f"Mesh is watertight: {mount.is_watertight}")
@@ -308,5 +292,9 @@ def main():
     print()
     print("Open this file in Bambu Studio to slice and print!")
 
+    cache.print_stats()
+    engines.print_report()
+    kernel.print_report()
+
 if __name__ == "__main__":
     main()
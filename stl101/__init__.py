@@ -0,0 +1,4 @@
+"""
+STL101 shared geometry helpers
+Imported by the generator scripts in rain101/ and UNDERDESK ORGANIZER/
+"""
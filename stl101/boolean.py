@@ -0,0 +1,201 @@
+"""
+Batched boolean operations
+
+The generators used to fold parts into a growing mesh one union at a time:
+
+    result = parts[0]
+    for part in parts[1:]:
+        result = trimesh.boolean.union([result, part], engine='manifold')
+
+Every step converts the (growing) result trimesh -> Manifold -> trimesh, so
+cost grows roughly quadratically with the number of parts. union_all()
+converts each part once, unions them in a balanced reduction tree (pairs,
+then pairs of pairs, ...) and converts back once at the end.
+
+The *_manifolds() variants take and return Manifold objects and convert
+nothing; csg.evaluate() uses them to keep a whole build in Manifold form.
+The trimesh variants go through the engine registry (engines.py), where
+this module registers manifold as the "manifold" engine.
+"""
+
+import time
+
+import numpy as np
+import trimesh
+from manifold3d import Error, Manifold, Mesh
+
+from . import engines
+
+# Print one timing line per batched union
+VERBOSE = True
+
+# Conversion counters for this process (see benchmarks/bench_conversion.py)
+STATS = {"to_manifold": 0, "to_trimesh": 0, "convert_time": 0.0}
+
+
+def to_manifold(mesh):
+    """Convert a trimesh to a Manifold (same float32 layout trimesh uses)."""
+    start = time.perf_counter()
+    manifold = Manifold(
+        mesh=Mesh(
+            vert_properties=np.array(mesh.vertices, dtype=np.float32),
+            tri_verts=np.array(mesh.faces, dtype=np.uint32),
+        )
+    )
+    if manifold.status() != Error.NoError:
+        raise ValueError(f"Mesh is not a manifold volume ({manifold.status().name})")
+    STATS["to_manifold"] += 1
+    STATS["convert_time"] += time.perf_counter() - start
+    return manifold
+
+
+def to_trimesh(manifold):
+    """Convert a Manifold back to a trimesh."""
+    start = time.perf_counter()
+    mesh = manifold.to_mesh()
+    result = trimesh.Trimesh(vertices=mesh.vert_properties, faces=mesh.tri_verts, process=False)
+    STATS["to_trimesh"] += 1
+    STATS["convert_time"] += time.perf_counter() - start
+    return result
+
+
+def reduce_tree(items, op):
+    """
+    Combine items pairwise in a balanced tree.
+
+    Returns (result, level_times) where level_times lists the seconds spent
+    on each level of the tree.
+    """
+    level_times = []
+    while len(items) > 1:
+        start = time.perf_counter()
+        paired = [op(items[i], items[i + 1]) for i in range(0, len(items) - 1, 2)]
+        if len(items) % 2:
+            paired.append(items[-1])
+        items = paired
+        level_times.append(time.perf_counter() - start)
+    return items[0], level_times
+
+
+def _evaluated_union(a, b):
+    """Union two Manifolds now (Manifold is lazy, so force it for honest timing)."""
+    result = a + b
+    result.num_tri()
+    return result
+
+
+def union_manifolds(manifolds, label="parts"):
+    """Union Manifolds in a balanced tree (no conversions)."""
+    manifolds = list(manifolds)
+    if not manifolds:
+        raise ValueError("union_manifolds needs at least one Manifold")
+    start = time.perf_counter()
+    merged, level_times = reduce_tree(manifolds, _evaluated_union)
+    if level_times:
+        engines.record("union", label, "manifold", time.perf_counter() - start)
+    if VERBOSE and level_times:
+        levels = ", ".join(f"{t * 1000:.1f}" for t in level_times)
+        total = (time.perf_counter() - start) * 1000
+        print(f"  Merged {len(manifolds)} {label} in {len(level_times)} levels "
+              f"({levels} ms) - {total:.1f} ms total")
+    return merged
+
+
+def difference_manifolds(base, cutters, label="cutters"):
+    """Subtract the union of cutters from base (no conversions)."""
+    cutters = list(cutters)
+    if not cutters:
+        return base
+    start = time.perf_counter()
+    tool, _ = reduce_tree(cutters, _evaluated_union)
+    result = base - tool
+    result.num_tri()
+    engines.record("difference", label, "manifold", time.perf_counter() - start)
+    if VERBOSE:
+        total = (time.perf_counter() - start) * 1000
+        print(f"  Subtracted {len(cutters)} {label} - {total:.1f} ms")
+    return result
+
+
+def intersect_manifolds(manifolds, label="parts"):
+    """Intersect Manifolds in a balanced tree (no conversions)."""
+    start = time.perf_counter()
+    merged, level_times = reduce_tree(list(manifolds), lambda a, b: a ^ b)
+    if level_times:
+        merged.num_tri()
+        engines.record("intersection", label, "manifold", time.perf_counter() - start)
+    return merged
+
+
+def _manifold_engine(operation):
+    """Registry entry: one conversion per input mesh and one back."""
+    ops = {"union": _evaluated_union, "intersection": lambda a, b: a ^ b}
+
+    def run(meshes):
+        manifolds = [to_manifold(mesh) for mesh in meshes]
+        if operation == "difference":
+            tool, _ = reduce_tree(manifolds[1:], _evaluated_union)
+            return to_trimesh(manifolds[0] - tool)
+        return to_trimesh(reduce_tree(manifolds, ops[operation])[0])
+    return run
+
+
+engines.register("manifold", _manifold_engine("union"), _manifold_engine("difference"),
+                 _manifold_engine("intersection"))
+
+
+def union_all(parts, label="parts"):
+    """
+    Union a list of meshes with a single conversion per part.
+
+    Falls back to the next engine, then to concatenation (like the old
+    per-part loops did), if the engines reject the input.
+    """
+    parts = list(parts)
+    if not parts:
+        raise ValueError("union_all needs at least one mesh")
+    if len(parts) == 1:
+        return parts[0]
+
+    def concatenate():
+        print(f"Warning: Union of {label} failed on every engine, using concatenate")
+        return trimesh.util.concatenate(parts)
+
+    start = time.perf_counter()
+    result = engines.run("union", parts, label, last_resort=concatenate)
+    if VERBOSE:
+        print(f"  Merged {len(parts)} {label} ({engines.REPORT[-1]['engine']}) - "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms")
+    return result
+
+
+def difference_all(base, cutters, label="cutters"):
+    """
+    Subtract every cutter from base in one boolean.
+
+    The cutters are unioned in a balanced tree first, then removed from the
+    base with a single difference. If every engine fails the base is
+    returned unchanged, matching the old per-hole try/except blocks.
+    """
+    cutters = list(cutters)
+    if not cutters:
+        return base
+
+    def keep_base():
+        print(f"Warning: Subtracting {label} failed on every engine, keeping the base")
+        return base
+
+    start = time.perf_counter()
+    result = engines.run("difference", [base] + cutters, label, last_resort=keep_base)
+    if VERBOSE:
+        print(f"  Subtracted {len(cutters)} {label} ({engines.REPORT[-1]['engine']}) - "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms")
+    return result
+
+
+def intersect_all(parts, label="parts"):
+    """Intersect a list of meshes (balanced tree, one conversion per part)."""
+    parts = list(parts)
+    if len(parts) == 1:
+        return parts[0]
+    return engines.run("intersection", parts, label)
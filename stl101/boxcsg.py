@@ -0,0 +1,249 @@
+"""
+Exact CSG fast path for axis-aligned boxes
+
+Most of the brackets, frames and trays are unions and differences of
+create_box() boxes. For those subtrees no mesh boolean is needed:
+
+1. every box corner coordinate goes into sorted per-axis arrays
+   (coordinate compression), giving a small non-uniform cell grid
+2. each box fills a block of cells; Union / Difference / Intersection
+   become OR / AND NOT / AND on boolean grids
+3. the surface is every cell face between a filled and an empty cell;
+   coplanar faces are merged greedily into rectangles
+
+Rectangle edges are split wherever another rectangle has a corner on them,
+so neighbouring faces always share vertices and the output is watertight.
+Results where boxes touch only along an edge or at a corner would not be
+2-manifold, so those - like anything that is not an axis-aligned box
+(cylinders, wedges, extrusions) - are left to the general boolean engine
+by csg.py.
+"""
+
+import functools
+import itertools
+import time
+
+import numpy as np
+import trimesh
+
+# Coordinates closer than this (mm) are treated as the same grid line
+COORD_DECIMALS = 6
+
+ENABLED = True
+VERBOSE = True
+
+
+def box_bounds(mesh):
+    """(min, max) corners if mesh is an axis-aligned box, else None."""
+    if len(mesh.vertices) != 8 or len(mesh.faces) != 12:
+        return None
+    vertices = np.asarray(mesh.vertices)
+    lo, hi = vertices.min(axis=0), vertices.max(axis=0)
+    on_corner = np.isclose(vertices, lo) | np.isclose(vertices, hi)
+    if not on_corner.all() or np.any(hi - lo <= 0):
+        return None
+    if len(np.unique(np.round(vertices, COORD_DECIMALS), axis=0)) != 8 or mesh.volume <= 0:
+        return None
+    return lo, hi
+
+
+def _leaf_bounds(node):
+    """Box bounds of a Solid leaf (memoized on the node)."""
+    if not hasattr(node, "_box"):
+        node._box = box_bounds(node.mesh)
+    return node._box
+
+
+def is_box_tree(node):
+    """True if node is a box, or a boolean over box-only subtrees."""
+    from .csg import Difference, Intersection, Solid, Union
+    if isinstance(node, Solid):
+        return _leaf_bounds(node) is not None
+    if isinstance(node, Difference):
+        return is_box_tree(node.base) and all(is_box_tree(c) for c in node.cutters)
+    if isinstance(node, (Union, Intersection)):
+        return all(is_box_tree(c) for c in node.children)
+    return False
+
+
+def _collect_boxes(node, boxes):
+    from .csg import Difference, Solid
+    if isinstance(node, Solid):
+        boxes.append(_leaf_bounds(node))
+    elif isinstance(node, Difference):
+        for child in [node.base] + node.cutters:
+            _collect_boxes(child, boxes)
+    else:
+        for child in node.children:
+            _collect_boxes(child, boxes)
+
+
+def _occupancy(node, axes):
+    """Boolean cell grid for a box tree over the compressed axes."""
+    from .csg import Difference, Intersection, Solid, Union
+    if isinstance(node, Solid):
+        lo, hi = _leaf_bounds(node)
+        grid = np.zeros(tuple(len(a) - 1 for a in axes), dtype=bool)
+        index = tuple(slice(np.searchsorted(a, round(l, COORD_DECIMALS)),
+                            np.searchsorted(a, round(h, COORD_DECIMALS)))
+                      for a, l, h in zip(axes, lo, hi))
+        grid[index] = True
+        return grid
+    if isinstance(node, Difference):
+        grid = _occupancy(node.base, axes)
+        for cutter in node.cutters:
+            grid &= ~_occupancy(cutter, axes)
+        return grid
+    grids = [_occupancy(c, axes) for c in node.children]
+    if isinstance(node, Union):
+        return np.logical_or.reduce(grids)
+    if isinstance(node, Intersection):
+        return np.logical_and.reduce(grids)
+    raise TypeError(f"Unknown CSG node {type(node).__name__}")
+
+
+@functools.lru_cache(maxsize=None)
+def _manifold_patterns():
+    """
+    Lookup table over the 256 fillings of the 8 cells around a grid vertex:
+    True where the surface there is 2-manifold, i.e. the filled cells and
+    the empty cells are each face-connected.
+    """
+    def connected(cells):
+        if not cells:
+            return True
+        seen, todo = set(), [cells[0]]
+        while todo:
+            cell = todo.pop()
+            if cell in seen:
+                continue
+            seen.add(cell)
+            todo += [c for c in cells if bin(c ^ cell).count("1") == 1]
+        return len(seen) == len(cells)
+
+    table = np.zeros(256, dtype=bool)
+    for code in range(256):
+        filled = [i for i in range(8) if code >> i & 1]
+        empty = [i for i in range(8) if not code >> i & 1]
+        table[code] = connected(filled) and connected(empty)
+    return table
+
+
+def is_manifold_grid(grid):
+    """True if the grid's surface has no edge- or corner-only contacts."""
+    padded = np.pad(grid, 1)
+    code = np.zeros(tuple(n + 1 for n in grid.shape), dtype=np.uint8)
+    for dx, dy, dz in itertools.product((0, 1), repeat=3):
+        view = padded[dx:dx + code.shape[0], dy:dy + code.shape[1], dz:dz + code.shape[2]]
+        code |= view.astype(np.uint8) << (dx | dy << 1 | dz << 2)
+    return bool(_manifold_patterns()[code].all())
+
+
+def _rectangles(mask):
+    """Greedily cover a 2D boolean mask with rectangles (u0, u1, v0, v1)."""
+    mask = mask.copy()
+    nu, nv = mask.shape
+    rects = []
+    for u in range(nu):
+        for v in np.flatnonzero(mask[u]):
+            if not mask[u, v]:
+                continue
+            v1 = v + 1
+            while v1 < nv and mask[u, v1]:
+                v1 += 1
+            u1 = u + 1
+            while u1 < nu and mask[u1, v:v1].all():
+                u1 += 1
+            mask[u:u1, v:v1] = False
+            rects.append((u, u1, v, v1))
+    return rects
+
+
+def grid_to_mesh(grid, axes):
+    """Watertight surface of a cell grid, coplanar faces merged into rectangles."""
+    # Boundary rectangles: (axis, plane index, normal sign, u0, u1, v0, v1)
+    rects = []
+    for a in range(3):
+        u_axis, v_axis = (a + 1) % 3, (a + 2) % 3
+        cells = np.transpose(grid, (a, u_axis, v_axis))
+        padded = np.pad(cells, ((1, 1), (0, 0), (0, 0))).astype(np.int8)
+        change = padded[1:] - padded[:-1]   # +1: filled after plane, -1: filled before
+        for p in np.flatnonzero(change.any(axis=(1, 2))):
+            for sign in (-1, 1):
+                for u0, u1, v0, v1 in _rectangles(change[p] == -sign):
+                    rects.append((a, p, sign, u0, u1, v0, v1))
+
+    def point(a, p, u, v):
+        index = [0, 0, 0]
+        index[a], index[(a + 1) % 3], index[(a + 2) % 3] = p, u, v
+        return tuple(index)
+
+    corners = set()
+    for a, p, _, u0, u1, v0, v1 in rects:
+        corners.update(point(a, p, u, v) for u in (u0, u1) for v in (v0, v1))
+
+    vertex_ids = {}
+    vertices = []
+    faces = []
+
+    def vid(index):
+        if index not in vertex_ids:
+            vertex_ids[index] = len(vertices)
+            vertices.append([axes[i][index[i]] for i in range(3)])
+        return vertex_ids[index]
+
+    for a, p, sign, u0, u1, v0, v1 in rects:
+        # Perimeter counter-clockwise in (u, v), split at other rectangles' corners
+        ring = [(u, v0) for u in range(u0, u1)]
+        ring += [(u1, v) for v in range(v0, v1)]
+        ring += [(u, v1) for u in range(u1, u0, -1)]
+        ring += [(u0, v) for v in range(v1, v0, -1)]
+        rect_corners = ((u0, v0), (u1, v0), (u1, v1), (u0, v1))
+        ring = [uv for uv in ring if uv in rect_corners or point(a, p, *uv) in corners]
+        ids = [vid(point(a, p, *uv)) for uv in ring]
+        if sign < 0:
+            ring.reverse()
+            ids.reverse()
+        n = len(ids)
+        # Fan from a corner whose two sides are unsplit: n - 2 triangles, none degenerate
+        start = next((i for i in range(n) if ring[i] in rect_corners and
+                      ring[i - 1] in rect_corners and ring[(i + 1) % n] in rect_corners), None)
+        if start is not None:
+            ids = ids[start:] + ids[:start]
+            faces += [[ids[0], ids[i], ids[i + 1]] for i in range(1, n - 1)]
+        else:
+            # Every corner has a split side: fan from the center instead
+            center = [0.0, 0.0, 0.0]
+            center[a] = axes[a][p]
+            center[(a + 1) % 3] = (axes[(a + 1) % 3][u0] + axes[(a + 1) % 3][u1]) / 2
+            center[(a + 2) % 3] = (axes[(a + 2) % 3][v0] + axes[(a + 2) % 3][v1]) / 2
+            vertices.append(center)
+            faces += [[len(vertices) - 1, ids[i], ids[(i + 1) % n]] for i in range(n)]
+
+    return trimesh.Trimesh(vertices=np.array(vertices, dtype=np.float64).reshape(-1, 3),
+                           faces=np.array(faces, dtype=np.int64).reshape(-1, 3), process=False)
+
+
+def evaluate_boxes(node):
+    """
+    Evaluate a box-only CSG tree exactly, without mesh booleans.
+
+    Returns None if the result would not be 2-manifold.
+    """
+    start = time.perf_counter()
+    boxes = []
+    _collect_boxes(node, boxes)
+    corners = np.array([corner for box in boxes for corner in box])
+    axes = [np.unique(np.round(corners[:, i], COORD_DECIMALS)) for i in range(3)]
+    grid = _occupancy(node, axes)
+    shape = "x".join(str(len(a) - 1) for a in axes)
+    if not is_manifold_grid(grid):
+        if VERBOSE:
+            print(f"  Box fast path: {len(boxes)} boxes touch along an edge/corner, "
+                  f"using mesh booleans")
+        return None
+    mesh = grid_to_mesh(grid, axes)
+    if VERBOSE:
+        print(f"  Box fast path: {len(boxes)} boxes on a {shape} grid -> "
+              f"{len(mesh.faces)} faces ({(time.perf_counter() - start) * 1000:.1f} ms)")
+    return mesh
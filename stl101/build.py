@@ -0,0 +1,245 @@
+"""
+Build every part in the repo in parallel
+
+Finds every generate_*.py script that declares a PARTS table
+({"name.stl": build_function}) and builds each part in its own worker
+process, writing the STLs into one output directory.
+
+Usage:
+    python -m stl101.build                      # all parts, one job per CPU
+    python -m stl101.build --jobs 4 --out build
+    python -m stl101.build duct                 # only parts whose name contains "duct"
+    python -m stl101.build --preview            # fast draft: no booleans, GLB only
+    python -m stl101.build --plates             # also nest every part onto 3MF plates
+
+--preview skips every boolean and uses coarse cylinders (see csg.preview):
+each part is written as <name>.preview.glb with its cutters drawn as
+translucent overlays. The GLB is for checking proportions only - it is
+not printable, and no STL is written.
+
+--plates packs one copy of every built part onto 256 x 256 mm beds (see
+nesting.py, --bed to change) and writes plates.3mf - or plates_1.3mf,
+plates_2.3mf, ... for more than one bed - next to the STLs. Use
+python -m stl101.threemf for several copies of a part.
+
+Parts a generator lists in REFERENCES are compared with their reference
+mesh after building (see deviation.py); a part past its tolerance counts
+as a failed build.
+"""
+
+import argparse
+import contextlib
+import glob
+import importlib.util
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import trimesh
+
+from . import cache, csg, deviation, engines, glb, kernel, nesting, threemf
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def find_generators(root=REPO_DIR):
+    """All generate_*.py scripts under root (sorted, stl101 itself excluded)."""
+    paths = glob.glob(os.path.join(root, "**", "generate_*.py"), recursive=True)
+    return sorted(p for p in paths if os.sep + "stl101" + os.sep not in p)
+
+
+def load_generator(path):
+    """Import a generator script by path and return the module."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def discover_parts(root=REPO_DIR):
+    """List of (script path, stl name) for every declared part."""
+    parts = []
+    for path in find_generators(root):
+        with contextlib.redirect_stdout(io.StringIO()):
+            module = load_generator(path)
+        for name in getattr(module, "PARTS", {}):
+            parts.append((path, name))
+    return parts
+
+
+def build_part(path, name, out_dir, preview=False, keep_mesh=False):
+    """
+    Worker: build one part and export it. Returns a result dict, with the
+    mesh's (vertices, faces) under "mesh" if keep_mesh.
+
+    Generator output is captured so parallel logs don't interleave.
+    """
+    if preview:
+        csg.enable_preview()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    log = io.StringIO()
+    stats_before = dict(cache.STATS)
+    dedup_before = dict(csg.STATS)
+    engines.reset_report()
+    kernel.reset_report()
+    result = {"script": path, "name": name, "error": None}
+    try:
+        with contextlib.redirect_stdout(log):
+            module = load_generator(path)
+            mesh = cache.cached_part(module.PARTS[name])
+            if preview:
+                output_path = os.path.join(out_dir, os.path.splitext(name)[0] + ".preview.glb")
+                with open(output_path, "wb") as f:
+                    f.write(glb.part_glb(mesh, name))
+            else:
+                output_path = os.path.join(out_dir, name)
+                mesh.export(output_path)
+        result.update(path=output_path, faces=len(mesh.faces), watertight=mesh.is_watertight)
+        if keep_mesh:
+            result["mesh"] = (np.asarray(mesh.vertices), np.asarray(mesh.faces))
+        declared = None if preview else deviation.declared_reference(path, module, name)
+        if declared:
+            result["deviation"] = check_deviation(mesh, *declared)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["log"] = log.getvalue()
+    result["cache"] = {k: cache.STATS[k] - stats_before[k] for k in ("hits", "misses")}
+    result["dedup"] = {k: csg.STATS[k] - dedup_before[k] for k in csg.STATS}
+    result["engines"] = list(engines.REPORT)
+    result["tessellation"] = dict(kernel.REPORT)
+    result["wall"] = time.perf_counter() - wall_start
+    result["cpu"] = time.process_time() - cpu_start
+    return result
+
+
+def check_deviation(mesh, reference, tolerance):
+    """Compare a built part with its declared reference (see deviation.py)."""
+    check = {"reference": os.path.basename(reference), "tolerance": tolerance}
+    try:
+        compared = deviation.compare(mesh, deviation.reference_surface(reference))
+    except Exception as e:
+        check["error"] = f"{type(e).__name__}: {e}"
+        return check
+    check.update(symmetric=compared["symmetric"], time=compared["time"],
+                 drift=tolerance is not None and compared["symmetric"]["max"] > tolerance)
+    return check
+
+
+def print_deviations(results):
+    """One line per part checked against a reference; returns the drifted ones."""
+    checked = sorted((r for r in results if r.get("deviation")), key=lambda r: r["name"])
+    if not checked:
+        return []
+    print("Deviation from references (symmetric mean / Hausdorff):")
+    for r in checked:
+        d = r["deviation"]
+        if "error" in d:
+            print(f"  {r['name']:<28} vs {d['reference']}: check failed - {d['error']}")
+            continue
+        limit = "" if d["tolerance"] is None else f"  (limit {d['tolerance']:g} mm)"
+        flag = "  DRIFT" if d["drift"] else ""
+        print(f"  {r['name']:<28} vs {d['reference']}: {d['symmetric']['mean']:6.3f} / "
+              f"{d['symmetric']['max']:6.3f} mm  {d['time'] * 1000:4.0f} ms{limit}{flag}")
+    return [r for r in checked if r["deviation"].get("drift")]
+
+
+def write_plates(results, out_dir, bed):
+    """Nest every successfully built part onto 3MF plates in out_dir."""
+    built = sorted((r for r in results if not r["error"]), key=lambda r: r["name"])
+    meshes = [trimesh.Trimesh(*r["mesh"], process=False) for r in built]
+    start = time.perf_counter()
+    plates = nesting.nest([(mesh, 1) for mesh in meshes], bed)
+    written = threemf.write_plates(os.path.join(out_dir, "plates.3mf"),
+                                   [(r["name"], mesh) for r, mesh in zip(built, meshes)], plates)
+    print(f"Plates: {len(meshes)} parts on {len(written)} {bed[0]:g} x {bed[1]:g} mm bed(s) "
+          f"({(time.perf_counter() - start) * 1000:.0f} ms): "
+          f"{', '.join(os.path.basename(path) for path, _ in written)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build all STL parts in parallel.")
+    parser.add_argument("filter", nargs="*", help="only build parts whose name contains one of these")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("-o", "--out", default=os.path.join(REPO_DIR, "build"), help="output directory")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print each generator's log")
+    parser.add_argument("--preview", action="store_true",
+                        help="fast draft without booleans, written as NOT printable .preview.glb")
+    parser.add_argument("--plates", action="store_true", help="also nest the parts onto 3MF plates")
+    parser.add_argument("--bed", type=float, nargs=2, default=nesting.BED_SIZE, metavar=("W", "D"),
+                        help="bed size in mm for --plates (default: %(default)s)")
+    args = parser.parse_args(argv)
+    if args.plates and args.preview:
+        parser.error("--plates needs printable parts, not --preview")
+
+    parts = discover_parts()
+    if args.filter:
+        parts = [(p, n) for p, n in parts if any(f in n for f in args.filter)]
+    if not parts:
+        print("No parts to build.")
+        return 1
+    os.makedirs(args.out, exist_ok=True)
+
+    # Probe once here; workers reuse the stored result instead of relaunching engines
+    print(f"Boolean engines: {engines.describe()}")
+    if args.preview:
+        print("PREVIEW MODE: no booleans, coarse cylinders - output is NOT printable")
+    print(f"Building {len(parts)} parts with {args.jobs} jobs -> {args.out}")
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [pool.submit(build_part, path, name, args.out, args.preview, args.plates)
+                   for path, name in parts]
+        for future in as_completed(futures):
+            r = future.result()
+            results.append(r)
+            if r["error"]:
+                print(f"  FAILED {r['name']:<28} {r['error']}")
+            else:
+                if args.preview:
+                    flag = "  (preview, not printable)"
+                else:
+                    flag = "" if r["watertight"] else "  (NOT watertight)"
+                print(f"  {r['name']:<28} {r['wall']:6.2f}s  {r['faces']:>7} faces{flag}")
+            if args.verbose or r["error"]:
+                print(r["log"])
+    wall = time.perf_counter() - start
+
+    cpu = sum(r["cpu"] for r in results)
+    slowest = max(results, key=lambda r: r["wall"])
+    print()
+    print(f"Wall time: {wall:.2f}s   Summed CPU time: {cpu:.2f}s   "
+          f"Speedup: {cpu / wall:.1f}x")
+    print(f"Slowest part: {slowest['name']} ({slowest['wall']:.2f}s)")
+    hits = sum(r["cache"]["hits"] for r in results)
+    misses = sum(r["cache"]["misses"] for r in results)
+    pruned, pruned_bytes = cache.prune() if cache.ENABLED else (0, 0)
+    print(f"Build cache: {hits} hits, {misses} misses"
+          + (f", {pruned} old entries pruned ({pruned_bytes / 2**20:.1f} MB)" if pruned else ""))
+    reused = sum(r["dedup"]["reused"] for r in results)
+    skipped = sum(r["dedup"]["booleans_skipped"] for r in results)
+    print(f"Deduplicated: {reused} repeated subtrees reused, {skipped} boolean calls skipped")
+    engines.print_report([record for r in results for record in r["engines"]])
+    tessellation = {}
+    for r in results:
+        for key, count in r["tessellation"].items():
+            tessellation[key] = tessellation.get(key, 0) + count
+    kernel.print_report(tessellation)
+    drifted = print_deviations(results)
+    if args.plates:
+        write_plates(results, args.out, args.bed)
+    failed = [r for r in results if r["error"]]
+    if failed:
+        print(f"{len(failed)} part(s) failed")
+    if drifted:
+        print(f"{len(drifted)} part(s) drifted past their reference tolerance")
+    return 1 if failed or drifted else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
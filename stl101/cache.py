@@ -0,0 +1,276 @@
+"""
+Content-addressed build cache
+
+Meshes are stored under CACHE_DIR as uncompressed .npz files named by a
+SHA-1 key, and memory-mapped back on a hit. Two kinds of key are used:
+
+- part keys (part_key / cached_part): generator source + module parameters
+  + the stl101 sources + build_settings() + remesh.ENABLED, so an
+  unchanged part skips its generator entirely
+- subtree keys (csg.structural_key + the stl101 sources): every boolean
+  node in a CSG tree, so changing one feature (e.g. FRAME_SCREW_HOLE)
+  reuses every subtree that did not change
+
+Every hit refreshes the entry's mtime, and prune() drops the least
+recently used entries once the cache grows past MAX_BYTES (the build
+runner prunes after every build). To inspect or empty it:
+
+    python -m stl101.cache            # size and entry count
+    python -m stl101.cache --prune    # down to MAX_BYTES now
+    python -m stl101.cache --clear    # delete every entry
+
+Set STL101_NO_CACHE=1 to disable, STL101_CACHE_DIR to move it,
+STL101_CACHE_MAX_MB to change the size cap. Preview
+mode (STL101_PREVIEW=1) disables it too, so preview meshes never end up
+in a full-quality build.
+"""
+
+import argparse
+import contextlib
+import functools
+import hashlib
+import inspect
+import os
+import struct
+import sys
+import time
+import zipfile
+
+import numpy as np
+import trimesh
+
+from . import kernel, remesh
+
+# Bump to invalidate every cached mesh
+CACHE_VERSION = 1
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get(
+    "STL101_CACHE_DIR", os.path.join(os.path.dirname(PACKAGE_DIR), ".stl101_cache"))
+MAX_BYTES = int(float(os.environ.get("STL101_CACHE_MAX_MB", "1024")) * 1024 * 1024)
+ENABLED = (os.environ.get("STL101_NO_CACHE", "") in ("", "0")
+           and os.environ.get("STL101_PREVIEW", "") in ("", "0"))
+
+STATS = {"hits": 0, "misses": 0, "load_time": 0.0, "store_time": 0.0}
+
+
+# ============================================
+# Storage
+# ============================================
+
+def _path(key):
+    return os.path.join(CACHE_DIR, key[:2], key + ".npz")
+
+
+def load_npz(path):
+    """
+    Memory-map every array of an uncompressed .npz (np.load can't).
+
+    Arrays are copy-on-write maps, so callers may modify them freely
+    without touching the file.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path}: {info.filename} is compressed, can't map it")
+            # Local file header: 30 fixed bytes, then name and extra field
+            f.seek(info.header_offset + 26)
+            name_len, extra_len = struct.unpack("<HH", f.read(4))
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(path, dtype=dtype, mode="c", shape=shape,
+                                         offset=f.tell(), order="F" if fortran else "C")
+    return arrays
+
+
+def load_arrays(key):
+    """Return the cached (vertices, faces) arrays for key, or None."""
+    if not ENABLED or key is None:
+        return None
+    path = _path(key)
+    if not os.path.exists(path):
+        STATS["misses"] += 1
+        return None
+    start = time.perf_counter()
+    try:
+        arrays = load_npz(path)
+    except (OSError, ValueError, zipfile.BadZipFile):
+        # Corrupt or partial entry - treat as a miss and let store() replace it
+        STATS["misses"] += 1
+        return None
+    with contextlib.suppress(OSError):
+        os.utime(path)  # recently used: prune() keeps it
+    STATS["hits"] += 1
+    STATS["load_time"] += time.perf_counter() - start
+    return arrays["vertices"], arrays["faces"]
+
+
+def load(key):
+    """Return the cached mesh for key, or None."""
+    arrays = load_arrays(key)
+    if arrays is None:
+        return None
+    return trimesh.Trimesh(vertices=arrays[0], faces=arrays[1], process=False)
+
+
+def store_arrays(key, vertices, faces):
+    """Write a mesh's arrays under key (atomic rename, so readers never see half a file)."""
+    if not ENABLED or key is None:
+        return
+    start = time.perf_counter()
+    path = _path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, vertices=np.asarray(vertices), faces=np.asarray(faces))
+    os.replace(tmp, path)
+    STATS["store_time"] += time.perf_counter() - start
+
+
+def store(key, mesh):
+    """Write mesh under key."""
+    store_arrays(key, mesh.vertices, mesh.faces)
+
+
+def print_stats():
+    """Print hit/miss counts for this run."""
+    if not ENABLED:
+        return
+    total = STATS["hits"] + STATS["misses"]
+    if not total:
+        print("Build cache: unused")
+        return
+    print(f"Build cache: {STATS['hits']} hits, {STATS['misses']} misses "
+          f"({STATS['hits'] / total:.0%} hit rate)")
+    print(f"  load {STATS['load_time'] * 1000:.1f} ms, store {STATS['store_time'] * 1000:.1f} ms "
+          f"({CACHE_DIR})")
+
+
+def entries():
+    """(mtime, size, path) of every cached mesh, oldest first."""
+    found = []
+    for root, _, names in os.walk(CACHE_DIR):
+        for name in names:
+            if name.endswith(".npz"):
+                path = os.path.join(root, name)
+                with contextlib.suppress(OSError):
+                    info = os.stat(path)
+                    found.append((info.st_mtime, info.st_size, path))
+    return sorted(found)
+
+
+def prune(max_bytes=MAX_BYTES):
+    """Delete least recently used entries until the cache fits max_bytes; returns (count, bytes) removed."""
+    found = entries()
+    excess = sum(size for _, size, _ in found) - max_bytes
+    removed = [0, 0]
+    for _, size, path in found:
+        if excess <= 0:
+            break
+        with contextlib.suppress(OSError):
+            os.remove(path)
+            excess -= size
+            removed[0] += 1
+            removed[1] += size
+    return tuple(removed)
+
+
+# ============================================
+# Keys
+# ============================================
+
+def make_key(*parts):
+    """Combine strings into a cache key (a plain hex digest, safe as a filename)."""
+    return hashlib.sha1(":".join(map(str, (CACHE_VERSION,) + parts)).encode()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def package_digest():
+    """Hash of the stl101 sources - a kernel/engine change invalidates parts and subtrees."""
+    digest = hashlib.sha1()
+    for name in sorted(os.listdir(PACKAGE_DIR)):
+        if name.endswith(".py"):
+            with open(os.path.join(PACKAGE_DIR, name), "rb") as f:
+                digest.update(name.encode() + f.read())
+    return digest.hexdigest()
+
+
+def build_settings():
+    """
+    Settings that change every mesh without touching a source file: the
+    chord tolerance, and the cylinder side cap in preview mode.
+    """
+    settings = f"chord={kernel.CHORD_TOLERANCE!r}"
+    if kernel.PREVIEW:
+        settings += f";preview={kernel.PREVIEW_SEGMENTS}"
+    return settings
+
+
+def module_parameters(module):
+    """
+    The UPPER_CASE numeric/string/list constants a generator is configured
+    with. Accepts a module or its globals dict.
+    """
+    namespace = module if isinstance(module, dict) else vars(module)
+    return {name: value for name, value in namespace.items()
+            if name.isupper() and isinstance(value, (int, float, str, list, tuple))}
+
+
+def part_key(func, *args):
+    """Key for func(*args): generator source, parameters, stl101 sources and build settings."""
+    digest = hashlib.sha1(make_key("part", func.__qualname__, repr(args)).encode())
+    with open(inspect.getsourcefile(func), "rb") as f:
+        digest.update(f.read())
+    for name, value in sorted(module_parameters(func.__globals__).items()):
+        digest.update(f"{name}={value!r};".encode())
+    digest.update(package_digest().encode())
+    digest.update(build_settings().encode())
+    # cached_part stores the merged mesh, so STL101_NO_REMESH needs its own entry
+    digest.update(f"remesh={remesh.ENABLED};".encode())
+    return digest.hexdigest()
+
+
+def cached_part(func, *args):
+    """
+    Return func(*args), reusing the stored mesh if nothing it depends on
+    changed. Fresh parts get their coplanar faces merged (remesh.py) before
+    they are stored and exported.
+    """
+    key = part_key(func, *args) if ENABLED else None
+    mesh = load(key)
+    if mesh is not None:
+        print(f"Cache hit: {func.__name__} (unchanged, skipped build)")
+        return mesh
+    mesh = remesh.merge_coplanar(func(*args), func.__name__)
+    store(key, mesh)
+    return mesh
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show, prune or clear the build cache.")
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument("--prune", action="store_true",
+                        help=f"drop least recently used entries down to {MAX_BYTES / 2**20:.0f} MB")
+    action.add_argument("--clear", action="store_true", help="delete every cached mesh")
+    args = parser.parse_args(argv)
+
+    if args.prune or args.clear:
+        count, size = prune(0 if args.clear else MAX_BYTES)
+        print(f"Removed {count} entries, {size / 2**20:.1f} MB")
+    found = entries()
+    print(f"{CACHE_DIR}: {len(found)} entries, {sum(s for _, s, _ in found) / 2**20:.1f} MB "
+          f"(cap {MAX_BYTES / 2**20:.0f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
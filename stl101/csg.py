@@ -0,0 +1,578 @@
+"""
+Lazy CSG expression trees
+
+Generators describe a part as a tree of Union / Difference / Intersection /
+Transform nodes over plain trimesh primitives, then call evaluate() once.
+Before anything is computed the tree is optimized:
+
+- nested unions (and intersections) are flattened into one n-ary node
+- stacked subtractions are merged: (A - B) - C  ->  A - (B, C)
+- unions used as cutters are split into separate cutters
+- no-op nodes (single-child unions, empty differences, identity
+  transforms) are dropped
+
+Each remaining Union / Difference / Intersection is one batched boolean
+call, so e.g. the rail frame goes from ~15 booleans to 2. Subtrees made
+only of axis-aligned boxes skip the mesh booleans entirely (boxcsg.py).
+
+Symmetric(half, axis, plane) is a part (or a pair of identical features)
+that is its own mirror image: the half is built once and every boolean
+inside it runs on half the geometry. The mirrored copy is welded on
+without a boolean - the two halves meet exactly on the plane, so their
+faces there cancel - unless the half crosses the plane, which takes a
+union. Box-only halves are instead mirrored leaf by leaf and left to the
+box fast path. STL101_NO_SYMMETRY=1 unions the half with a mirrored copy
+(a second build of it too, with STL101_NO_DEDUP=1).
+
+Within one evaluate(), repeated subtrees - the same feature placed at
+several positions - are built once: shape_key() hashes a subtree up to
+translation, and every later copy is the first result moved into place.
+STL101_NO_DEDUP=1 builds every copy.
+
+By default the tree is evaluated on native Manifold objects: leaves are
+converted once, intermediate results never become trimeshes, and the part
+is converted back once at the end. STL101_BACKEND=trimesh restores the
+per-node trimesh round trip.
+
+In preview mode (kernel.PREVIEW) no boolean runs at all: evaluate() returns
+the solids concatenated into one mesh, marked not printable, with every
+subtracted feature kept in mesh.metadata["preview_cutters"] so a viewer can
+draw it as a translucent overlay (glb.part_glb).
+"""
+
+import hashlib
+import os
+import time
+
+import numpy as np
+import trimesh
+
+from . import boxcsg, cache, engines, kernel
+from .boolean import (difference_all, difference_manifolds, intersect_all, intersect_manifolds,
+                      to_manifold, to_trimesh, union_all, union_manifolds)
+
+
+class Node:
+    """Base class for CSG tree nodes."""
+
+    def __add__(self, other):
+        return Union(self, other)
+
+    def __sub__(self, other):
+        return Difference(self, other)
+
+
+def as_node(item):
+    """Wrap a trimesh in a Solid leaf; pass nodes through unchanged."""
+    if isinstance(item, Node):
+        return item
+    if isinstance(item, trimesh.Trimesh):
+        return Solid(item)
+    raise TypeError(f"Cannot use {type(item).__name__} in a CSG tree")
+
+
+class Solid(Node):
+    """Leaf node holding an already-built mesh."""
+
+    def __init__(self, mesh, label=None):
+        self.mesh = mesh
+        self.label = label
+
+    def __repr__(self):
+        return f"Solid({self.label or len(self.mesh.faces)})"
+
+
+class Union(Node):
+    """Union of any number of children."""
+
+    def __init__(self, *children):
+        self.children = [as_node(c) for c in children]
+
+    def __repr__(self):
+        return f"Union({', '.join(map(repr, self.children))})"
+
+
+class Difference(Node):
+    """Base with every cutter subtracted."""
+
+    def __init__(self, base, *cutters):
+        self.base = as_node(base)
+        self.cutters = [as_node(c) for c in cutters]
+
+    def __repr__(self):
+        return f"Difference({self.base!r} - {', '.join(map(repr, self.cutters))})"
+
+
+class Intersection(Node):
+    """Volume shared by all children."""
+
+    def __init__(self, *children):
+        self.children = [as_node(c) for c in children]
+
+    def __repr__(self):
+        return f"Intersection({', '.join(map(repr, self.children))})"
+
+
+class Transform(Node):
+    """Child moved by a 4x4 homogeneous matrix."""
+
+    def __init__(self, child, matrix):
+        self.child = as_node(child)
+        self.matrix = np.asarray(matrix, dtype=np.float64)
+
+    def __repr__(self):
+        return f"Transform({self.child!r})"
+
+
+class Symmetric(Node):
+    """Child plus its mirror image across the plane axis = plane."""
+
+    def __init__(self, child, axis="x", plane=0.0):
+        self.child = as_node(child)
+        self.axis = axis
+        self.plane = float(plane)
+        self.matrix = mirror_matrix(axis, plane)
+
+    def __repr__(self):
+        return f"Symmetric({self.child!r}, {self.axis}={self.plane:g})"
+
+
+def translate(child, offset):
+    """Transform node that moves child by offset."""
+    return Transform(child, trimesh.transformations.translation_matrix(offset))
+
+
+def mirror_matrix(axis, plane=0.0):
+    """4x4 reflection across the plane axis = plane ("x", "y" or "z")."""
+    index = "xyz".index(axis)
+    matrix = np.eye(4)
+    matrix[index, index] = -1.0
+    matrix[index, 3] = 2.0 * plane
+    return matrix
+
+
+def mirror(child, axis="x", plane=0.0):
+    """Transform node reflecting child across the plane axis = plane."""
+    return Transform(child, mirror_matrix(axis, plane))
+
+
+# Vertices this close (mm) to a Symmetric node's plane are on it
+WELD_TOLERANCE = 1e-4
+
+
+def weld_mirrored(vertices, faces, axis, plane):
+    """
+    A solid on one side of a plane joined with its mirror image, as
+    (vertices, faces): both copies minus their faces on the plane, sharing
+    the vertices there. None if the solid crosses the plane.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64)
+    index = "xyz".index(axis)
+    side = vertices[:, index] - plane
+    if side.min() < -WELD_TOLERANCE and side.max() > WELD_TOLERANCE:
+        return None
+    on_plane = np.abs(side) <= WELD_TOLERANCE
+    mirrored = vertices.copy()
+    mirrored[:, index] = 2.0 * plane - mirrored[:, index]
+    # Mirrored copies reuse the vertices on the plane; reflecting flips winding
+    remap = np.where(on_plane, np.arange(len(vertices)), np.arange(len(vertices)) + len(vertices))
+    keep = ~on_plane[faces].all(axis=1)
+    welded = np.concatenate([faces[keep], remap[faces[keep]][:, ::-1]])
+    used = np.zeros(2 * len(vertices), dtype=bool)
+    used[welded.ravel()] = True
+    renumber = np.cumsum(used) - 1
+    return np.concatenate([vertices, mirrored])[used], renumber[welded]
+
+
+# ============================================
+# Optimizer
+# ============================================
+
+# Build Symmetric nodes from one half (STL101_NO_SYMMETRY=1 builds both)
+SYMMETRY = os.environ.get("STL101_NO_SYMMETRY", "") in ("", "0")
+
+
+def _moved(node, matrix):
+    """Copy of a box tree with matrix baked into every leaf."""
+    if isinstance(node, Solid):
+        return Solid(node.mesh.copy().apply_transform(matrix), node.label)
+    if isinstance(node, Difference):
+        return Difference(_moved(node.base, matrix), *(_moved(c, matrix) for c in node.cutters))
+    return type(node)(*(_moved(c, matrix) for c in node.children))
+
+
+def optimize(node):
+    """Return an equivalent tree with fewer boolean nodes."""
+    if isinstance(node, Solid):
+        return node
+
+    if isinstance(node, Transform):
+        child = optimize(node.child)
+        matrix = node.matrix
+        if isinstance(child, Transform):
+            matrix = matrix @ child.matrix
+            child = child.child
+        if np.allclose(matrix, np.eye(4)):
+            return child
+        if isinstance(child, Solid):
+            # Baking the transform into a leaf is cheaper than keeping the node
+            return Solid(child.mesh.copy().apply_transform(matrix), child.label)
+        return Transform(child, matrix)
+
+    if isinstance(node, Symmetric):
+        child = optimize(node.child)
+        if boxcsg.is_box_tree(child):
+            # Mirrored boxes are still boxes: one grid pass beats a weld
+            return optimize(Union(child, _moved(child, node.matrix)))
+        if not SYMMETRY:
+            return optimize(Union(child, Transform(child, node.matrix)))
+        return Symmetric(child, node.axis, node.plane)
+
+    if isinstance(node, (Union, Intersection)):
+        kind = type(node)
+        children = []
+        for child in map(optimize, node.children):
+            if isinstance(child, kind):
+                children.extend(child.children)
+            else:
+                children.append(child)
+        if len(children) == 1:
+            return children[0]
+        return kind(*children)
+
+    if isinstance(node, Difference):
+        base = optimize(node.base)
+        cutters = []
+        if isinstance(base, Difference):
+            cutters.extend(base.cutters)
+            base = base.base
+        for cutter in map(optimize, node.cutters):
+            if isinstance(cutter, Union):
+                cutters.extend(cutter.children)
+            else:
+                cutters.append(cutter)
+        if not cutters:
+            return base
+        return Difference(base, *cutters)
+
+    raise TypeError(f"Unknown CSG node {type(node).__name__}")
+
+
+def count_booleans(node):
+    """Number of boolean calls evaluating this tree will make."""
+    if isinstance(node, Solid):
+        return 0
+    if isinstance(node, Transform):
+        return count_booleans(node.child)
+    if isinstance(node, Symmetric):
+        # The mirrored half is welded on without a boolean
+        return count_booleans(node.child)
+    if isinstance(node, Difference):
+        return 1 + count_booleans(node.base) + sum(count_booleans(c) for c in node.cutters)
+    return 1 + sum(count_booleans(c) for c in node.children)
+
+
+def structural_key(node):
+    """
+    Content hash of a subtree: leaf geometry plus the operations on it.
+
+    Identical subtrees get identical keys regardless of which Python
+    objects they are built from. Memoized on the node.
+    """
+    key = getattr(node, "_key", None)
+    if key is not None:
+        return key
+    digest = hashlib.sha1(type(node).__name__.encode())
+    if isinstance(node, Solid):
+        digest.update(np.ascontiguousarray(node.mesh.vertices, dtype=np.float64).tobytes())
+        digest.update(np.ascontiguousarray(node.mesh.faces, dtype=np.int64).tobytes())
+    elif isinstance(node, (Transform, Symmetric)):
+        digest.update(node.matrix.tobytes())
+        digest.update(structural_key(node.child).encode())
+    elif isinstance(node, Difference):
+        for child in [node.base] + node.cutters:
+            digest.update(structural_key(child).encode())
+    else:
+        for child in node.children:
+            digest.update(structural_key(child).encode())
+    node._key = digest.hexdigest()
+    return node._key
+
+
+# Repeats are matched on offsets rounded to this many decimals (mm)
+SHAPE_DECIMALS = 6
+
+
+def _rounded(values):
+    # + 0.0 turns -0.0 into 0.0 so both hash alike
+    return np.ascontiguousarray(np.round(values, SHAPE_DECIMALS) + 0.0)
+
+
+def shape_key(node):
+    """
+    (key, origin) of a subtree: a content hash that ignores where the
+    subtree is, and the point its geometry is measured from.
+
+    Subtrees with equal keys are the same shape, moved by the difference
+    of their origins. Memoized on the node.
+    """
+    cached = getattr(node, "_shape_key", None)
+    if cached is not None:
+        return cached
+    digest = hashlib.sha1(type(node).__name__.encode())
+    if isinstance(node, Solid):
+        vertices = np.asarray(node.mesh.vertices, dtype=np.float64)
+        origin = vertices.min(axis=0) if len(vertices) else np.zeros(3)
+        digest.update(_rounded(vertices - origin).tobytes())
+        digest.update(np.ascontiguousarray(node.mesh.faces, dtype=np.int64).tobytes())
+    elif isinstance(node, Transform):
+        child_key, child_origin = shape_key(node.child)
+        origin = node.matrix[:3, :3] @ child_origin + node.matrix[:3, 3]
+        digest.update(_rounded(node.matrix[:3, :3]).tobytes())
+        digest.update(child_key.encode())
+    else:
+        if isinstance(node, Symmetric):
+            children = [node.child]
+        elif isinstance(node, Difference):
+            children = [node.base] + node.cutters
+        else:
+            children = node.children
+        keys = [shape_key(c) for c in children]
+        origin = np.min([child_origin for _, child_origin in keys], axis=0)
+        for child_key, child_origin in keys:
+            digest.update(child_key.encode())
+            digest.update(_rounded(child_origin - origin).tobytes())
+        if isinstance(node, Symmetric):
+            plane = node.plane - origin["xyz".index(node.axis)]
+            digest.update(f"{node.axis}={_rounded(plane)}".encode())
+    node._shape_key = (digest.hexdigest(), origin)
+    return node._shape_key
+
+
+# ============================================
+# Backends
+# ============================================
+
+class TrimeshBackend:
+    """Trimesh results at every node (each boolean converts in and out of Manifold)."""
+
+    name = "trimesh"
+    leaf = staticmethod(lambda mesh: mesh)
+    union = staticmethod(union_all)
+    difference = staticmethod(difference_all)
+    intersection = staticmethod(intersect_all)
+    to_trimesh = staticmethod(lambda mesh: mesh)
+
+    @staticmethod
+    def transform(mesh, matrix):
+        return mesh.copy().apply_transform(matrix)
+
+    @staticmethod
+    def arrays(mesh):
+        return mesh.vertices, mesh.faces
+
+    @staticmethod
+    def from_arrays(vertices, faces):
+        return trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+
+
+class ManifoldBackend:
+    """Native Manifold objects from the leaves up; one trimesh conversion at the end."""
+
+    name = "manifold"
+    leaf = staticmethod(to_manifold)
+    union = staticmethod(union_manifolds)
+    difference = staticmethod(difference_manifolds)
+    intersection = staticmethod(intersect_manifolds)
+    to_trimesh = staticmethod(to_trimesh)
+
+    @staticmethod
+    def transform(manifold, matrix):
+        return manifold.transform(matrix[:3])
+
+    @staticmethod
+    def arrays(manifold):
+        mesh = manifold.to_mesh()
+        return mesh.vert_properties, mesh.tri_verts
+
+    @staticmethod
+    def from_arrays(vertices, faces):
+        return to_manifold(trimesh.Trimesh(vertices=vertices, faces=faces, process=False))
+
+
+BACKENDS = {backend.name: backend for backend in (TrimeshBackend, ManifoldBackend)}
+BACKEND = BACKENDS[os.environ.get("STL101_BACKEND", "manifold")]
+
+
+# ============================================
+# Evaluator
+# ============================================
+
+# Build repeated subtrees once per evaluate() (STL101_NO_DEDUP=1 builds every copy)
+DEDUP = os.environ.get("STL101_NO_DEDUP", "") in ("", "0")
+
+# Repeated subtrees reused this process, and the boolean calls that saved
+STATS = {"reused": 0, "booleans_skipped": 0}
+
+
+def _evaluate(node, backend, memo):
+    if isinstance(node, Solid):
+        return backend.leaf(node.mesh)
+    if isinstance(node, Transform):
+        return backend.transform(_evaluate(node.child, backend, memo), node.matrix)
+
+    # Boolean node: a repeat of a subtree built earlier in this evaluate()
+    # is that result moved into place
+    if DEDUP:
+        shape_id, origin = shape_key(node)
+        if shape_id in memo:
+            shape, built_at = memo[shape_id]
+            STATS["reused"] += 1
+            STATS["booleans_skipped"] += count_booleans(node)
+            offset = origin - built_at
+            if not offset.any():
+                return shape
+            return backend.transform(shape, trimesh.transformations.translation_matrix(offset))
+
+    # Reuse the stored result if this exact subtree was built before
+    # The stl101 sources are in the key, so fixing a kernel or engine rebuilds the subtree
+    key = None
+    if cache.ENABLED:
+        key = cache.make_key("csg", structural_key(node), cache.package_digest())
+    arrays = cache.load_arrays(key)
+    if arrays is not None:
+        shape = backend.from_arrays(*arrays)
+    else:
+        shape = _evaluate_boolean(node, backend, memo)
+        if key is not None:
+            cache.store_arrays(key, *backend.arrays(shape))
+    if DEDUP:
+        memo[shape_id] = (shape, origin)
+    return shape
+
+
+def _evaluate_boxes(node, backend, memo):
+    """Box fast path for the box-only part of node; None if it doesn't apply."""
+    if boxcsg.is_box_tree(node):
+        mesh = boxcsg.evaluate_boxes(node)
+        return None if mesh is None else backend.leaf(mesh)
+    # Mixed nodes: do the box-only part on the grid, the rest as booleans
+    if isinstance(node, Union):
+        boxes = [c for c in node.children if boxcsg.is_box_tree(c)]
+        if len(boxes) > 1:
+            mesh = boxcsg.evaluate_boxes(Union(*boxes))
+            if mesh is not None:
+                others = [c for c in node.children if not boxcsg.is_box_tree(c)]
+                return backend.union([backend.leaf(mesh)] +
+                                     [_evaluate(c, backend, memo) for c in others])
+    if isinstance(node, Difference) and boxcsg.is_box_tree(node.base):
+        boxes = [c for c in node.cutters if boxcsg.is_box_tree(c)]
+        if boxes:
+            mesh = boxcsg.evaluate_boxes(Difference(node.base, *boxes))
+            if mesh is not None:
+                others = [c for c in node.cutters if not boxcsg.is_box_tree(c)]
+                return backend.difference(backend.leaf(mesh),
+                                          [_evaluate(c, backend, memo) for c in others])
+    return None
+
+
+def _evaluate_boolean(node, backend, memo):
+    if boxcsg.ENABLED:
+        shape = _evaluate_boxes(node, backend, memo)
+        if shape is not None:
+            return shape
+
+    if isinstance(node, Union):
+        return backend.union([_evaluate(c, backend, memo) for c in node.children])
+    if isinstance(node, Intersection):
+        return backend.intersection([_evaluate(c, backend, memo) for c in node.children])
+    if isinstance(node, Difference):
+        return backend.difference(_evaluate(node.base, backend, memo),
+                                  [_evaluate(c, backend, memo) for c in node.cutters])
+    if isinstance(node, Symmetric):
+        start = time.perf_counter()
+        half = _evaluate(node.child, backend, memo)
+        built = time.perf_counter()
+        welded = weld_mirrored(*backend.arrays(half), node.axis, node.plane)
+        if welded is not None:
+            shape, how = backend.from_arrays(*welded), "welded"
+        else:
+            shape, how = backend.union([half, backend.transform(half, node.matrix)]), "unioned"
+        print(f"  Symmetry: half built once ({(built - start) * 1000:.1f} ms), mirrored across "
+              f"{node.axis}={node.plane:g} and {how} ({(time.perf_counter() - built) * 1000:.1f} ms)")
+        return shape
+    raise TypeError(f"Unknown CSG node {type(node).__name__}")
+
+
+def enable_preview():
+    """Switch this process to preview mode: coarse cylinders, no booleans, no cache."""
+    kernel.PREVIEW = True
+    cache.ENABLED = False
+
+
+def _evaluate_preview(node):
+    """(solid meshes, cutter meshes) of a tree, without any boolean."""
+    if isinstance(node, Solid):
+        return [node.mesh], list(node.mesh.metadata.get("preview_cutters", []))
+    if isinstance(node, (Transform, Symmetric)):
+        solids, cutters = _evaluate_preview(node.child)
+        moved = ([m.copy().apply_transform(node.matrix) for m in solids],
+                 [m.copy().apply_transform(node.matrix) for m in cutters])
+        if isinstance(node, Transform):
+            return moved
+        return solids + moved[0], cutters + moved[1]
+    if isinstance(node, Difference):
+        solids, cutters = _evaluate_preview(node.base)
+        for cutter in node.cutters:
+            cutter_solids, cutter_cutters = _evaluate_preview(cutter)
+            cutters += cutter_solids + cutter_cutters
+        return solids, cutters
+    # Unions and intersections both show every child
+    solids, cutters = [], []
+    for child in node.children:
+        child_solids, child_cutters = _evaluate_preview(child)
+        solids += child_solids
+        cutters += child_cutters
+    return solids, cutters
+
+
+def preview(node, label="part"):
+    """Preview-mode evaluate(): the solids as one mesh, cutters in its metadata."""
+    node = as_node(node)
+    solids, cutters = _evaluate_preview(node)
+    print(f"  CSG {label}: PREVIEW, {count_booleans(node)} boolean calls skipped "
+          f"({len(solids)} solids, {len(cutters)} cutters as overlays)")
+    mesh = trimesh.util.concatenate(solids)
+    mesh.metadata.update(printable=False, preview_cutters=cutters)
+    return mesh
+
+
+def evaluate(node, label="part", backend=None):
+    """Optimize the tree, then compute it once. Returns a trimesh."""
+    if kernel.PREVIEW:
+        return preview(node, label)
+    backend = backend or BACKEND
+    if backend is ManifoldBackend and "manifold" not in engines.available():
+        backend = TrimeshBackend
+    tree = optimize(as_node(node))
+    print(f"  CSG {label}: {count_booleans(tree)} boolean calls "
+          f"(unoptimized: {count_booleans(as_node(node))})")
+    before = dict(STATS)
+    try:
+        mesh = backend.to_trimesh(_evaluate(tree, backend, {}))
+    except ValueError as e:
+        if backend is TrimeshBackend:
+            raise
+        # A leaf Manifold rejects: the trimesh path falls back per node instead
+        print(f"Warning: {backend.name} backend failed for {label} ({e}), using trimesh")
+        start = time.perf_counter()
+        before = dict(STATS)
+        mesh = _evaluate(tree, TrimeshBackend, {})
+        engines.record("evaluate", label, "trimesh", time.perf_counter() - start,
+                       [(backend.name, f"{type(e).__name__}: {e}")])
+    reused = STATS["reused"] - before["reused"]
+    if reused:
+        print(f"  Dedup {label}: {reused} repeated subtrees reused, "
+              f"{STATS['booleans_skipped'] - before['booleans_skipped']} boolean calls skipped")
+    return mesh
@@ -0,0 +1,250 @@
+"""
+Deviation check - how far a generated part's surface is from a reference
+
+Both surfaces are sampled (area-weighted, fixed seed, so runs are
+comparable) and each goes into a KD-tree once, TREE_SAMPLES points
+dense; SAMPLES of those are measured against the other surface. A
+point's distance is measured to triangles, not to samples: the tree
+finds the NEIGHBOURS nearest points and the point is measured against
+the triangles they lie on (trimesh.triangles.closest_point, one
+vectorized call for every point and candidate). Missing the true closest
+triangle can only overestimate, by at most the gap between tree points,
+so the largest REFINE_FRACTION of distances - the ones max and p95 come
+from - are re-measured against REFINE_NEIGHBOURS points' triangles. From
+those distances:
+
+- part -> reference and reference -> part: mean, 95th percentile and max
+  (the one-sided Hausdorff distance)
+- symmetric: mean of both directions, Hausdorff = the larger max
+- a heat map: the mean deviation of the samples in each cell of a grid
+  across the profile (looking along the part's length), so drift shows
+  up where it happens - e.g. in the retention lip cells
+
+Parts are aligned by their bounding-box centres. Only the stretch of
+length both cover is compared, minus END_MARGIN at each end, so a 200 mm
+duct segment can be checked against the 245 mm reference and its end
+caps are not counted as deviation.
+
+Generators name their reference in a REFERENCES table
+({"wire_duct_final.stl": "cable_channel_v2_ref.obj"}, paths relative to
+the script, optionally (path, max Hausdorff mm)); stl101.build checks
+those parts on every build. By hand:
+
+    python -m stl101.deviation wire_duct_final.stl
+    python -m stl101.deviation build/wire_duct_final.stl --reference "UNDERDESK ORGANIZER/cable_channel_v2_ref.obj"
+    python -m stl101.deviation wire_duct_final.stl --heatmap build/wire_duct_final.deviation.ply
+"""
+
+import argparse
+import contextlib
+import functools
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import trimesh
+from scipy.spatial import cKDTree
+
+from . import readers
+
+SAMPLES = 10000       # points per surface measured against the other one
+TREE_SAMPLES = 50000  # points per surface in its KD-tree (denser: fewer missed triangles)
+NEIGHBOURS = 4        # nearest tree points whose triangles a point is measured against
+REFINE_FRACTION = 0.02  # largest distances re-measured ...
+REFINE_NEIGHBOURS = 64  # ... against this many tree points' triangles
+SEED = 101
+END_MARGIN = 1.0      # mm left out at each end of the compared length
+HEATMAP_CELLS = (8, 5)  # across x down the profile
+
+
+def surface(mesh, samples=SAMPLES, seed=SEED):
+    """Area-weighted samples of a mesh's surface and a KD-tree over denser ones."""
+    points, face_index = trimesh.sample.sample_surface(mesh, max(samples, TREE_SAMPLES), seed=seed)
+    # Samples come out in random order, so the first ones are an even subset
+    return {"mesh": mesh, "points": points[:samples], "face_index": face_index,
+            "tree": cKDTree(points), "triangles": np.asarray(mesh.triangles)}
+
+
+@functools.lru_cache(maxsize=None)
+def _reference_surface(path, mtime, samples):
+    return surface(readers.load(path), samples)
+
+
+def reference_surface(path, samples=SAMPLES):
+    """surface() of a reference file, loaded and sampled once per process."""
+    path = os.path.abspath(path)
+    return _reference_surface(path, os.path.getmtime(path), samples)
+
+
+def _closest(points, target, k):
+    """Distance from each point to the triangles under its k nearest tree points."""
+    _, nearest = target["tree"].query(points, k=k)
+    # Each candidate triangle measured once per point (neighbouring samples mostly share a face)
+    faces = np.sort(target["face_index"][nearest].reshape(len(points), k), axis=1)
+    unique = np.ones(faces.shape, dtype=bool)
+    unique[:, 1:] = faces[:, 1:] != faces[:, :-1]
+    point_index = np.nonzero(unique)[0]
+    candidates = points[point_index]
+    closest = trimesh.triangles.closest_point(target["triangles"][faces[unique]], candidates)
+    result = np.full(len(points), np.inf)
+    np.minimum.at(result, point_index, np.linalg.norm(closest - candidates, axis=1))
+    return result
+
+
+def distances(points, target, offset=np.zeros(3)):
+    """Distance from each point to target's surface (target moved by offset)."""
+    points = points - offset
+    result = _closest(points, target, NEIGHBOURS)
+    # Too few candidates can only overestimate; re-measure the largest with more
+    if len(points):
+        top = np.argsort(result)[-max(1, int(len(points) * REFINE_FRACTION)):]
+        result[top] = np.minimum(result[top], _closest(points[top], target, REFINE_NEIGHBOURS))
+    return result
+
+
+def _summary(values):
+    return {"mean": float(values.mean()), "p95": float(np.percentile(values, 95)),
+            "max": float(values.max())}
+
+
+def compare(part, reference, samples=SAMPLES):
+    """
+    Deviation of part (mesh or surface()) from reference (mesh or surface()).
+
+    Returns a dict: "part_to_reference" / "reference_to_part" / "symmetric"
+    summaries (mean, p95, max in mm), "heatmap" (mean mm per cell, NaN where
+    empty, rows from the top of the profile), "axes" (length, across, up
+    axis indices), "extent" (compared range along the length) and "time".
+    """
+    start = time.perf_counter()
+    part = part if isinstance(part, dict) else surface(part, samples)
+    reference = reference if isinstance(reference, dict) else surface(reference, samples)
+    part_bounds, ref_bounds = part["mesh"].bounds, reference["mesh"].bounds
+    offset = part_bounds.mean(axis=0) - ref_bounds.mean(axis=0)  # reference -> part frame
+
+    # Length = the axis both parts are longest along; up = the shorter remaining one
+    size = np.minimum(part_bounds[1] - part_bounds[0], ref_bounds[1] - ref_bounds[0])
+    length = int(np.argmax(size))
+    across, up = sorted((a for a in range(3) if a != length), key=lambda a: -size[a])
+    low = max(part_bounds[0][length], ref_bounds[0][length] + offset[length]) + END_MARGIN
+    high = min(part_bounds[1][length], ref_bounds[1][length] + offset[length]) - END_MARGIN
+
+    part_points = part["points"]
+    part_points = part_points[(part_points[:, length] >= low) & (part_points[:, length] <= high)]
+    ref_points = reference["points"] + offset
+    ref_points = ref_points[(ref_points[:, length] >= low) & (ref_points[:, length] <= high)]
+    to_reference = distances(part_points, reference, offset)
+    to_part = distances(ref_points, part)
+
+    # Heat map over the union of both profiles, every sample in its cell
+    points = np.vstack([part_points, ref_points])
+    values = np.concatenate([to_reference, to_part])
+    lo = np.minimum(part_bounds[0], ref_bounds[0] + offset)
+    hi = np.maximum(part_bounds[1], ref_bounds[1] + offset)
+    columns, rows = HEATMAP_CELLS
+    col = np.clip(((points[:, across] - lo[across]) / (hi[across] - lo[across]) * columns).astype(int),
+                  0, columns - 1)
+    row = np.clip(((hi[up] - points[:, up]) / (hi[up] - lo[up]) * rows).astype(int), 0, rows - 1)
+    cell = row * columns + col
+    sums = np.bincount(cell, weights=values, minlength=rows * columns)
+    counts = np.bincount(cell, minlength=rows * columns)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        heatmap = (sums / counts).reshape(rows, columns)
+
+    return {
+        "part_to_reference": _summary(to_reference),
+        "reference_to_part": _summary(to_part),
+        "symmetric": {"mean": float(values.mean()),
+                      "max": float(max(to_reference.max(), to_part.max()))},
+        "heatmap": heatmap,
+        "axes": (length, across, up),
+        "bounds": (lo, hi),
+        "extent": (low, high),
+        "time": time.perf_counter() - start,
+    }
+
+
+def print_report(result, label="part", reference="reference"):
+    axis = "xyz"
+    length, across, up = result["axes"]
+    low, high = result["extent"]
+    lo, hi = result["bounds"]
+    print(f"Deviation {label} vs {reference} "
+          f"({axis[length]} {low:.1f}..{high:.1f} mm compared, {result['time'] * 1000:.0f} ms)")
+    for key, name in (("part_to_reference", f"{label} -> reference"),
+                      ("reference_to_part", f"reference -> {label}")):
+        s = result[key]
+        print(f"  {name:<32} mean {s['mean']:6.3f}  p95 {s['p95']:6.3f}  max {s['max']:6.3f} mm")
+    s = result["symmetric"]
+    print(f"  {'symmetric':<32} mean {s['mean']:6.3f}  Hausdorff {s['max']:6.3f} mm")
+    heatmap = result["heatmap"]
+    rows, columns = heatmap.shape
+    print(f"  Mean deviation (mm) across the profile, {axis[across]} {lo[across]:.1f}..{hi[across]:.1f} "
+          f"left to right, {axis[up]} {hi[up]:.1f}..{lo[up]:.1f} top to bottom:")
+    for r in range(rows):
+        print("    " + " ".join("     -" if np.isnan(v) else f"{v:6.2f}" for v in heatmap[r]))
+
+
+def declared_reference(script, module, name):
+    """(reference path, max Hausdorff or None) from a generator's REFERENCES, or None."""
+    entry = getattr(module, "REFERENCES", {}).get(name)
+    if entry is None:
+        return None
+    path, tolerance = entry if isinstance(entry, tuple) else (entry, None)
+    return os.path.join(os.path.dirname(os.path.abspath(script)), path), tolerance
+
+
+def write_heatmap(path, mesh, reference):
+    """Export mesh with its vertices coloured by distance to reference (green 0 -> red max)."""
+    gaps = distances(np.asarray(mesh.vertices), reference,
+                     mesh.bounds.mean(axis=0) - reference["mesh"].bounds.mean(axis=0))
+    t = gaps / gaps.max() if gaps.max() > 0 else gaps
+    colors = np.column_stack([255 * t, 255 * (1 - t), np.zeros_like(t), np.full_like(t, 255)])
+    colored = trimesh.Trimesh(mesh.vertices, mesh.faces, vertex_colors=colors.astype(np.uint8),
+                              process=False)
+    colored.export(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure a part's deviation from a reference mesh.")
+    parser.add_argument("part", help="part name from a generator's PARTS, or a mesh file")
+    parser.add_argument("--reference", help="reference mesh (default: the generator's REFERENCES)")
+    parser.add_argument("--samples", type=int, default=SAMPLES, help="points per surface")
+    parser.add_argument("--heatmap", help="write the part coloured by deviation (e.g. .ply)")
+    args = parser.parse_args(argv)
+
+    reference_path = args.reference
+    if os.path.exists(args.part):
+        mesh = readers.load(args.part)
+    else:
+        from . import cache
+        from .build import discover_parts, load_generator
+        scripts = {name: path for path, name in discover_parts()}
+        if args.part not in scripts:
+            parser.error(f"{args.part!r} is neither a file nor a part "
+                         f"(expected one of {', '.join(sorted(scripts))})")
+        with contextlib.redirect_stdout(io.StringIO()):
+            module = load_generator(scripts[args.part])
+            mesh = cache.cached_part(module.PARTS[args.part])
+        declared = declared_reference(scripts[args.part], module, args.part)
+        if reference_path is None and declared:
+            reference_path = declared[0]
+    if reference_path is None:
+        parser.error(f"no reference for {args.part}: pass --reference")
+
+    start = time.perf_counter()
+    reference = reference_surface(reference_path, args.samples)
+    print(f"Reference {os.path.basename(reference_path)}: {len(reference['mesh'].faces)} faces, "
+          f"sampled in {(time.perf_counter() - start) * 1000:.0f} ms")
+    result = compare(mesh, reference, args.samples)
+    print_report(result, os.path.basename(args.part), os.path.basename(reference_path))
+    if args.heatmap:
+        write_heatmap(args.heatmap, mesh, reference)
+        print(f"Heat map: {args.heatmap}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
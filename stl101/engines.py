@@ -0,0 +1,191 @@
+"""
+Boolean engine registry
+
+Every engine that can run a mesh boolean is registered here with one
+function per operation (union / difference / intersection, each taking a
+list of trimeshes; difference subtracts the rest from the first). The
+engines are probed once - a two-box union and difference - and the result
+is kept for the process and in CACHE_DIR/engines.json, so a missing or
+broken engine (e.g. blender, which runs as a subprocess) is never launched
+per call.
+
+run() sends each operation to the fastest working engine and moves on to
+the next one if it raises. Every operation is recorded - engine, time and
+any fallback that fired - and print_report() summarises them per build.
+"""
+
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import trimesh
+
+from . import cache
+
+# name -> {"union": fn, "difference": fn, "intersection": fn, "binary": executable or None}
+ENGINES = {}
+
+# One dict per operation since the last reset_report()
+REPORT = []
+
+_probe = None
+
+
+class EngineError(RuntimeError):
+    """No registered engine could run an operation."""
+
+
+def register(name, union, difference, intersection, binary=None):
+    """Add an engine. binary names an executable it needs on PATH (probed without launching)."""
+    global _probe
+    ENGINES[name] = {"union": union, "difference": difference,
+                     "intersection": intersection, "binary": binary}
+    _probe = None
+
+
+def _blender(operation):
+    return lambda meshes: getattr(trimesh.boolean, operation)(meshes, engine="blender")
+
+
+register("blender", _blender("union"), _blender("difference"), _blender("intersection"),
+         binary="blender")
+
+
+# ============================================
+# Probe
+# ============================================
+
+def _probe_key():
+    """Probe results stay valid while the engines and their binaries don't change."""
+    binaries = {name: shutil.which(e["binary"]) for name, e in ENGINES.items() if e["binary"]}
+    return cache.make_key("engines", sorted(ENGINES), sorted(binaries.items()), trimesh.__version__)
+
+
+def _probe_engine(engine):
+    """Time a tiny union + difference; returns (seconds, error or None)."""
+    if engine["binary"] and not shutil.which(engine["binary"]):
+        return None, f"{engine['binary']} not on PATH"
+    a = trimesh.creation.box(extents=(2, 2, 2))
+    b = trimesh.creation.box(extents=(2, 2, 2)).apply_translation((1, 1, 1))
+    start = time.perf_counter()
+    try:
+        union = engine["union"]([a, b])
+        difference = engine["difference"]([a, b])
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    if not np.isclose(union.volume, 15) or not np.isclose(difference.volume, 7):
+        return None, "wrong result on the probe boxes"
+    return time.perf_counter() - start, None
+
+
+def probe():
+    """
+    {engine: {"ok": bool, "time": seconds, "error": str}} for every engine,
+    measured once per process and reused from disk when nothing changed.
+    """
+    global _probe
+    if _probe is not None:
+        return _probe
+    path = os.path.join(cache.CACHE_DIR, "engines.json")
+    key = _probe_key()
+    if cache.ENABLED and os.path.exists(path):
+        try:
+            with open(path) as f:
+                stored = json.load(f)
+            if stored.get("key") == key:
+                _probe = stored["engines"]
+                return _probe
+        except (OSError, ValueError):
+            pass
+
+    _probe = {}
+    for name, engine in ENGINES.items():
+        seconds, error = _probe_engine(engine)
+        _probe[name] = {"ok": error is None, "time": seconds, "error": error}
+    if cache.ENABLED:
+        os.makedirs(cache.CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"key": key, "engines": _probe}, f, indent=2)
+        os.replace(tmp, path)
+    return _probe
+
+
+def available():
+    """Working engine names, fastest first."""
+    results = probe()
+    return sorted((name for name in results if results[name]["ok"]),
+                  key=lambda name: results[name]["time"])
+
+
+def describe():
+    """One line listing every engine and its probe result."""
+    results = probe()
+    return ", ".join(
+        f"{name} ({r['time'] * 1000:.1f} ms)" if r["ok"] else f"{name} unavailable: {r['error']}"
+        for name, r in results.items())
+
+
+# ============================================
+# Routing and report
+# ============================================
+
+def record(operation, label, engine, seconds, fallbacks=()):
+    """Add one operation to the build report."""
+    REPORT.append({"op": operation, "label": label, "engine": engine,
+                   "time": seconds, "fallbacks": list(fallbacks)})
+
+
+def run(operation, meshes, label="parts", last_resort=None):
+    """
+    Run operation on the fastest working engine, falling back in speed order.
+
+    If every engine fails, last_resort() is used (and reported) when given,
+    otherwise EngineError is raised.
+    """
+    fallbacks = []
+    for name in available():
+        start = time.perf_counter()
+        try:
+            result = ENGINES[name][operation](meshes)
+        except Exception as e:
+            fallbacks.append((name, f"{type(e).__name__}: {e}"))
+            continue
+        record(operation, label, name, time.perf_counter() - start, fallbacks)
+        return result
+    if last_resort is None:
+        raise EngineError(f"no engine could {operation} {label}: {fallbacks}")
+    start = time.perf_counter()
+    result = last_resort()
+    record(operation, label, last_resort.__name__, time.perf_counter() - start, fallbacks)
+    return result
+
+
+def reset_report():
+    REPORT.clear()
+
+
+def summarize(records):
+    """Per-engine operation count and time, plus every fallback that fired."""
+    engines = {}
+    for r in records:
+        count, seconds = engines.get(r["engine"], (0, 0.0))
+        engines[r["engine"]] = (count + 1, seconds + r["time"])
+    fallbacks = [(r["op"], r["label"], name, error)
+                 for r in records for name, error in r["fallbacks"]]
+    return engines, fallbacks
+
+
+def print_report(records=None):
+    """Print which engines ran this build's booleans and any fallbacks."""
+    records = REPORT if records is None else records
+    if not records:
+        return
+    engines, fallbacks = summarize(records)
+    usage = ", ".join(f"{name} {count} ops ({seconds * 1000:.1f} ms)"
+                      for name, (count, seconds) in engines.items())
+    print(f"Boolean engines: {usage}")
+    for operation, label, name, error in fallbacks:
+        print(f"  Fallback: {operation} of {label} failed on {name}: {error}")
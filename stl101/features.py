@@ -0,0 +1,212 @@
+"""
+Feature graphs for incremental rebuilds
+
+A generator declares its part as named features. Each feature is a function
+whose arguments name the features it depends on; the module parameters it
+reads are found from its bytecode (and from module helpers it calls):
+
+    graph = FeatureGraph(globals())
+
+    @graph.feature
+    def back_plate():
+        return create_box(BRACKET_WIDTH, ...)            # reads BRACKET_WIDTH
+
+    @graph.feature(store=True)
+    def bracket(back_plate, front_plate):                 # depends on two features
+        return evaluate(Union(back_plate, front_plate), "bracket")
+
+    mesh = graph.build("bracket")
+
+A feature's key hashes its source and that of the module helpers it calls,
+the values of the parameters it reads and its dependencies' keys, so changing SCREW_HOLE_DIAMETER only invalidates
+the features that read it and everything downstream. Results are memoized
+in-process (MEMO survives re-running the generator module, e.g. in watch
+mode) and, for store=True features returning a trimesh, in the disk cache
+(whose key adds the stl101 sources and cache.build_settings()).
+print_graph() shows what was rebuilt and which parameter changes caused it.
+"""
+
+import hashlib
+import inspect
+import time
+import types
+
+import trimesh
+
+from . import cache
+
+# Feature key -> result, shared by every graph in the process
+MEMO = {}
+
+# (module, feature) -> parameter values at its last build, to explain rebuilds
+_LAST_PARAMS = {}
+
+
+def _global_names(code):
+    """Global names read by a code object and the functions nested in it."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _global_names(const)
+    return names
+
+
+class Feature:
+    """One named step of a part: a function, its dependencies and parameters."""
+
+    def __init__(self, func, store):
+        self.name = func.__name__
+        self.func = func
+        self.store = store
+        self.deps = list(inspect.signature(func).parameters)
+        self.source = inspect.getsource(func)
+
+
+class FeatureGraph:
+    """The features of one generator module, built on demand with memoization."""
+
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self.features = {}
+        self.status = {}       # feature -> "built" / "memory" / "disk" in the last build
+        self.reasons = {}      # feature -> why it was rebuilt
+        self.times = {}        # feature -> seconds spent in the last build
+
+    def feature(self, func=None, *, store=False):
+        """Decorator registering a feature; store=True also caches its mesh on disk."""
+        def register(func):
+            self.features[func.__name__] = Feature(func, store)
+            return func
+        return register(func) if func is not None else register
+
+    # ============================================
+    # Dependencies
+    # ============================================
+
+    def _reach(self, name, _seen=None):
+        """(parameters, helper functions) a feature or module helper reads, recursively."""
+        seen = _seen if _seen is not None else set()
+        func = self.features[name].func if name in self.features else self.namespace[name]
+        params, helpers = set(), set()
+        module_params = cache.module_parameters(self.namespace)
+        for global_name in _global_names(func.__code__):
+            if global_name in module_params:
+                params.add(global_name)
+            elif global_name not in seen and global_name not in self.features:
+                value = self.namespace.get(global_name)
+                if (isinstance(value, types.FunctionType)
+                        and value.__module__ == self.namespace.get("__name__")):
+                    seen.add(global_name)
+                    helpers.add(global_name)
+                    more_params, more_helpers = self._reach(global_name, seen)
+                    params |= more_params
+                    helpers |= more_helpers
+        return params, helpers
+
+    def parameters(self, name):
+        """Sorted module parameters a feature reads, including through module helpers."""
+        return sorted(self._reach(name)[0])
+
+    def helpers(self, name):
+        """Sorted module helper functions a feature calls, directly or through other helpers."""
+        return sorted(self._reach(name)[1])
+
+    def key(self, name, _keys=None):
+        """Content key: feature and helper sources, parameter values, dependency keys."""
+        keys = _keys if _keys is not None else {}
+        if name not in keys:
+            feature = self.features[name]
+            digest = hashlib.sha1(cache.make_key("feature", name, feature.source).encode())
+            # A helper such as screw_positions() is part of the feature's code
+            for helper in self.helpers(name):
+                digest.update(inspect.getsource(self.namespace[helper]).encode())
+            for param in self.parameters(name):
+                digest.update(f"{param}={self.namespace[param]!r};".encode())
+            for dep in feature.deps:
+                digest.update(self.key(dep, keys).encode())
+            keys[name] = digest.hexdigest()
+        return keys[name]
+
+    # ============================================
+    # Build
+    # ============================================
+
+    def build(self, name):
+        """
+        Return the feature's result, recomputing only invalidated features.
+        A mesh comes back as a copy, so callers may repair it (fill_holes etc.)
+        without changing what MEMO hands the next build.
+        """
+        self.status, self.reasons, self.times = {}, {}, {}
+        keys = {}
+        digest = cache.package_digest()
+        settings = cache.build_settings()
+        results = {}
+
+        def visit(current):
+            if current in results:
+                return results[current]
+            feature = self.features[current]
+            key = self.key(current, keys)
+            disk_key = cache.make_key(key, digest, settings) if feature.store else None
+            params = {p: self.namespace[p] for p in self.parameters(current)}
+            start = time.perf_counter()
+            # Dependencies are only visited on a miss: a hit skips the whole subtree
+            if key in MEMO:
+                result, self.status[current] = MEMO[key], "memory"
+            else:
+                result = cache.load(disk_key) if disk_key else None
+                if result is not None:
+                    self.status[current] = "disk"
+                else:
+                    args = [visit(dep) for dep in feature.deps]
+                    start = time.perf_counter()
+                    result = feature.func(*args)
+                    self.status[current] = "built"
+                    if isinstance(result, trimesh.Trimesh):
+                        cache.store(disk_key, result)
+                MEMO[key] = result
+                self.reasons[current] = self._reasons(current, params)
+            _LAST_PARAMS[self.namespace.get("__name__"), current] = params
+            self.times[current] = time.perf_counter() - start
+            results[current] = result
+            return result
+
+        result = visit(name)
+        return result.copy() if isinstance(result, trimesh.Trimesh) else result
+
+    def _reasons(self, name, params):
+        previous = _LAST_PARAMS.get((self.namespace.get("__name__"), name))
+        if previous is None:
+            return []
+        reasons = [f"{p}: {previous.get(p)!r} -> {v!r}" for p, v in params.items()
+                   if previous.get(p) != v]
+        reasons += [f"{dep} changed" for dep in self.features[name].deps
+                    if self.status.get(dep) == "built"]
+        return reasons or ["source changed"]
+
+    def print_graph(self, name):
+        """Print the feature tree under name with what the last build did."""
+        marks = {"built": "*", "memory": ".", "disk": "d"}
+        print(f"Feature graph ({len(self.status)} of {len(self.features)} features visited; "
+              f"* rebuilt, . memoized, d from disk cache):")
+
+        def show(current, depth, seen):
+            status = self.status.get(current, "")
+            line = f"  {marks.get(status, ' ')} {'  ' * depth}{current}"
+            if status:
+                line += f"  [{self.times[current] * 1000:.1f} ms]"
+            params = self.parameters(current)
+            if params:
+                line += f"  reads {', '.join(params)}"
+            print(line)
+            if status == "built":
+                for reason in self.reasons.get(current, []):
+                    print(f"    {'  ' * depth}invalidated: {reason}")
+            if current in seen:
+                return
+            seen.add(current)
+            for dep in self.features[current].deps:
+                show(dep, depth + 1, seen)
+
+        show(name, 0, set())
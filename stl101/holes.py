@@ -0,0 +1,120 @@
+"""
+Hole patterns - every screw hole of a part as one cutter
+
+Each hole is a single solid (a stepped or coned solid of revolution, or an
+extruded teardrop) instead of a shaft unioned with a head, and all of a
+pattern's holes are copies of it in one mesh (kernel.pattern). drill()
+returns Difference(body, cutter), which the CSG optimizer folds into the
+part's other subtractions - one boolean for every hole, however many.
+
+Kinds (diameter is the shaft, head_diameter the head):
+
+- through:      plain cylinder
+- counterbore:  flat-bottomed head, head_depth deep
+- countersink:  cone from the shaft out to head_diameter (angle included,
+                90 degrees by default), plus head_depth of straight
+                clearance beyond it
+- teardrop:     horizontal hole (axis "x" or "y") with a 45 degree roof, so
+                it prints without support
+
+The hole starts at each position and runs depth along +axis; the head is at
+the far end unless head="start". Side counts follow kernel.CHORD_TOLERANCE.
+
+    cutter = hole_pattern([(20, 10), (130, 10)], 4.5, 5, z=-1,
+                          kind="countersink", head_diameter=9)
+    part = evaluate(drill(body, [(20, 10), (130, 10)], 4.5, 5, z=-1, kind="through"))
+"""
+
+import math
+
+import numpy as np
+import trimesh
+from shapely.geometry import Polygon
+
+from . import kernel
+from .csg import Difference
+
+KINDS = ("through", "counterbore", "countersink", "teardrop")
+
+# Local hole axis (+Z) -> world axis; teardrops keep their roof pointing up (+Z)
+_AXES = {
+    "z": np.eye(3),
+    "x": np.array([[0.0, 0.0, 1.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]),
+    "y": np.array([[-1.0, 0.0, 0.0], [0.0, 0.0, 1.0], [0.0, 1.0, 0.0]]),
+}
+
+
+def _profile(diameter, depth, kind, head_diameter, head_depth, angle):
+    """(radius, z) outline of a hole from z=0 to z=depth, head at the top."""
+    r = diameter / 2
+    if kind == "through":
+        return [(0, 0), (r, 0), (r, depth), (0, depth)]
+    if head_diameter is None or head_diameter <= diameter:
+        raise ValueError(f"{kind} hole needs head_diameter > diameter ({diameter})")
+    head_r = head_diameter / 2
+    if kind == "counterbore":
+        if not 0 < head_depth < depth:
+            raise ValueError(f"counterbore head_depth must be between 0 and depth ({depth})")
+        step = depth - head_depth
+        return [(0, 0), (r, 0), (r, step), (head_r, step), (head_r, depth), (0, depth)]
+    # Countersink: cone of the given included angle, then straight clearance
+    cone = (head_r - r) / math.tan(math.radians(angle) / 2)
+    cone_top = depth - (head_depth or 0)
+    if cone >= cone_top:
+        raise ValueError(f"countersink cone ({cone:.2f} mm) does not fit in depth {depth}")
+    profile = [(0, 0), (r, 0), (r, cone_top - cone), (head_r, cone_top)]
+    if head_depth:
+        profile.append((head_r, depth))
+    return profile + [(0, depth)]
+
+
+def _teardrop(diameter, depth):
+    """Extruded teardrop along +Z: circle with a 45 degree roof toward +Y."""
+    r = diameter / 2
+    sides = kernel._segments(r, None)
+    # The arc below the two 45 degree tangent points, then the roof apex
+    angles = np.linspace(math.pi / 4, -5 * math.pi / 4, sides // 4 * 3 + 1)
+    outline = np.column_stack([r * np.cos(angles), r * np.sin(angles)])
+    outline = np.vstack([outline, [0.0, r * math.sqrt(2)]])
+    mesh = trimesh.creation.extrude_polygon(Polygon(outline), height=depth)
+    return kernel._tagged(mesh, r, sides)
+
+
+def hole(diameter, depth, kind="through", head_diameter=None, head_depth=0.0,
+         angle=90.0, head="end", axis="z"):
+    """One hole solid starting at the origin, running depth along +axis."""
+    if kind not in KINDS:
+        raise ValueError(f"Unknown hole kind {kind!r} (expected one of {', '.join(KINDS)})")
+    if axis not in _AXES:
+        raise ValueError(f"Unknown hole axis {axis!r}")
+    if kind == "teardrop":
+        if axis == "z":
+            raise ValueError("teardrop holes are for horizontal holes (axis 'x' or 'y')")
+        mesh = _teardrop(diameter, depth)
+    else:
+        profile = np.array(_profile(diameter, depth, kind, head_diameter, head_depth, angle),
+                           dtype=np.float64)
+        if head == "start":
+            profile[:, 1] = depth - profile[:, 1]
+            profile = profile[::-1]
+        radius = profile[:, 0].max()
+        sides = kernel._segments(radius, None)
+        mesh = kernel._tagged(trimesh.creation.revolve(profile, sections=sides), radius, sides)
+    mesh.vertices = mesh.vertices @ _AXES[axis].T
+    return mesh
+
+
+def hole_pattern(positions, diameter, depth, z=0.0, **spec):
+    """
+    Every hole of a pattern as one mesh. positions are (x, y) with the
+    start at height z, or full (x, y, z) start points; spec as for hole().
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    if positions.shape[1] == 2:
+        positions = np.column_stack([positions, np.full(len(positions), z)])
+    return kernel.pattern(hole(diameter, depth, **spec), positions)
+
+
+def drill(body, positions, diameter, depth, z=0.0, **spec):
+    """Difference node cutting every hole of the pattern from body."""
+    return Difference(body, hole_pattern(positions, diameter, depth, z, **spec))
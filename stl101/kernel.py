@@ -0,0 +1,199 @@
+"""
+Geometry kernel - placed primitives built from cached unit templates
+
+create_box / create_cylinder used to be copy-pasted into every generator and
+rebuilt their mesh through trimesh.creation on every call. Here one unit box
+and one unit cylinder per section count are built once; each placed
+primitive is just a scale + offset of the cached vertex array. Repeated
+features (rib grids, clip rows, hole patterns) are built with pattern() /
+linear_pattern() / grid_pattern(): every copy of a seed mesh in one array,
+entering the CSG tree as one operand.
+
+Cylinders are tessellated to a chord tolerance instead of a fixed side
+count: each gets the fewest sides (a multiple of 4, so the bounding box is
+exact) that keep every facet within CHORD_TOLERANCE mm of the true circle.
+A 0.8 mm pin no longer gets the 32 sides of a 14 mm pillar. Set
+STL101_CHORD_TOLERANCE to your printer's resolution; print_report() shows
+the resulting triangle budget.
+
+In preview mode (STL101_PREVIEW=1 or python -m stl101.build --preview)
+cylinders get at most PREVIEW_SEGMENTS sides and csg.evaluate() skips its
+booleans - see csg.py.
+"""
+
+import math
+import os
+from functools import lru_cache
+
+import numpy as np
+import trimesh
+
+# Max distance (mm) between a circle and its polygon when the caller doesn't
+# ask for a side count
+CHORD_TOLERANCE = float(os.environ.get("STL101_CHORD_TOLERANCE", "0.05"))
+MIN_SEGMENTS = 8
+MAX_SEGMENTS = 256
+
+# Side count every cylinder had before CHORD_TOLERANCE, for the report
+FIXED_SEGMENTS = 32
+
+# (radius, sides) -> cylinders placed since the last reset_report()
+REPORT = {}
+
+PREVIEW = os.environ.get("STL101_PREVIEW", "") not in ("", "0")
+PREVIEW_SEGMENTS = 12
+
+
+@lru_cache(maxsize=None)
+def unit_box():
+    """Unit cube spanning [0, 1] on every axis. Returns (vertices, faces)."""
+    box = trimesh.creation.box(extents=[1.0, 1.0, 1.0])
+    vertices = np.array(box.vertices) + 0.5
+    faces = np.array(box.faces)
+    vertices.setflags(write=False)
+    faces.setflags(write=False)
+    return vertices, faces
+
+
+@lru_cache(maxsize=None)
+def unit_cylinder(segments):
+    """Radius 1 cylinder along Z from z=0 to z=1. Returns (vertices, faces)."""
+    cyl = trimesh.creation.cylinder(radius=1.0, height=1.0, sections=segments)
+    vertices = np.array(cyl.vertices) + [0.0, 0.0, 0.5]
+    faces = np.array(cyl.faces)
+    vertices.setflags(write=False)
+    faces.setflags(write=False)
+    return vertices, faces
+
+
+def segments_for(radius, tolerance=None):
+    """Fewest sides (a multiple of 4) keeping a circle's facets within tolerance."""
+    tolerance = CHORD_TOLERANCE if tolerance is None else tolerance
+    if radius <= tolerance:
+        return MIN_SEGMENTS
+    # A side spanning angle a deviates r * (1 - cos(a / 2)) from the arc
+    sides = math.pi / math.acos(1 - tolerance / radius)
+    return int(min(max(4 * math.ceil(sides / 4), MIN_SEGMENTS), MAX_SEGMENTS))
+
+
+def _segments(radius, segments):
+    segments = segments or segments_for(radius)
+    if PREVIEW:
+        segments = min(segments, PREVIEW_SEGMENTS)
+    key = (round(float(radius), 3), segments)
+    REPORT[key] = REPORT.get(key, 0) + 1
+    return segments
+
+
+def _tagged(mesh, radius, segments):
+    """Record which REPORT entry mesh is, so pattern() can count its copies."""
+    mesh.metadata["cylinders"] = {(round(float(radius), 3), segments): 1}
+    return mesh
+
+
+def reset_report():
+    REPORT.clear()
+
+
+def print_report(report=None):
+    """Print the cylinders' side counts and triangle budget for this build."""
+    report = REPORT if report is None else report
+    if not report:
+        return
+    cylinders = sum(report.values())
+    # A cylinder of n sides has 2n side and 2n cap triangles
+    triangles = sum(4 * sides * count for (_, sides), count in report.items())
+    fixed = 4 * FIXED_SEGMENTS * cylinders
+    print(f"Tessellation (chord tolerance {CHORD_TOLERANCE} mm): {cylinders} cylinders, "
+          f"{triangles} triangles (fixed {FIXED_SEGMENTS} sides: {fixed})")
+    for (radius, sides), count in sorted(report.items()):
+        print(f"  r={radius:g} mm: {sides} sides x {count}")
+
+
+def place(template, scale, offset):
+    """Build a mesh from a cached template: vertices * scale + offset."""
+    vertices, faces = template
+    return trimesh.Trimesh(vertices=vertices * scale + offset, faces=faces.copy(), process=False)
+
+
+def create_box(width, height, depth, x=0, y=0, z=0):
+    """Create a box mesh with its minimum corner at (x, y, z)."""
+    return place(unit_box(), [width, height, depth], [x, y, z])
+
+
+def create_cylinder(radius, height, x=0, y=0, z=0, segments=None):
+    """Create a Z-aligned cylinder centered on (x, y), base at z."""
+    segments = _segments(radius, segments)
+    return _tagged(place(unit_cylinder(segments), [radius, radius, height], [x, y, z]),
+                   radius, segments)
+
+
+def create_cylinder_x(radius, length, x=0, y=0, z=0, segments=None):
+    """Create an X-aligned cylinder starting at x, axis through (y, z)."""
+    segments = _segments(radius, segments)
+    vertices, faces = unit_cylinder(segments)
+    # Rotate +90deg about Y: template (x, y, z) -> (z, y, -x)
+    placed = np.column_stack([
+        vertices[:, 2] * length + x,
+        vertices[:, 1] * radius + y,
+        -vertices[:, 0] * radius + z,
+    ])
+    return _tagged(trimesh.Trimesh(vertices=placed, faces=faces.copy(), process=False),
+                   radius, segments)
+
+
+def create_boxes(sizes, origins):
+    """
+    Many axis-aligned boxes as one mesh, built in a single allocation.
+
+    sizes and origins are (N, 3) arrays (either may be a single row shared by
+    every box). The boxes must not overlap each other - the result is one
+    mesh with N separate shells, which is only a valid solid if they are
+    disjoint.
+    """
+    sizes, origins = np.broadcast_arrays(
+        np.asarray(sizes, dtype=np.float64).reshape(-1, 3),
+        np.asarray(origins, dtype=np.float64).reshape(-1, 3))
+    vertices, faces = unit_box()
+    placed = vertices[None, :, :] * sizes[:, None, :] + origins[:, None, :]
+    offsets = np.arange(len(sizes))[:, None, None] * len(vertices)
+    return trimesh.Trimesh(vertices=placed.reshape(-1, 3),
+                           faces=(faces[None, :, :] + offsets).reshape(-1, 3), process=False)
+
+
+def pattern(seed, offsets):
+    """
+    Copies of a mesh moved by each row of offsets (N, 3), as one mesh built
+    in a single allocation. The copies enter a CSG tree as one operand, so
+    the boolean cost barely depends on N. Like create_boxes, copies must
+    not overlap each other (the result is N separate shells).
+    """
+    offsets = np.asarray(offsets, dtype=np.float64).reshape(-1, 3)
+    vertices = np.asarray(seed.vertices)
+    faces = np.asarray(seed.faces)
+    placed = vertices[None, :, :] + offsets[:, None, :]
+    shifts = np.arange(len(offsets))[:, None, None] * len(vertices)
+    mesh = trimesh.Trimesh(vertices=placed.reshape(-1, 3),
+                           faces=(faces[None, :, :] + shifts).reshape(-1, 3), process=False)
+    # The seed's cylinders were counted once; count the other copies too
+    cylinders = seed.metadata.get("cylinders", {})
+    for key, count in cylinders.items():
+        REPORT[key] = REPORT.get(key, 0) + count * (len(offsets) - 1)
+    mesh.metadata["cylinders"] = {key: count * len(offsets) for key, count in cylinders.items()}
+    return mesh
+
+
+def linear_pattern(seed, count, pitch):
+    """count copies of seed, each one pitch (x, y, z) further along - one mesh."""
+    return pattern(seed, np.arange(count)[:, None] * np.asarray(pitch, dtype=np.float64))
+
+
+def grid_pattern(seed, counts, pitches):
+    """
+    counts = (nx, ny[, nz]) copies of seed spaced pitches = (px, py[, pz])
+    apart along X, Y (and Z) - one mesh.
+    """
+    steps = [np.arange(n) * p for n, p in zip(counts, pitches)]
+    steps += [np.zeros(1)] * (3 - len(steps))
+    offsets = np.stack(np.meshgrid(*steps, indexing="ij"), axis=-1)
+    return pattern(seed, offsets)
@@ -0,0 +1,153 @@
+"""
+Build-plate nesting - pack built parts onto as many beds as they need
+
+1. footprint: the part's vertices projected onto the bed (XY) and reduced
+   to their convex hull. With rotation on, the hull's minimum-area
+   bounding rectangle (one candidate angle per hull edge, all evaluated
+   in one numpy pass) gives the angle the part is turned to; otherwise
+   the axis-aligned bounding box is used as is.
+2. packing: the footprint rectangles, largest first, go onto beds with a
+   skyline bottom-left packer - each is placed where its top edge ends up
+   lowest, trying both 90 degree orientations when rotation is on. A part
+   that fits no open bed starts a new one.
+
+Identical parts (the same mesh object placed several times) have their
+footprint computed once. Parts only turn about Z, so they keep the print
+orientation the generator gave them.
+
+    plates = nest([(mesh_a, 4), (mesh_b, 1)], bed=(256, 256))
+    # [[(part index, 4x4 transform), ...] per bed]
+"""
+
+import math
+
+import numpy as np
+from scipy.spatial import ConvexHull, QhullError
+
+BED_SIZE = (256.0, 256.0)  # mm, Bambu X1/P1 plate
+GAP = 5.0                  # mm between parts
+
+
+def footprint(mesh, rotate=True):
+    """
+    (angle, width, depth, corner): rotating the part by angle (radians,
+    about Z) gives a width x depth bounding rectangle whose min corner is
+    at corner (x, y).
+    """
+    points = np.unique(np.asarray(mesh.vertices)[:, :2], axis=0)
+    try:
+        points = points[ConvexHull(points).vertices]
+    except QhullError:
+        pass  # flat or degenerate outline: use every point
+    angles = np.array([0.0])
+    if rotate and len(points) > 2:
+        edges = np.roll(points, -1, axis=0) - points
+        angles = np.unique(np.round(-np.arctan2(edges[:, 1], edges[:, 0]) % (math.pi / 2), 9))
+    # Every candidate angle's rotated hull at once: (angles, points)
+    cos, sin = np.cos(angles)[:, None], np.sin(angles)[:, None]
+    xs = cos * points[:, 0] - sin * points[:, 1]
+    ys = sin * points[:, 0] + cos * points[:, 1]
+    lo = np.stack([xs.min(axis=1), ys.min(axis=1)], axis=1)
+    size = np.stack([xs.max(axis=1), ys.max(axis=1)], axis=1) - lo
+    best = int(np.argmin(size[:, 0] * size[:, 1] + 1e-9 * angles))  # ties: smallest angle
+    return float(angles[best]), float(size[best, 0]), float(size[best, 1]), lo[best]
+
+
+class _Skyline:
+    """One bed: the top edge of the packed area as (x, y, width) segments."""
+
+    def __init__(self, width, depth):
+        self.width, self.depth = width, depth
+        self.segments = [(0.0, 0.0, width)]
+
+    def find(self, w, d):
+        """Lowest (top, x, index) spot for a w x d rectangle, or None."""
+        best = None
+        for i, (x, _, _) in enumerate(self.segments):
+            if x + w > self.width + 1e-9:
+                break
+            # Resting height: the highest segment under [x, x + w)
+            y, j, reach = 0.0, i, x
+            while reach < x + w - 1e-9:
+                y = max(y, self.segments[j][1])
+                reach += self.segments[j][2]
+                j += 1
+            if y + d <= self.depth + 1e-9 and (best is None or (y + d, x) < best[:2]):
+                best = (y + d, x, i)
+        return best
+
+    def place(self, index, w, top):
+        """Raise the skyline to top over [x, x + w) starting at segment index."""
+        x = self.segments[index][0]
+        right = x + w
+        kept = self.segments[:index] + [(x, top, w)]
+        for sx, sy, sw in self.segments[index:]:
+            if sx + sw > right + 1e-9:
+                start = max(sx, right)
+                kept.append((start, sy, sx + sw - start))
+        merged = [kept[0]]
+        for sx, sy, sw in kept[1:]:
+            px, py, pw = merged[-1]
+            if abs(py - sy) < 1e-9:
+                merged[-1] = (px, py, pw + sw)
+            else:
+                merged.append((sx, sy, sw))
+        self.segments = merged
+        return x
+
+
+def _transform(angle, corner, z_min, x, y):
+    """Rotate about Z by angle, then move the footprint corner to (x, y) on z=0."""
+    cos, sin = math.cos(angle), math.sin(angle)
+    matrix = np.eye(4)
+    matrix[:2, :2] = [[cos, -sin], [sin, cos]]
+    matrix[:3, 3] = [x - corner[0], y - corner[1], -z_min]
+    return matrix
+
+
+def nest(parts, bed=BED_SIZE, gap=GAP, rotate=True):
+    """
+    Pack copies of parts onto beds.
+
+    parts: [(mesh, count), ...]. Returns one list per bed of
+    (part index, 4x4 transform) placing a copy on that bed, gap apart and
+    inside [0, bed]. Raises ValueError for a part larger than the bed.
+    """
+    footprints = {}
+    items = []
+    for index, (mesh, count) in enumerate(parts):
+        if id(mesh) not in footprints:
+            footprints[id(mesh)] = footprint(mesh, rotate)
+        angle, w, d, corner = footprints[id(mesh)]
+        if not (w <= bed[0] and d <= bed[1]) and not (rotate and d <= bed[0] and w <= bed[1]):
+            raise ValueError(f"part {index} ({w:.1f} x {d:.1f} mm) does not fit on a "
+                             f"{bed[0]:g} x {bed[1]:g} mm bed")
+        items += [(index, angle, w, d, corner, mesh.bounds[0][2])] * count
+
+    # Largest first: long sides, then area
+    items.sort(key=lambda item: (-max(item[2], item[3]), -item[2] * item[3]))
+    # Beds padded by gap, so rectangles padded by gap keep gap between parts
+    beds, plates = [], []
+    for index, angle, w, d, corner, z_min in items:
+        orientations = [(angle, w, d, corner)]
+        if rotate and abs(w - d) > 1e-9:
+            # Quarter turn: (x, y) -> (-y, x), so the new corner is (-(corner y + d), corner x)
+            orientations.append((angle + math.pi / 2, d, w, (-(corner[1] + d), corner[0])))
+        for bed_index in range(len(beds) + 1):
+            if bed_index == len(beds):
+                beds.append(_Skyline(bed[0] + gap, bed[1] + gap))
+                plates.append([])
+            spots = []
+            for turned_angle, ow, od, turned_corner in orientations:
+                spot = beds[bed_index].find(ow + gap, od + gap)
+                if spot is not None:
+                    spots.append((spot, turned_angle, ow, od, turned_corner))
+            if spots:
+                (top, _, segment), turned_angle, ow, od, turned_corner = min(
+                    spots, key=lambda s: s[0][:2])
+                x = beds[bed_index].place(segment, ow + gap, top)
+                y = top - od - gap
+                plates[bed_index].append(
+                    (index, _transform(turned_angle, turned_corner, z_min, x, y)))
+                break
+    return plates
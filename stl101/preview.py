@@ -0,0 +1,203 @@
+"""
+Live preview server
+
+Serves a three.js viewer (preview.html, the live version of
+view_reference.html) and keeps it in sync with the generators:
+
+- every watched generator is built once at start, then rebuilt in this
+  warm process whenever it is saved (stl101.watch)
+- each part is encoded as a compact GLB (stl101.glb: 16-bit quantized
+  positions, indexed triangles - several times smaller than STL)
+- open viewers are notified over Server-Sent Events (/events) and fetch
+  the new /parts/<name>.glb; every part stays open side by side
+
+Usage:
+    python -m stl101.preview                                  # all generators
+    python -m stl101.preview rain101/generate_mount.py "UNDERDESK ORGANIZER/generate_wire_duct.py"
+    python -m stl101.preview --port 8101 --host 0.0.0.0
+    STL101_PREVIEW=1 python -m stl101.preview     # draft: no booleans, cutters as overlays
+
+Then open http://127.0.0.1:8101/ and save a generator.
+"""
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+from .watch import poll, print_stages, rebuild, warm_up  # first: it times the heavy imports
+from . import glb
+from .build import REPO_DIR, find_generators
+
+VIEWER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "preview.html")
+
+# Seconds between SSE keep-alive comments (stops proxies closing the stream)
+KEEPALIVE = 15
+
+
+class PreviewState:
+    """Latest GLB of every part, and a queue per connected viewer."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.parts = {}
+        self.clients = []
+
+    def _broadcast(self, event):
+        with self.lock:
+            for client in self.clients:
+                client.put(event)
+        return len(self.clients)
+
+    def publish(self, name, mesh, script, build_time, changed_at):
+        """Encode a rebuilt part and tell every viewer; returns the part summary."""
+        start = time.perf_counter()
+        data = glb.part_glb(mesh, name)
+        size = mesh.bounds[1] - mesh.bounds[0]
+        with self.lock:
+            version = self.parts.get(name, {}).get("version", 0) + 1
+            self.parts[name] = {
+                "type": "part", "name": name, "script": script, "version": version,
+                "faces": len(mesh.faces), "size": [round(float(s), 2) for s in size],
+                "glb_bytes": len(data), "stl_bytes": glb.stl_size(mesh),
+                "build_ms": round(build_time * 1000, 1),
+                "encode_ms": round((time.perf_counter() - start) * 1000, 1),
+                "changed_at": changed_at, "glb": data,
+            }
+            summary = {k: v for k, v in self.parts[name].items() if k != "glb"}
+        summary["viewers"] = self._broadcast(summary)
+        return summary
+
+    def publish_error(self, script, error):
+        self._broadcast({"type": "error", "script": script, "error": error})
+
+    def glb(self, name):
+        with self.lock:
+            part = self.parts.get(name)
+            return part and part["glb"]
+
+    def subscribe(self):
+        """New viewer queue, pre-filled with every part built so far."""
+        client = queue.Queue()
+        with self.lock:
+            for part in self.parts.values():
+                client.put({k: v for k, v in part.items() if k != "glb"})
+            self.clients.append(client)
+        return client
+
+    def unsubscribe(self, client):
+        with self.lock:
+            self.clients.remove(client)
+
+
+class PreviewHandler(BaseHTTPRequestHandler):
+    """GET / (viewer), /events (SSE), /parts (JSON list), /parts/<name>.glb."""
+
+    def do_GET(self):
+        path = unquote(urlparse(self.path).path)
+        state = self.server.state
+        if path in ("/", "/index.html"):
+            with open(VIEWER, "rb") as f:
+                self._send(200, "text/html; charset=utf-8", f.read())
+        elif path == "/events":
+            self._stream_events(state)
+        elif path == "/parts":
+            with state.lock:
+                parts = [{k: v for k, v in p.items() if k != "glb"} for p in state.parts.values()]
+            self._send(200, "application/json", json.dumps(parts).encode())
+        elif path.startswith("/parts/") and path.endswith(".glb"):
+            data = state.glb(path[len("/parts/"):-len(".glb")])
+            if data is None:
+                self._send(404, "text/plain", b"no such part")
+            else:
+                self._send(200, "model/gltf-binary", data)
+        else:
+            self._send(404, "text/plain", b"not found")
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_events(self, state):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        client = state.subscribe()
+        try:
+            while True:
+                try:
+                    event = client.get(timeout=KEEPALIVE)
+                    self.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+                except queue.Empty:
+                    self.wfile.write(b": keep-alive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            state.unsubscribe(client)
+
+    def log_message(self, format, *args):
+        pass  # the rebuild log is the interesting output
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a live 3D preview of the generators' parts.")
+    parser.add_argument("scripts", nargs="*", help="generator scripts to watch (default: all)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("-p", "--port", type=int, default=8101)
+    parser.add_argument("-i", "--interval", type=float, default=0.2, help="poll interval in seconds")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print each generator's log")
+    args = parser.parse_args(argv)
+
+    paths = [os.path.abspath(p) for p in args.scripts] or find_generators()
+    print_stages("Warm-up", warm_up())
+
+    state = PreviewState()
+    server = ThreadingHTTPServer((args.host, args.port), PreviewHandler)
+    server.daemon_threads = True
+    server.state = state
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def build(path):
+        script = os.path.relpath(path, REPO_DIR)
+        changed_at = time.time() * 1000
+        try:
+            stages, meshes = rebuild(path, None, args.verbose)
+        except Exception:
+            traceback.print_exc()
+            state.publish_error(script, traceback.format_exc(limit=3))
+            print(f"{script} failed - fix and save again")
+            return
+        for name, mesh in meshes.items():
+            part = state.publish(name, mesh, script, stages[f"build {name}"], changed_at)
+            print(f"  {name:<28} {part['faces']:>7} faces  build {part['build_ms']:7.1f} ms  "
+                  f"GLB {part['glb_bytes'] / 1024:6.1f} KB (STL {part['stl_bytes'] / 1024:6.1f} KB, "
+                  f"{part['stl_bytes'] / part['glb_bytes']:.1f}x smaller) -> {part['viewers']} viewer(s)")
+
+    print(f"Building {len(paths)} generator(s)...")
+    for path in paths:
+        build(path)
+    print(f"\nPreview at http://{args.host}:{args.port}/  - watching for saves (Ctrl+C to stop)")
+
+    def on_change(path):
+        print(f"\n[{time.strftime('%H:%M:%S')}] {os.path.relpath(path, REPO_DIR)} changed")
+        build(path)
+
+    poll(paths, args.interval, on_change)
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+Planar remeshing before export
+
+Booleans leave flat faces split into many triangles: every cut adds
+vertices, and the slivers stay behind even where the face is one flat
+rectangle. merge_coplanar() finds every planar region (trimesh facets:
+connected coplanar faces), follows its boundary loops and re-triangulates
+it without interior vertices (manifold3d.triangulate) - a region with V
+boundary vertices and H holes needs only V + 2H - 2 triangles. Vertices
+in the middle of a straight edge between two regions are dropped as well.
+
+Every other boundary vertex is kept, so neighbouring regions still share
+their edges and the mesh stays watertight. A region whose boundary is not
+a set of simple loops keeps its triangles, and the input is returned
+unchanged if the result would lose watertightness.
+
+cache.cached_part() runs this on every part, so generator exports, the
+parallel build and watch mode all write the merged mesh. For existing STLs:
+
+    python -m stl101.remesh "UNDERDESK ORGANIZER/new resized.stl" -o build/new_resized.stl
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import manifold3d
+import numpy as np
+import trimesh
+
+from . import readers
+
+ENABLED = os.environ.get("STL101_NO_REMESH", "") in ("", "0")
+VERBOSE = True
+
+# Relative tolerance for "a, v, b are on one line"
+COLLINEAR_TOLERANCE = 1e-9
+
+
+def _boundary_loops(faces):
+    """
+    Boundary loops (lists of vertex ids) of a connected, consistently wound
+    face set; None if the boundary touches itself at a vertex.
+    """
+    edges = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    n = int(edges.max()) + 1
+    forward = edges[:, 0] * n + edges[:, 1]
+    reverse = edges[:, 1] * n + edges[:, 0]
+    boundary = edges[~np.isin(forward, reverse)]
+
+    following = {}
+    for a, b in boundary.tolist():
+        if a in following:
+            return None
+        following[a] = b
+    loops = []
+    while following:
+        start = next(iter(following))
+        loop = [start]
+        vertex = following.pop(start)
+        while vertex != start:
+            if vertex not in following:
+                return None
+            loop.append(vertex)
+            vertex = following.pop(vertex)
+        loops.append(loop)
+    return loops
+
+
+def _cross(a, b):
+    """Row-wise cross product of (N, 3) arrays (np.cross is slow on tiny inputs)."""
+    return np.column_stack([a[..., 1] * b[..., 2] - a[..., 2] * b[..., 1],
+                            a[..., 2] * b[..., 0] - a[..., 0] * b[..., 2],
+                            a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]])
+
+
+def _plane_basis(normal):
+    """Two unit vectors (u, v) with u x v = normal, so outward loops project CCW."""
+    helper = np.array([1.0, 0.0, 0.0] if abs(normal[0]) < 0.9 else [0.0, 1.0, 0.0])
+    u = _cross(helper, normal)[0]
+    u /= np.linalg.norm(u)
+    return u, _cross(normal, u)[0]
+
+
+def _removable(vertices, faces, region_of, loops):
+    """
+    Vertices on a straight edge between exactly two re-triangulated regions,
+    with the same two neighbours in both, which can be dropped from both.
+    """
+    pairs = np.unique(np.column_stack([faces.ravel(), np.repeat(region_of, 3)]), axis=0)
+    two_regions = np.bincount(pairs[:, 0], minlength=len(vertices)) == 2
+
+    neighbours = {}
+    for region_loops in loops.values():
+        for loop in region_loops:
+            for i, vertex in enumerate(loop):
+                if two_regions[vertex]:
+                    pair = frozenset((loop[i - 1], loop[(i + 1) % len(loop)]))
+                    neighbours.setdefault(vertex, []).append(pair)
+
+    candidates = [(vertex, *found[0]) for vertex, found in neighbours.items()
+                  if len(found) == 2 and found[0] == found[1] and len(found[0]) == 2]
+    if not candidates:
+        return set()
+    candidates = np.array(candidates)
+    a, b = vertices[candidates[:, 1]], vertices[candidates[:, 2]]
+    along = b - a
+    offset = _cross(vertices[candidates[:, 0]] - a, along)
+    straight = ((offset ** 2).sum(axis=1)
+                <= COLLINEAR_TOLERANCE * (along ** 2).sum(axis=1) ** 2)
+    return set(candidates[straight, 0].tolist())
+
+
+def _triangulate(vertices, loops, normal):
+    """Triangles (global vertex ids) filling the loops; None if that fails."""
+    u, v = _plane_basis(normal)
+    ids = np.concatenate(loops)
+    polygons = [np.column_stack([vertices[loop] @ u, vertices[loop] @ v]) for loop in loops]
+    try:
+        triangles = manifold3d.triangulate(polygons)
+    except Exception:
+        return None
+    triangles = np.asarray(triangles).reshape(-1, 3)
+    if len(triangles) != len(ids) + 2 * (len(loops) - 1) - 2:
+        return None
+    # Triangulated area must match the polygon area (outer loop minus holes)
+    points = np.concatenate(polygons)
+    ab = points[triangles[:, 1]] - points[triangles[:, 0]]
+    ac = points[triangles[:, 2]] - points[triangles[:, 0]]
+    area = (ab[:, 0] * ac[:, 1] - ab[:, 1] * ac[:, 0]).sum() / 2
+    polygon_area = sum((p[:, 0] * np.roll(p[:, 1], -1) - np.roll(p[:, 0], -1) * p[:, 1]).sum() / 2
+                       for p in polygons)
+    if not np.isclose(area, polygon_area, rtol=1e-6, atol=1e-9):
+        return None
+    return ids[triangles]
+
+
+def _merge(mesh, drop_collinear):
+    """(new faces, regions re-triangulated), or None if any region failed."""
+    # Plain arrays: indexing trimesh's tracked arrays rehashes them every time
+    vertices = mesh.vertices.view(np.ndarray)
+    faces = mesh.faces.view(np.ndarray)
+    facets, normals = mesh.facets, mesh.facets_normal
+    region_of = np.arange(len(faces)) + len(facets)
+    for i, facet in enumerate(facets):
+        region_of[facet] = i
+
+    loops = {}
+    for i, facet in enumerate(facets):
+        region_loops = _boundary_loops(faces[facet])
+        if region_loops is not None:
+            loops[i] = region_loops
+
+    removable = _removable(vertices, faces, region_of, loops) if drop_collinear else set()
+    keep = np.ones(len(faces), dtype=bool)
+    new_faces = []
+    for i, region_loops in loops.items():
+        minimal = sum(map(len, region_loops)) + 2 * (len(region_loops) - 1) - 2
+        if len(facets[i]) == minimal and not any(v in removable for loop in region_loops for v in loop):
+            continue
+        region_loops = [[v for v in loop if v not in removable] for loop in region_loops]
+        triangles = None
+        if all(len(loop) >= 3 for loop in region_loops):
+            triangles = _triangulate(vertices, region_loops, normals[i])
+        if triangles is None:
+            if removable:
+                return None
+            continue
+        keep[facets[i]] = False
+        new_faces.append(triangles)
+    return np.concatenate([faces[keep]] + new_faces), len(new_faces)
+
+
+def merge_coplanar(mesh, label="part"):
+    """Return mesh with every planar region re-triangulated minimally."""
+    # Preview meshes are overlapping shells, not solids - leave them alone
+    if not ENABLED or not len(mesh.faces) or not mesh.metadata.get("printable", True):
+        return mesh
+    start = time.perf_counter()
+    merged = mesh.copy()
+    # A watertight mesh is already connected; merging would also fuse the
+    # separate vertices Manifold keeps where two bodies touch along an edge
+    if not mesh.is_watertight:
+        merged.merge_vertices()
+
+    result = _merge(merged, drop_collinear=True) or _merge(merged, drop_collinear=False)
+    faces, regions = result
+    remeshed = trimesh.Trimesh(vertices=merged.vertices, faces=faces, process=False)
+    remeshed.remove_unreferenced_vertices()
+    if mesh.is_watertight and not remeshed.is_watertight:
+        print(f"Warning: planar remesh of {label} broke watertightness, exporting it unmerged")
+        return mesh
+    if VERBOSE:
+        print(f"Planar remesh {label}: {len(mesh.faces)} -> {len(remeshed.faces)} triangles "
+              f"({regions} planar regions re-triangulated, {(time.perf_counter() - start) * 1000:.1f} ms)")
+    return remeshed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merge coplanar faces of STL, 3MF or OBJ files.")
+    parser.add_argument("paths", nargs="+", help="STL, 3MF or OBJ files to remesh")
+    parser.add_argument("-o", "--out", help="output file (one input) or directory")
+    args = parser.parse_args(argv)
+
+    for path in args.paths:
+        mesh = readers.load(path)
+        remeshed = merge_coplanar(mesh, os.path.basename(path))
+        if args.out is None:
+            out = os.path.splitext(path)[0] + "_remeshed.stl"
+        elif os.path.isdir(args.out):
+            out = os.path.join(args.out, os.path.basename(path))
+        else:
+            out = args.out
+        remeshed.export(out)
+        print(f"  {os.path.getsize(path) / 1024:.1f} KB -> {os.path.getsize(out) / 1024:.1f} KB "
+              f"({out}, watertight: {remeshed.is_watertight})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
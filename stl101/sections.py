@@ -0,0 +1,458 @@
+"""
+Cross-sections - slice a part at many parallel planes in one pass
+
+1. every triangle's extent along the plane normal picks the planes it
+   crosses (searchsorted over the sorted offsets), so all (triangle,
+   plane) pairs come out of one np.repeat
+2. each pair's two crossing points are interpolated on its edges at once.
+   A point is keyed by the mesh edge it lies on (or the vertex, when the
+   plane passes through one), so segments join exactly, without
+   coordinate tolerances
+3. a segment runs from the edge where its triangle falls through the
+   plane to the edge where it rises back, so neighbouring triangles
+   chain head to tail. The chains are followed for every loop of every
+   plane at once, one numpy step per point of the longest loop
+
+Loops come out in the plane's 2D frame (FRAMES: the profile as seen
+looking down the normal), outer boundaries counter-clockwise and holes
+clockwise, so their signed areas add up to the section area.
+
+Profiles export as SVG (one per plane, with trimesh's to_3D metadata so
+they can be placed back on the part) or one DXF with a layer per plane.
+compare_profile() checks every plane against a reference SVG such as
+reference_cross_section.svg, one shapely overlay per plane.
+
+    python -m stl101.sections rain101_wall_mount.stl --step 0.2     # layer by layer along z
+    python -m stl101.sections wire_duct_final.stl --axis y --count 9 --svg build/sections
+    python -m stl101.sections wire_duct_final.stl --axis y --reference "UNDERDESK ORGANIZER/reference_cross_section.svg"
+    python -m stl101.sections build/z_bracket.stl --at -8 -5 -1 --dxf build/z_bracket_sections.dxf
+"""
+
+import argparse
+import base64
+import contextlib
+import functools
+import io
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import shapely
+
+from . import readers
+
+PLANES = 100         # planes spread over the part when no offsets are given
+SVG_MARGIN = 2.0     # mm around an exported profile
+RUN_TOLERANCE = 1e-3  # mm^2: layers whose area differs less are one run in the table
+
+# Normal -> (u, v) axes of the 2D frame, u x v = normal
+FRAMES = {
+    "x": ((0, 1, 0), (0, 0, 1)),
+    "y": ((0, 0, 1), (1, 0, 0)),
+    "z": ((1, 0, 0), (0, 1, 0)),
+}
+
+
+def frame(normal):
+    """(normal, u, v) unit vectors for an axis name or a normal vector."""
+    if isinstance(normal, str):
+        u, v = (np.array(a, dtype=float) for a in FRAMES[normal])
+        return np.cross(u, v), u, v
+    normal = np.asarray(normal, dtype=float)
+    normal = normal / np.linalg.norm(normal)
+    helper = np.eye(3)[np.argmin(np.abs(normal))]
+    u = np.cross(helper, normal)
+    u /= np.linalg.norm(u)
+    return normal, u, np.cross(normal, u)
+
+
+def _follow(heads, following, loop, rank, first_id):
+    """Walk from every head at once, numbering loops from first_id."""
+    ids = np.arange(len(heads)) + first_id
+    current, step = heads, 0
+    while len(current):
+        loop[current], rank[current] = ids, step
+        current = following[current]
+        keep = current >= 0
+        current, ids = current[keep], ids[keep]
+        keep = loop[current] < 0
+        current, ids = current[keep], ids[keep]
+        step += 1
+    return first_id + len(heads)
+
+
+def _chain(start_keys, end_keys):
+    """(loop id, rank in loop, following segment, closed per loop) for segments joined end to start."""
+    n = len(start_keys)
+    loop, rank, following = np.full(n, -1), np.full(n, -1), np.full(n, -1)
+    if n:
+        order = np.argsort(start_keys, kind="stable")
+        position = np.minimum(np.searchsorted(start_keys[order], end_keys), n - 1)
+        joined = start_keys[order][position] == end_keys
+        following[joined] = order[position][joined]
+
+    # Open chains (holes in the mesh) first: they start where nothing leads in
+    has_previous = np.zeros(n, dtype=bool)
+    has_previous[following[following >= 0]] = True
+    open_loops = _follow(np.nonzero(~has_previous)[0], following, loop, rank, 0)
+
+    # Every other segment is on a cycle: root each at its lowest index (pointer jumping)
+    rest = loop < 0
+    label = np.arange(n)
+    pointer = np.where(rest & (following >= 0), following, label)
+    for _ in range(max(n, 1).bit_length()):
+        label = np.minimum(label, label[pointer])
+        pointer = pointer[pointer]
+    loops = _follow(np.nonzero(rest & (label == np.arange(n)))[0], following, loop, rank, open_loops)
+    closed_loops = loops
+    # Non-manifold leftovers (a chain running into another loop): one walk each
+    for leftover in np.nonzero(loop < 0)[0]:
+        if loop[leftover] < 0:
+            loops = _follow(np.array([leftover]), following, loop, rank, loops)
+    ids = np.arange(loops)
+    return loop, rank, following, (ids >= open_loops) & (ids < closed_loops)
+
+
+def slice_mesh(mesh, offsets, normal="z"):
+    """
+    Cut mesh with the planes dot(point, normal) = offset, all in one pass.
+
+    normal is "x", "y", "z" or a vector. Returns a dict: "points" (every
+    loop's points in the 2D frame, loop after loop, plane by plane),
+    "starts" (index of each loop's first point, plus the end), "plane"
+    (offset index per loop), "closed" (per loop), "offsets", "frame"
+    (normal, u, v) and "time".
+    """
+    start = time.perf_counter()
+    normal, u, v = frame(normal)
+    offsets = np.asarray(offsets, dtype=float)
+    vertices = np.asarray(mesh.vertices, dtype=float)
+    faces = np.asarray(mesh.faces)
+    heights = vertices @ normal
+
+    # (triangle, plane) pairs: the planes between each triangle's lowest and highest corner
+    plane_order = np.argsort(offsets)
+    sorted_offsets = offsets[plane_order]
+    corners = heights[faces]
+    first = np.searchsorted(sorted_offsets, corners.min(axis=1), "left")
+    last = np.searchsorted(sorted_offsets, corners.max(axis=1), "right")
+    counts = last - first
+    triangle = np.repeat(np.arange(len(faces)), counts)
+    plane = plane_order[np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+                        + np.repeat(first, counts)]
+
+    s = corners[triangle] - offsets[plane][:, None]
+    above = s > 0
+    crossing = above.any(axis=1) & ~above.all(axis=1)
+    triangle, plane, s, above = triangle[crossing], plane[crossing], s[crossing], above[crossing]
+
+    # Edge k runs corner k -> k + 1: exactly one rises through the plane, one falls
+    a, b = np.arange(3), (np.arange(3) + 1) % 3
+    rises = np.argmax(~above[:, a] & above[:, b], axis=1)
+    falls = np.argmax(above[:, a] & ~above[:, b], axis=1)
+    rows = np.arange(len(triangle))
+    tri_faces = faces[triangle]
+    edges = np.asarray(mesh.faces_unique_edges)[triangle]
+
+    def crossing_points(k, low, high):
+        """Where edge k crosses: low is its corner at or below the plane, high the one above."""
+        low_corner, high_corner = (k + low) % 3, (k + high) % 3
+        s_low, s_high = s[rows, low_corner], s[rows, high_corner]
+        low_vertex, high_vertex = tri_faces[rows, low_corner], tri_faces[rows, high_corner]
+        t = (s_low / (s_low - s_high))[:, None]
+        points = vertices[low_vertex] + t * (vertices[high_vertex] - vertices[low_vertex])
+        # Through a vertex: every triangle around it must agree on the key
+        keys = np.where(s_low == 0, low_vertex, len(vertices) + edges[rows, k])
+        return points, keys
+
+    rise_points, rise_keys = crossing_points(rises, 0, 1)
+    fall_points, fall_keys = crossing_points(falls, 1, 0)
+    # Plane index in the key keeps loops of different planes apart
+    stride = len(vertices) + len(mesh.edges_unique)
+    rise_keys, fall_keys = rise_keys + plane * stride, fall_keys + plane * stride
+    # Counter-clockwise outlines when u x v = normal (see FRAMES)
+    real = rise_keys != fall_keys  # plane just touching a corner
+    start_keys, end_keys = fall_keys[real], rise_keys[real]
+    start_points, end_points = fall_points[real], rise_points[real]
+    plane = plane[real]
+
+    loop, rank, following, closed = _chain(start_keys, end_keys)
+    # Open chains also need their last segment's end point
+    tails = np.nonzero(following < 0)[0]
+    points = np.vstack([start_points, end_points[tails]])
+    loop = np.concatenate([loop, loop[tails]])
+    rank = np.concatenate([rank, rank[tails] + 1])
+    loop_plane = np.zeros(len(closed), dtype=int)
+    loop_plane[loop[: len(plane)]] = plane
+
+    # Loops ordered by plane, points by their rank along the loop
+    order = np.lexsort((rank, loop, loop_plane[loop]))
+    points, loop = points[order], loop[order]
+    boundaries = np.nonzero(np.diff(loop))[0] + 1
+    starts = np.concatenate([[0], boundaries, [len(loop)]]) if len(loop) else np.zeros(1, dtype=int)
+    loop_ids = loop[starts[:-1]]
+    return {
+        "points": np.column_stack([points @ u, points @ v]),
+        "starts": starts,
+        "plane": loop_plane[loop_ids],
+        "closed": closed[loop_ids],
+        "offsets": offsets,
+        "frame": (normal, u, v),
+        "time": time.perf_counter() - start,
+    }
+
+
+def loops(section, plane=None):
+    """The section's loops as (n, 2) arrays, optionally only plane's (an offset index)."""
+    starts = section["starts"]
+    indices = range(len(starts) - 1)
+    if plane is not None:
+        indices = np.nonzero(section["plane"] == plane)[0]
+    return [section["points"][starts[i]:starts[i + 1]] for i in indices]
+
+
+def loop_measures(section):
+    """(signed area, length) of every loop, closing each one."""
+    points, starts = section["points"], section["starts"]
+    if len(points) == 0:
+        return np.zeros(0), np.zeros(0)
+    following = np.arange(1, len(points) + 1)
+    following[starts[1:] - 1] = starts[:-1]
+    x, y = points[:, 0], points[:, 1]
+    cross = x * y[following] - x[following] * y
+    steps = np.linalg.norm(points[following] - points, axis=1)
+    return 0.5 * np.add.reduceat(cross, starts[:-1]), np.add.reduceat(steps, starts[:-1])
+
+
+def plane_measures(section):
+    """Per plane: loop count, area (holes subtracted) and perimeter."""
+    area, length = loop_measures(section)
+    n = len(section["offsets"])
+    return {
+        "loops": np.bincount(section["plane"], minlength=n),
+        "area": np.bincount(section["plane"], weights=area, minlength=n),
+        "perimeter": np.bincount(section["plane"], weights=length, minlength=n),
+    }
+
+
+def profiles(section, points=None):
+    """One shapely geometry per plane (loops combined even-odd), from points if given."""
+    points = section["points"] if points is None else points
+    rings = shapely.linearrings(points, indices=np.repeat(
+        np.arange(len(section["starts"]) - 1), np.diff(section["starts"])))
+    polygons = shapely.make_valid(shapely.polygons(rings))
+    result = np.empty(len(section["offsets"]), dtype=object)
+    for plane in range(len(result)):
+        result[plane] = _even_odd(polygons[section["plane"] == plane])
+    return result
+
+
+def _even_odd(polygons):
+    """Loops combined so that every second nesting level is a hole."""
+    return functools.reduce(shapely.symmetric_difference, polygons, shapely.Polygon())
+
+
+def plane_centres(section):
+    """Bounding-box centre of every plane's profile (NaN for empty planes)."""
+    n = len(section["offsets"])
+    plane = np.repeat(section["plane"], np.diff(section["starts"]))
+    lo, hi = np.full((n, 2), np.inf), np.full((n, 2), -np.inf)
+    np.minimum.at(lo, plane, section["points"])
+    np.maximum.at(hi, plane, section["points"])
+    with np.errstate(invalid="ignore"):
+        return (lo + hi) / 2
+
+
+# ============================================
+# SVG / DXF
+# ============================================
+
+def _to_3d(section, plane, flip):
+    """trimesh-style to_3D matrix from the 2D profile (y flipped for SVG) to the part."""
+    normal, u, v = section["frame"]
+    matrix = np.eye(4)
+    matrix[:3, 0], matrix[:3, 1], matrix[:3, 2] = u, -v if flip else v, normal
+    matrix[:3, 3] = normal * section["offsets"][plane]
+    return matrix
+
+
+def svg_document(section, plane):
+    """One plane's profile as SVG (y down, so the profile shows upright)."""
+    outlines = loops(section, plane)
+    points = np.vstack(outlines) if outlines else np.zeros((1, 2))
+    lo, hi = points.min(axis=0) - SVG_MARGIN, points.max(axis=0) + SVG_MARGIN
+    paths = []
+    for outline, closed in zip(outlines, section["closed"][section["plane"] == plane]):
+        coords = " L".join("%.4f,%.4f" % (x, -y) for x, y in outline)
+        paths.append(f'<path d="M{coords}{" Z" if closed else ""}" />')
+    metadata = base64.b64encode(json.dumps(
+        {"to_3D": _to_3d(section, plane, flip=True).tolist()}).encode()).decode()
+    size = hi - lo
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:trimesh="https://github.com/mikedh/trimesh"\n'
+            f'  trimesh:class="Path2D" trimesh:metadata="base64,{metadata}"\n'
+            f'  width="{size[0]:.3f}mm" height="{size[1]:.3f}mm" '
+            f'viewBox="{lo[0]:.4f} {-hi[1]:.4f} {size[0]:.4f} {size[1]:.4f}">\n'
+            f'<g fill="#9ab" fill-rule="evenodd" stroke="#123" stroke-width="0.1">\n'
+            + "\n".join(paths) + "\n</g>\n</svg>\n")
+
+
+def write_svgs(directory, section, name="section"):
+    """One <name>_<axis><offset>.svg per plane; returns the paths."""
+    os.makedirs(directory, exist_ok=True)
+    normal = section["frame"][0]
+    axis = "xyz"[int(np.argmax(np.abs(normal)))] if np.isclose(np.abs(normal).max(), 1) else "n"
+    written = []
+    for plane, offset in enumerate(section["offsets"]):
+        path = os.path.join(directory, f"{name}_{axis}{offset:+.2f}.svg")
+        with open(path, "w") as f:
+            f.write(svg_document(section, plane))
+        written.append(path)
+    return written
+
+
+def write_dxf(path, section):
+    """Every plane's profile in one DXF (R12 polylines), one layer per plane."""
+    lines = ["0", "SECTION", "2", "ENTITIES"]
+    for i, outline in enumerate(loops(section)):
+        layer = "SECTION_%+.2f" % section["offsets"][section["plane"][i]]
+        lines += ["0", "POLYLINE", "8", layer, "66", "1", "70", "1" if section["closed"][i] else "0"]
+        for x, y in outline:
+            lines += ["0", "VERTEX", "8", layer, "10", "%.4f" % x, "20", "%.4f" % y]
+        lines += ["0", "SEQEND", "8", layer]
+    lines += ["0", "ENDSEC", "0", "EOF"]
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def read_svg(path):
+    """
+    Straight-line loops of an SVG profile as (n, 3) arrays in model space,
+    through its trimesh:metadata to_3D matrix (identity if it has none).
+    """
+    with open(path) as f:
+        text = f.read()
+    match = re.search(r'trimesh:metadata="base64,([^"]+)"', text)
+    to_3d = np.array(json.loads(base64.b64decode(match.group(1)))["to_3D"]) if match else np.eye(4)
+    result = []
+    for d in re.findall(r'<path[^>]*\sd="([^"]+)"', text):
+        for sub in re.split(r"[Mm]", d)[1:]:
+            numbers = np.array(re.findall(r"-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?", sub), dtype=float)
+            flat = numbers.reshape(-1, 2)
+            result.append(flat @ to_3d[:3, :2].T + to_3d[:3, 3])
+    return result
+
+
+def compare_profile(section, reference, align=True):
+    """
+    Each plane's profile against a reference profile ((n, 3) model-space
+    loops, see read_svg), projected into the section's frame. With align,
+    every profile is compared centre to centre (bounding boxes), so only
+    the shape counts; otherwise where it sits in the part counts too.
+    Returns per plane arrays "area", "difference" (area in one profile
+    but not the other) and "iou", plus "reference_area".
+    """
+    _, u, v = section["frame"]
+    rings = [np.column_stack([loop @ u, loop @ v]) for loop in reference]
+    points = section["points"]
+    if align:
+        flat = np.vstack(rings)
+        centre = (flat.min(axis=0) + flat.max(axis=0)) / 2
+        rings = [ring - centre for ring in rings]
+        plane = np.repeat(section["plane"], np.diff(section["starts"]))
+        points = points - plane_centres(section)[plane]
+    target = _even_odd(shapely.make_valid(shapely.polygons(rings)))
+    geometries = profiles(section, points)
+    area = shapely.area(geometries)
+    # One overlay per plane: the union's area follows from the overlap
+    overlap = shapely.area(shapely.intersection(geometries, target))
+    union = area + target.area - overlap
+    with np.errstate(invalid="ignore", divide="ignore"):
+        iou = np.where(union > 0, overlap / union, 1.0)
+    return {"area": area, "reference_area": target.area, "difference": union - overlap, "iou": iou}
+
+
+# ============================================
+# Command line
+# ============================================
+
+def print_layers(section):
+    """Loops / area / perimeter per plane, runs of identical planes folded into one row."""
+    measures = plane_measures(section)
+    offsets = section["offsets"]
+    print(f"  {'offset (mm)':>19} {'loops':>6} {'area mm^2':>11} {'perimeter':>10}")
+    start = 0
+    for i in range(1, len(offsets) + 1):
+        if i < len(offsets) and measures["loops"][i] == measures["loops"][start] and \
+                abs(measures["area"][i] - measures["area"][start]) < RUN_TOLERANCE:
+            continue
+        span = f"{offsets[start]:8.2f}" + (f" ..{offsets[i - 1]:8.2f}" if i - 1 > start else " " * 10)
+        print(f"  {span:>19} {measures['loops'][start]:6d} {measures['area'][start]:11.2f} "
+              f"{measures['perimeter'][start]:10.2f}")
+        start = i
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Slice a part at many planes and export the profiles.")
+    parser.add_argument("part", help="part name from a generator's PARTS, or a mesh file")
+    parser.add_argument("--axis", choices=sorted(FRAMES), default="z", help="plane normal")
+    planes = parser.add_mutually_exclusive_group()
+    planes.add_argument("--at", type=float, nargs="+", help="plane offsets in mm")
+    planes.add_argument("--step", type=float, help="mm between planes (e.g. the layer height)")
+    planes.add_argument("--count", type=int, default=PLANES, help="planes spread over the part")
+    parser.add_argument("--svg", metavar="DIR", help="write one SVG per plane into DIR")
+    parser.add_argument("--dxf", help="write every plane into one DXF")
+    parser.add_argument("--reference", help="SVG profile to compare every plane with")
+    parser.add_argument("--no-align", action="store_true",
+                        help="compare in place (SVG's to_3D) instead of centre to centre")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.part):
+        mesh = readers.load(args.part)
+    else:
+        from . import cache
+        from .build import discover_parts, load_generator
+        scripts = {name: path for path, name in discover_parts()}
+        if args.part not in scripts:
+            parser.error(f"{args.part!r} is neither a file nor a part "
+                         f"(expected one of {', '.join(sorted(scripts))})")
+        with contextlib.redirect_stdout(io.StringIO()):
+            mesh = cache.cached_part(load_generator(scripts[args.part]).PARTS[args.part])
+    name = os.path.splitext(os.path.basename(args.part))[0]
+
+    axis = "xyz".index(args.axis)
+    low, high = mesh.bounds[:, axis]
+    if args.at:
+        offsets = np.array(args.at)
+    elif args.step:
+        offsets = np.arange(low + args.step / 2, high, args.step)
+    else:
+        offsets = low + (np.arange(args.count) + 0.5) * (high - low) / args.count
+    section = slice_mesh(mesh, offsets, args.axis)
+    print(f"{name}: {len(offsets)} planes along {args.axis}, {len(section['starts']) - 1} loops, "
+          f"{len(section['points'])} points in {section['time'] * 1000:.1f} ms")
+    print_layers(section)
+    if not section["closed"].all():
+        print(f"  {int((~section['closed']).sum())} open loop(s): the mesh has holes")
+
+    if args.reference:
+        start = time.perf_counter()
+        result = compare_profile(section, read_svg(args.reference), align=not args.no_align)
+        worst = int(np.argmax(result["difference"]))
+        print(f"Against {os.path.basename(args.reference)} ({result['reference_area']:.2f} mm^2, "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms): IoU mean {result['iou'].mean():.3f}, "
+              f"min {result['iou'].min():.3f}; largest difference "
+              f"{result['difference'][worst]:.2f} mm^2 at {args.axis} = {offsets[worst]:.2f}")
+    if args.svg:
+        written = write_svgs(args.svg, section, name)
+        print(f"SVG: {len(written)} profiles in {args.svg}")
+    if args.dxf:
+        write_dxf(args.dxf, section)
+        print(f"DXF: {args.dxf}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
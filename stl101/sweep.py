@@ -0,0 +1,140 @@
+"""
+Parameter sweeps across worker processes
+
+Builds one STL per combination of module parameters and writes a metrics
+table (volume, triangles, bounding box, watertightness, build time) as
+CSV and JSON next to them.
+
+Usage:
+    python -m stl101.sweep "UNDERDESK ORGANIZER/generate_wire_duct.py" \\
+        --set CLIP_GAP=15,18,20,25 --jobs 4 --out sweep_clip_gap
+    python -m stl101.sweep rain101/generate_mount.py \\
+        --set RIB_DIVISIONS=3,4,5,6 --set THIN_RIB=0.8,1.2
+
+Only the named module constants are overridden; constants derived from
+them at import time (e.g. FRAME_WIDTH in generate_cable_tray.py) keep
+their original values unless swept too.
+"""
+
+import argparse
+import ast
+import contextlib
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from . import cache
+from .build import load_generator
+
+
+def parse_setting(text):
+    """'NAME=1,2.5,3' -> ('NAME', [1, 2.5, 3])"""
+    name, _, values = text.partition("=")
+    if not name or not values:
+        raise argparse.ArgumentTypeError(f"expected NAME=v1,v2,... got {text!r}")
+    parsed = []
+    for value in values.split(","):
+        try:
+            parsed.append(ast.literal_eval(value.strip()))
+        except (ValueError, SyntaxError):
+            parsed.append(value.strip())
+    return name.strip(), parsed
+
+
+def expand_grid(settings):
+    """Cartesian product of [(name, values), ...] as a list of dicts."""
+    names = [name for name, _ in settings]
+    return [dict(zip(names, combo)) for combo in itertools.product(*(v for _, v in settings))]
+
+
+def variant_name(part, params):
+    """wire_duct.stl + {CLIP_GAP: 18} -> wire_duct__CLIP_GAP-18.stl"""
+    stem, ext = os.path.splitext(part)
+    suffix = "__".join(f"{k}-{v}" for k, v in params.items())
+    return f"{stem}__{suffix}{ext}"
+
+
+def build_variant(script, part, params, out_dir):
+    """Worker: override module parameters, build one part, export and measure it."""
+    row = {"file": variant_name(part, params), **params}
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            module = load_generator(script)
+            for name, value in params.items():
+                setattr(module, name, value)
+            mesh = cache.cached_part(module.PARTS[part])
+            mesh.export(os.path.join(out_dir, row["file"]))
+        size = mesh.bounds[1] - mesh.bounds[0]
+        row.update(
+            volume=round(float(mesh.volume), 3),
+            triangles=len(mesh.faces),
+            size_x=round(float(size[0]), 3),
+            size_y=round(float(size[1]), 3),
+            size_z=round(float(size[2]), 3),
+            watertight=bool(mesh.is_watertight),
+            error="",
+        )
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    row["build_time"] = round(time.perf_counter() - start, 4)
+    return row
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build parameter variants of a part in parallel.")
+    parser.add_argument("script", help="generator script, e.g. rain101/generate_mount.py")
+    parser.add_argument("--set", dest="settings", action="append", type=parse_setting, required=True,
+                        metavar="NAME=v1,v2", help="parameter values to sweep (repeatable)")
+    parser.add_argument("--part", help="STL name from the script's PARTS (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("-o", "--out", default="sweep", help="output directory")
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        module = load_generator(args.script)
+    unknown = [name for name, _ in args.settings if not hasattr(module, name)]
+    if unknown:
+        parser.error(f"{args.script} has no parameter(s): {', '.join(unknown)}")
+    parts = [args.part] if args.part else list(module.PARTS)
+
+    grid = expand_grid(args.settings)
+    os.makedirs(args.out, exist_ok=True)
+    print(f"Sweeping {len(grid)} variants x {len(parts)} part(s) with {args.jobs} jobs -> {args.out}")
+
+    start = time.perf_counter()
+    rows = []
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [pool.submit(build_variant, args.script, part, params, args.out)
+                   for part in parts for params in grid]
+        for future in as_completed(futures):
+            row = future.result()
+            rows.append(row)
+            status = row["error"] or f"{row['triangles']} tris, {row['volume']} mm3"
+            print(f"  {row['file']:<50} {row['build_time']:6.2f}s  {status}")
+    wall = time.perf_counter() - start
+    rows.sort(key=lambda r: r["file"])
+
+    columns = ["file"] + [name for name, _ in args.settings] + [
+        "volume", "triangles", "size_x", "size_y", "size_z", "watertight", "build_time", "error"]
+    with open(os.path.join(args.out, "sweep.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    with open(os.path.join(args.out, "sweep.json"), "w") as f:
+        json.dump(rows, f, indent=2)
+
+    failed = sum(1 for r in rows if r["error"])
+    print(f"\n{len(rows)} variants in {wall:.2f}s wall "
+          f"({sum(r['build_time'] for r in rows):.2f}s summed build time), {failed} failed")
+    print(f"Metrics: {os.path.join(args.out, 'sweep.csv')}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""
+3MF print plates written straight from the generators
+
+Writes the same package layout Bambu Studio saves (see
+"UNDERDESK ORGANIZER/cable_channel_extract/"):
+
+    [Content_Types].xml
+    _rels/.rels                       -> 3D/3dmodel.model
+    3D/3dmodel.model                  one wrapper object per part, one build
+                                      <item> per copy (its placement)
+    3D/_rels/3dmodel.model.rels       -> every 3D/Objects/object_N.model
+    3D/Objects/object_N.model         one part's mesh, centred on its bounding box
+    Metadata/model_settings.config    names, plate instances, assembly
+
+Each distinct part's mesh is stored once; the wrapper object references it
+with a <component>, and every copy on the plate is a build <item>
+transform of that wrapper. Four z-brackets cost one mesh plus four
+12-number transforms, not four meshes as in duplicated STL geometry.
+
+Usage:
+    python -m stl101.threemf z_bracket.stl=4 wire_duct_final.stl=2 -o desk.3mf
+    python -m stl101.threemf cable_tray.stl                 # one copy
+    python -m stl101.threemf z_bracket.stl=40 --bed 180 180 --no-rotate
+
+Copies are arranged by nesting.nest(); when they need more than one bed,
+each bed is its own file (desk_1.3mf, desk_2.3mf, ...).
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import uuid
+import zipfile
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from . import cache, nesting
+
+# Vertex precision: 9 significant digits round-trips float32 exactly
+VERTEX_FORMAT = '     <vertex x="%.9g" y="%.9g" z="%.9g"/>\n'
+TRIANGLE_FORMAT = '     <triangle v1="%d" v2="%d" v3="%d"/>\n'
+
+MODEL_TYPE = "http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"
+MODEL_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<model unit="millimeter" xml:lang="en-US" '
+    'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02" '
+    'xmlns:BambuStudio="http://schemas.bambulab.com/package/2021" '
+    'xmlns:p="http://schemas.microsoft.com/3dmanufacturing/production/2015/06" '
+    'requiredextensions="p">\n'
+    ' <metadata name="BambuStudio:3mfVersion">1</metadata>\n'
+)
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">\n'
+    ' <Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>\n'
+    ' <Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>\n'
+    ' <Default Extension="config" ContentType="text/xml"/>\n'
+    '</Types>\n'
+)
+
+
+def _uuid(*names):
+    """Stable p:UUID, so rewriting an unchanged plate gives an identical file."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, "stl101/" + "/".join(map(str, names))))
+
+
+def _relationships(targets):
+    rels = "".join(f' <Relationship Target="{target}" Id="rel-{i}" Type="{MODEL_TYPE}"/>\n'
+                   for i, target in enumerate(targets, 1))
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">\n'
+            f'{rels}</Relationships>\n')
+
+
+def transform_string(matrix):
+    """4x4 matrix -> 3MF's 12 numbers (3x3 transposed for row vectors, then translation)."""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    values = np.concatenate([matrix[:3, :3].T.ravel(), matrix[:3, 3]])
+    return " ".join(f"{v:.9g}" for v in values + 0.0)  # + 0.0 turns -0 into 0
+
+
+def mesh_xml(mesh, object_id, part_uuid):
+    """One object model file holding mesh as <object object_id>."""
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    faces = np.asarray(mesh.faces, dtype=np.int64)
+    # One %-format over the whole array instead of a Python loop per vertex
+    return "".join([
+        MODEL_HEADER,
+        ' <resources>\n',
+        f'  <object id="{object_id}" p:UUID="{part_uuid}" type="model">\n',
+        '   <mesh>\n    <vertices>\n',
+        (VERTEX_FORMAT * len(vertices)) % tuple(vertices.ravel().tolist()),
+        '    </vertices>\n    <triangles>\n',
+        (TRIANGLE_FORMAT * len(faces)) % tuple(faces.ravel().tolist()),
+        '    </triangles>\n   </mesh>\n  </object>\n </resources>\n</model>\n',
+    ])
+
+
+def write_3mf(path, parts, title=""):
+    """
+    Write a print plate as a 3MF package.
+
+    parts: [(name, mesh, transforms), ...] - each mesh is stored once and
+    placed once per 4x4 transform. Returns {"meshes": n, "items": n,
+    "bytes": n}.
+    """
+    title = escape(title, {'"': "&quot;"})
+    resources, items, rels, objects, instances, assemble = [], [], [], [], [], []
+    identify_id = 0
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for k, (name, mesh, transforms) in enumerate(parts, 1):
+            name = escape(name, {'"': "&quot;"})
+            mesh_id, wrapper_id = 2 * k - 1, 2 * k
+            object_path = f"/3D/Objects/object_{mesh_id}.model"
+            # Bambu keeps the mesh centred and puts the offset in the placement
+            lo, hi = mesh.bounds
+            center = (lo + hi) / 2
+            centered = mesh.copy()
+            centered.apply_translation(-center)
+            archive.writestr(object_path[1:], mesh_xml(centered, mesh_id, _uuid(name, "mesh")))
+            rels.append(object_path)
+            resources.append(
+                f'  <object id="{wrapper_id}" p:UUID="{_uuid(name, "object")}" type="model">\n'
+                f'   <components>\n'
+                f'    <component p:path="{object_path}" objectid="{mesh_id}" '
+                f'p:UUID="{_uuid(name, "component")}" transform="1 0 0 0 1 0 0 0 1 0 0 0"/>\n'
+                f'   </components>\n'
+                f'  </object>\n')
+            objects.append(
+                f'  <object id="{wrapper_id}">\n'
+                f'    <metadata key="name" value="{name}"/>\n'
+                f'    <metadata key="extruder" value="1"/>\n'
+                f'    <metadata face_count="{len(mesh.faces)}"/>\n'
+                f'    <part id="1" subtype="normal_part">\n'
+                f'      <metadata key="name" value="{name}"/>\n'
+                f'      <metadata key="matrix" value="1 0 0 0 0 1 0 0 0 0 1 0 0 0 0 1"/>\n'
+                f'      <metadata key="source_file" value="{name}"/>\n'
+                f'      <metadata key="source_offset_x" value="{center[0]:.9g}"/>\n'
+                f'      <metadata key="source_offset_y" value="{center[1]:.9g}"/>\n'
+                f'      <metadata key="source_offset_z" value="{center[2]:.9g}"/>\n'
+                f'      <mesh_stat face_count="{len(mesh.faces)}" edges_fixed="0" '
+                f'degenerate_facets="0" facets_removed="0" facets_reversed="0" backwards_edges="0"/>\n'
+                f'    </part>\n'
+                f'  </object>\n')
+            for instance, matrix in enumerate(transforms):
+                placed = np.asarray(matrix, dtype=np.float64).copy()
+                placed[:3, 3] += placed[:3, :3] @ center
+                transform = transform_string(placed)
+                items.append(f'  <item objectid="{wrapper_id}" p:UUID="{_uuid(name, "item", instance)}" '
+                             f'transform="{transform}" printable="1"/>\n')
+                identify_id += 1
+                assemble.append(f'   <assemble_item object_id="{wrapper_id}" instance_id="{instance}" '
+                                f'transform="{transform}" offset="0 0 0" />\n')
+                instances.append(
+                    f'    <model_instance>\n'
+                    f'      <metadata key="object_id" value="{wrapper_id}"/>\n'
+                    f'      <metadata key="instance_id" value="{instance}"/>\n'
+                    f'      <metadata key="identify_id" value="{identify_id}"/>\n'
+                    f'    </model_instance>\n')
+
+        archive.writestr("[Content_Types].xml", CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _relationships(["/3D/3dmodel.model"]))
+        archive.writestr("3D/_rels/3dmodel.model.rels", _relationships(rels))
+        archive.writestr("3D/3dmodel.model", "".join([
+            MODEL_HEADER,
+            ' <metadata name="Application">stl101</metadata>\n',
+            f' <metadata name="CreationDate">{time.strftime("%Y-%m-%d")}</metadata>\n',
+            f' <metadata name="Title">{title}</metadata>\n',
+            ' <resources>\n', *resources, ' </resources>\n',
+            f' <build p:UUID="{_uuid(title, "build")}">\n', *items, ' </build>\n',
+            '</model>\n',
+        ]))
+        archive.writestr("Metadata/model_settings.config", "".join([
+            '<?xml version="1.0" encoding="UTF-8"?>\n<config>\n', *objects,
+            '  <plate>\n',
+            '    <metadata key="plater_id" value="1"/>\n',
+            f'    <metadata key="plater_name" value="{title}"/>\n',
+            '    <metadata key="locked" value="false"/>\n',
+            *instances,
+            '  </plate>\n  <assemble>\n', *assemble, '  </assemble>\n</config>\n',
+        ]))
+    return {"meshes": len(parts), "items": len(items), "bytes": os.path.getsize(path)}
+
+
+def write_plates(path, parts, plates, title=""):
+    """
+    One 3MF per bed from nesting.nest() output. parts: [(name, mesh), ...];
+    a single bed is written to path, several to path_1.3mf, path_2.3mf, ...
+    Returns [(path, write_3mf result), ...].
+    """
+    stem, ext = os.path.splitext(path)
+    written = []
+    for number, placements in enumerate(plates, 1):
+        plate_path = path if len(plates) == 1 else f"{stem}_{number}{ext}"
+        transforms = {}
+        for index, matrix in placements:
+            transforms.setdefault(index, []).append(matrix)
+        plate = [(parts[i][0], parts[i][1], transforms[i]) for i in sorted(transforms)]
+        plate_title = title if len(plates) == 1 else f"{title} {number}".strip()
+        written.append((plate_path, write_3mf(plate_path, plate, plate_title)))
+    return written
+
+
+def parse_request(text):
+    """'z_bracket.stl=4' -> ('z_bracket.stl', 4)"""
+    name, _, count = text.partition("=")
+    try:
+        count = int(count) if count else 1
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected NAME or NAME=COUNT, got {text!r}")
+    if count < 1:
+        raise argparse.ArgumentTypeError(f"copy count must be at least 1, got {text!r}")
+    return name, count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Nest generator parts onto 3MF print plates.")
+    parser.add_argument("parts", nargs="+", type=parse_request, metavar="NAME[=COUNT]",
+                        help="part from a generator's PARTS, optionally with a copy count")
+    parser.add_argument("-o", "--out", default="plate.3mf", help="output .3mf file")
+    parser.add_argument("--title", default="", help="plate name shown in the slicer")
+    parser.add_argument("--bed", type=float, nargs=2, default=nesting.BED_SIZE, metavar=("W", "D"),
+                        help="bed size in mm (default: %(default)s)")
+    parser.add_argument("--gap", type=float, default=nesting.GAP, help="mm between parts")
+    parser.add_argument("--no-rotate", action="store_true", help="keep every part's XY orientation")
+    args = parser.parse_args(argv)
+
+    from .build import discover_parts, load_generator
+    scripts = {name: path for path, name in discover_parts()}
+    counts = {}
+    for name, count in args.parts:
+        if name not in scripts:
+            parser.error(f"unknown part {name!r} (expected one of {', '.join(sorted(scripts))})")
+        counts[name] = counts.get(name, 0) + count
+
+    meshes = []
+    for name in counts:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            module = load_generator(scripts[name])
+            meshes.append(cache.cached_part(module.PARTS[name]))
+        print(f"  {name:<28} x{counts[name]:<3} {len(meshes[-1].faces):>7} faces  "
+              f"built in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    plates = nesting.nest(list(zip(meshes, counts.values())), args.bed, args.gap,
+                          rotate=not args.no_rotate)
+    nest_time = time.perf_counter() - start
+    print(f"Nested {sum(counts.values())} copies onto {len(plates)} "
+          f"{args.bed[0]:g} x {args.bed[1]:g} mm bed(s) in {nest_time * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    written = write_plates(args.out, list(zip(counts, meshes)), plates, args.title)
+    elapsed = time.perf_counter() - start
+    for path, result in written:
+        print(f"  {path}: {result['meshes']} meshes, {result['items']} copies, "
+              f"{result['bytes'] / 1024:.1f} KiB")
+
+    # Binary STL of the same plates: 84-byte header + 50 bytes per triangle per copy
+    stl_bytes = sum(84 + 50 * len(mesh.faces) * n for mesh, n in zip(meshes, counts.values()))
+    total = sum(result["bytes"] for _, result in written)
+    print(f"Wrote {len(written)} plate file(s), {total / 1024:.1f} KiB in {elapsed * 1000:.0f} ms "
+          f"(duplicated binary STL: {stl_bytes / 1024:.1f} KiB, {stl_bytes / total:.1f}x larger)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+Watch mode: rebuild a generator's parts when it is saved
+
+One long-lived process imports trimesh, numpy, shapely and manifold3d once
+(and runs a tiny boolean + export so their lazy imports are done too),
+then polls the generator scripts. When one changes only that script is
+re-executed and its PARTS rebuilt and exported, with per-stage timings.
+In-process memos (feature graphs, the engine probe) stay warm between
+rebuilds.
+
+Usage:
+    python -m stl101.watch                              # every generator
+    python -m stl101.watch rain101/generate_mount.py --out build
+    python -m stl101.watch "UNDERDESK ORGANIZER/generate_z_bracket.py" -v
+
+Changes to stl101 itself are not reloaded - restart the watcher.
+"""
+
+import time
+
+_IMPORT_START = time.perf_counter()
+
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import sys
+import traceback
+
+from . import cache, engines, kernel  # imports numpy, trimesh and manifold3d
+from .build import REPO_DIR, find_generators, load_generator
+
+_IMPORT_TIME = time.perf_counter() - _IMPORT_START
+
+# Imported by some generators but not by stl101 itself
+WARM_MODULES = ["shapely", "scipy.spatial"]
+
+
+def warm_up():
+    """Import the heavy modules and run a tiny build; returns {stage: seconds}."""
+    stages = {"import numpy/trimesh/manifold3d": _IMPORT_TIME}
+    for name in WARM_MODULES:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            continue
+        stages[f"import {name}"] = time.perf_counter() - start
+
+    from .csg import Difference, evaluate
+    from .kernel import create_box, create_cylinder
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        engines.probe()
+        mesh = evaluate(Difference(create_box(10, 10, 10), create_cylinder(2, 12, 5, 5, -1)))
+        mesh.export(io.BytesIO(), file_type="stl")
+    stages["first build"] = time.perf_counter() - start
+    engines.reset_report()
+    kernel.reset_report()
+    return stages
+
+
+def snapshot(paths):
+    """{path: mtime} for the watched files (missing files are skipped)."""
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            pass
+    return mtimes
+
+
+def poll(paths, interval, on_change):
+    """Call on_change(path) whenever a watched file is saved, until Ctrl+C."""
+    mtimes = snapshot(paths)
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot(paths)
+            changed = [p for p in current if current[p] != mtimes.get(p)]
+            if not changed:
+                continue
+            # Let the editor finish writing before reading the file
+            time.sleep(interval)
+            mtimes = snapshot(paths)
+            for path in changed:
+                on_change(path)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+
+def rebuild(path, out_dir=None, verbose=False):
+    """
+    Re-execute one generator and rebuild its parts.
+
+    Returns ({stage: seconds}, {part name: mesh}); parts are exported to
+    out_dir unless it is None.
+    """
+    stages = {}
+    meshes = {}
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            start = time.perf_counter()
+            module = load_generator(path)
+            stages["load"] = time.perf_counter() - start
+            for name, build in getattr(module, "PARTS", {}).items():
+                start = time.perf_counter()
+                meshes[name] = mesh = cache.cached_part(build)
+                stages[f"build {name}"] = time.perf_counter() - start
+                stages[f"faces {name}"] = len(mesh.faces)
+                if out_dir is not None:
+                    start = time.perf_counter()
+                    mesh.export(os.path.join(out_dir, name))
+                    stages[f"export {name}"] = time.perf_counter() - start
+            engines.print_report()
+            kernel.print_report()
+    except Exception:
+        print(log.getvalue())
+        raise
+    finally:
+        engines.reset_report()
+        kernel.reset_report()
+    if verbose:
+        print(log.getvalue())
+    return stages, meshes
+
+
+def print_stages(title, stages):
+    """Print a total and one line per stage (face counts next to builds)."""
+    times = {k: v for k, v in stages.items() if not k.startswith("faces ")}
+    total = sum(times.values())
+    print(f"{title}: {total * 1000:.0f} ms")
+    for stage, seconds in times.items():
+        faces = stages.get("faces " + stage.split(" ", 1)[-1]) if stage.startswith("build ") else None
+        extra = f"  ({faces} faces)" if faces is not None else ""
+        print(f"  {stage:<40} {seconds * 1000:8.1f} ms{extra}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild generator parts whenever a script is saved.")
+    parser.add_argument("scripts", nargs="*", help="generator scripts to watch (default: all)")
+    parser.add_argument("-o", "--out", default=os.path.join(REPO_DIR, "build"), help="output directory")
+    parser.add_argument("-i", "--interval", type=float, default=0.3, help="poll interval in seconds")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print each generator's log")
+    args = parser.parse_args(argv)
+
+    paths = [os.path.abspath(p) for p in args.scripts] or find_generators()
+    os.makedirs(args.out, exist_ok=True)
+    print_stages("Warm-up", warm_up())
+    print(f"Watching {len(paths)} generator(s) -> {args.out}  (Ctrl+C to stop)")
+
+    def on_change(path):
+        name = os.path.relpath(path, REPO_DIR)
+        print(f"\n[{time.strftime('%H:%M:%S')}] {name} changed")
+        try:
+            print_stages("Rebuilt", rebuild(path, args.out, args.verbose)[0])
+        except Exception:
+            traceback.print_exc()
+            print(f"{name} failed - fix and save again")
+
+    poll(paths, args.interval, on_change)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""Part keys must change with the settings a mesh is built and stored under."""
+
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+from stl101 import cache, kernel, remesh
+
+builds = []
+
+
+def rod():
+    builds.append(kernel.CHORD_TOLERANCE)
+    return kernel.create_cylinder(5.0, 20.0)
+
+
+def test_chord_tolerance_misses_part_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(cache, "ENABLED", True)
+    monkeypatch.setattr(kernel, "CHORD_TOLERANCE", 0.05)
+    builds.clear()
+
+    fine = cache.cached_part(rod)
+    assert len(cache.cached_part(rod).faces) == len(fine.faces)
+    assert builds == [0.05]
+
+    monkeypatch.setattr(kernel, "CHORD_TOLERANCE", 0.5)
+    coarse = cache.cached_part(rod)
+    assert builds == [0.05, 0.5]
+    assert len(coarse.faces) < len(fine.faces)
+
+
+def test_remesh_switch_misses_part_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(cache, "ENABLED", True)
+    monkeypatch.setattr(remesh, "ENABLED", True)
+    builds.clear()
+
+    merged = cache.cached_part(rod)
+    monkeypatch.setattr(remesh, "ENABLED", False)
+    raw = cache.cached_part(rod)
+    assert len(builds) == 2
+    assert len(raw.faces) > len(merged.faces)
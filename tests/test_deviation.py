@@ -0,0 +1,37 @@
+"""A duct whose profile drifts from its reference must fail the build."""
+
+import contextlib
+import io
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+from stl101 import build, cache, deviation
+
+SCRIPT = os.path.join(REPO_DIR, "UNDERDESK ORGANIZER", "generate_wire_duct_simple.py")
+PART = "wire_duct_simple.stl"
+
+
+def _check(**parameters):
+    with contextlib.redirect_stdout(io.StringIO()):
+        module = build.load_generator(SCRIPT)
+        vars(module).update(parameters)
+        mesh = module.PARTS[PART]()
+    declared = deviation.declared_reference(SCRIPT, module, PART)
+    return {"name": PART, "deviation": build.check_deviation(mesh, *declared)}
+
+
+def test_perturbed_profile_drifts(monkeypatch):
+    monkeypatch.setattr(cache, "ENABLED", False)
+
+    result = _check()
+    assert result["deviation"]["tolerance"] is not None
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert build.print_deviations([result]) == []
+
+    # 5 mm wider channel: still a valid duct, but no longer the reference's profile
+    result = _check(CHANNEL_WIDTH=30.0)
+    assert result["deviation"]["drift"]
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert build.print_deviations([result]) == [result]
@@ -0,0 +1,88 @@
+"""Feature keys must change when a module helper a feature calls changes."""
+
+import importlib.util
+import os
+import sys
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+from stl101 import cache, features, kernel
+
+GENERATOR = '''
+import trimesh
+from stl101.features import FeatureGraph
+
+SIZE = 10.0
+graph = FeatureGraph(globals())
+
+
+def edge():
+    return SIZE / {divisor}
+
+
+@graph.feature(store=True)
+def cube():
+    return trimesh.creation.box((edge(),) * 3)
+'''
+
+
+def _load(path, divisor, run):
+    with open(path, "w") as f:
+        f.write(GENERATOR.format(divisor=divisor))
+    spec = importlib.util.spec_from_file_location(f"generate_cube_{run}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _build(path, divisor, run):
+    module = _load(path, divisor, run)
+    mesh = module.graph.build("cube")
+    return module.graph.status["cube"], mesh.volume
+
+
+def test_helper_edit_misses_disk_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(cache, "ENABLED", True)
+    monkeypatch.setattr(features, "MEMO", {})
+    path = tmp_path / "generate_cube.py"
+
+    assert _build(path, 2, 0) == ("built", 125.0)
+    features.MEMO.clear()
+    assert _build(path, 2, 1) == ("disk", 125.0)
+
+    # Only the helper changes: the feature's own source and parameters don't
+    features.MEMO.clear()
+    status, volume = _build(path, 5, 2)
+    assert status == "built"
+    assert abs(volume - 8.0) < 1e-9
+
+
+def test_chord_tolerance_misses_disk_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(cache, "ENABLED", True)
+    monkeypatch.setattr(features, "MEMO", {})
+    monkeypatch.setattr(kernel, "CHORD_TOLERANCE", 0.05)
+    path = tmp_path / "generate_cube.py"
+
+    assert _build(path, 2, 0) == ("built", 125.0)
+    features.MEMO.clear()
+    monkeypatch.setattr(kernel, "CHORD_TOLERANCE", 0.5)
+    assert _build(path, 2, 1) == ("built", 125.0)
+
+
+
+
+def test_editing_result_leaves_memo_alone(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "ENABLED", False)
+    monkeypatch.setattr(features, "MEMO", {})
+    path = tmp_path / "generate_cube.py"
+
+    # Repairs such as fill_holes() in generate_wall_mount edit the result in place
+    mesh = _load(path, 2, 0).graph.build("cube")
+    mesh.update_faces(np.arange(len(mesh.faces)) >= 2)
+
+    assert _build(path, 2, 1) == ("memory", 125.0)
+    assert len(next(iter(features.MEMO.values())).faces) == 12
@@ -0,0 +1,20 @@
+"""GLB export must cope with parts that came out empty."""
+
+import io
+import os
+import sys
+
+import trimesh
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+from stl101 import glb
+
+
+def test_empty_mesh_exports():
+    positions, scale, offset = glb.quantize(trimesh.Trimesh().vertices)
+    assert positions.shape == (0, 4)
+
+    data = glb.to_glb([trimesh.Trimesh(), trimesh.creation.box()], names=["empty", "box"])
+    scene = trimesh.load(io.BytesIO(data), file_type="glb")
+    assert [len(g.faces) for g in scene.geometry.values()] == [12]
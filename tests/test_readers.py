@@ -0,0 +1,61 @@
+"""Reader edge cases the reference files don't cover."""
+
+import os
+import sys
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+from stl101 import readers
+
+
+def test_obj_relative_indices_interleaved(tmp_path):
+    path = tmp_path / "two.obj"
+    path.write_text("v 0 0 0\nv 1 0 0\nv 0 1 0\nf -3 -2 -1\n"
+                    "v 0 0 1\nv 1 0 1\nv 0 1 1\nf -3 -2 -1\n")
+    vertices, faces = readers.read_obj(str(path))
+    assert len(vertices) == 6
+    assert faces.tolist() == [[0, 1, 2], [3, 4, 5]]
+
+
+def test_obj_relative_polygon_fan(tmp_path):
+    path = tmp_path / "quads.obj"
+    path.write_text("v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nf -4/1 -3/2 -2/3 -1/4\n"
+                    "v 0 0 1\nv 1 0 1\nv 1 1 1\nv 0 1 1\nf -4 -3 -2 -1\nf 1 2 3\n")
+    _, faces = readers.read_obj(str(path))
+    assert faces.tolist() == [[0, 1, 2], [0, 2, 3], [4, 5, 6], [4, 6, 7], [0, 1, 2]]
+
+
+MODEL = '''<?xml version="1.0" encoding="UTF-8"?>
+<model unit="millimeter" xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02"
+  xmlns:p="http://schemas.microsoft.com/3dmanufacturing/production/2015/06">
+ <resources>
+  <object id="1" type="model"><components>
+   <component p:path="/3D/Objects/present.model" objectid="1"/>
+   <component p:path="/3D/Objects/missing.model" objectid="1"/>
+  </components></object>
+ </resources>
+ <build><item objectid="1"/></build>
+</model>
+'''
+
+PART = '''<?xml version="1.0" encoding="UTF-8"?>
+<model unit="millimeter" xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">
+ <resources><object id="1" type="model"><mesh>
+  <vertices><vertex x="0" y="0" z="0"/><vertex x="1" y="0" z="0"/><vertex x="0" y="1" z="0"/></vertices>
+  <triangles><triangle v1="0" v2="1" v3="2"/></triangles>
+ </mesh></object></resources>
+ <build/>
+</model>
+'''
+
+
+def test_model_with_missing_part_keeps_the_rest(tmp_path, capsys):
+    (tmp_path / "3D" / "Objects").mkdir(parents=True)
+    (tmp_path / "3D" / "3dmodel.model").write_text(MODEL)
+    (tmp_path / "3D" / "Objects" / "present.model").write_text(PART)
+    vertices, faces = readers.read_3mf(str(tmp_path / "3D" / "3dmodel.model"))
+    assert np.array_equal(vertices, [[0, 0, 0], [1, 0, 0], [0, 1, 0]])
+    assert faces.tolist() == [[0, 1, 2]]
+    assert "missing.model" in capsys.readouterr().out